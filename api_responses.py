@@ -0,0 +1,228 @@
+import os
+import json
+import gzip
+import hashlib
+import logging
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Sequence
+
+import anyio
+from fastapi.responses import JSONResponse, Response
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# ============================================
+# LOGGING SETUP
+# ============================================
+logger = logging.getLogger("api_responses_logger")
+
+# ============================================
+# CONFIGURATION
+# ============================================
+RESPONSE_CONFIG = {
+    "compression": os.getenv("RESPONSE_COMPRESSION", "1") == "1",
+    "minimum_size": int(os.getenv("RESPONSE_COMPRESSION_MIN_BYTES", "1024")),   # smaller bodies go out as-is
+    "gzip_level": int(os.getenv("RESPONSE_GZIP_LEVEL", "6")),
+    "brotli_quality": int(os.getenv("RESPONSE_BROTLI_QUALITY", "5")),
+    "thread_minimum_size": 256 * 1024,     # compress larger bodies off the event loop
+}
+
+# Clients may reuse a stored response but must revalidate it with If-None-Match first
+REVALIDATE_CACHE_CONTROL = "private, no-cache"
+
+CONTENT_CODINGS = ("br", "gzip")
+COMPRESSIBLE_TYPES = ("application/json", "application/x-ndjson", "application/javascript", "text/")
+
+# ============================================
+# SERIALIZATION
+# ============================================
+@lru_cache(maxsize=1)
+def json_backend():
+    """orjson, imported on the first response; None without orjson"""
+    try:
+        import orjson
+        return orjson
+    except ImportError:  # stdlib json below is ~5x slower but produces the same document
+        return None
+
+def json_default(obj: Any) -> Any:
+    """Types neither orjson nor json serialize on their own (NumPy, pandas, sets)"""
+    if hasattr(obj, "isoformat"):                 # pandas.Timestamp, datetime, date
+        return obj.isoformat() if obj == obj else None   # NaT != NaT
+    if hasattr(obj, "tolist"):                    # numpy arrays and scalars
+        return obj.tolist()
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    if hasattr(obj, "model_dump"):                # pydantic models
+        return obj.model_dump()
+    if obj.__class__.__name__ in ("NAType", "NaTType"):
+        return None
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+def dumps(content: Any) -> bytes:
+    """Compact UTF-8 JSON (orjson writes NaN/inf as null)"""
+    orjson = json_backend()
+    if orjson is not None:
+        return orjson.dumps(
+            content, default=json_default,
+            option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS,
+        )
+    return json.dumps(content, default=json_default, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSONResponse rendered by orjson. Returned directly from an endpoint it also
+    skips FastAPI's jsonable_encoder pass, and NumPy values need no conversion.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+def frame_records(frame, columns: Sequence[str]) -> List[Dict]:
+    """DataFrame rows as dicts built from whole columns (no per-row Series like to_dict)"""
+    return [dict(zip(columns, row)) for row in zip(*(frame[column].tolist() for column in columns))]
+
+# ============================================
+# CONDITIONAL GET (ETAGS)
+# ============================================
+def make_etag(*parts: Any) -> str:
+    """Strong ETag over the versions of everything a response is computed from"""
+    return '"' + hashlib.sha256(dumps(parts)).hexdigest()[:32] + '"'
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match uses the weak comparison: W/ prefixes are ignored, "*" matches anything"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = {coded_etag_base(tag.strip().removeprefix("W/")) for tag in if_none_match.split(",")}
+    return etag in candidates
+
+def coded_etag(etag: str, encoding: str) -> str:
+    """A strong ETag names one representation, so compressed bodies get their own ("<tag>-gzip")"""
+    return etag[:-1] + f'-{encoding}"' if etag.endswith('"') and not etag.startswith("W/") else etag
+
+def coded_etag_base(etag: str) -> str:
+    for encoding in CONTENT_CODINGS:
+        suffix = f'-{encoding}"'
+        if etag.endswith(suffix):
+            return etag[:-len(suffix)] + '"'
+    return etag
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": REVALIDATE_CACHE_CONTROL})
+
+def tagged_response(content: Any, etag: str) -> FastJSONResponse:
+    return FastJSONResponse(content, headers={"ETag": etag, "Cache-Control": REVALIDATE_CACHE_CONTROL})
+
+# ============================================
+# COMPRESSION
+# ============================================
+@lru_cache(maxsize=1)
+def brotli_backend():
+    """brotli module, imported on the first compressed response; None without brotli"""
+    try:
+        import brotli
+        return brotli
+    except ImportError:  # gzip only
+        return None
+
+def parse_accept_encoding(header: str) -> Dict[str, float]:
+    """{"br": 1.0, "gzip": 0.8, ...} from an Accept-Encoding header"""
+    weights = {}
+    for item in header.lower().split(","):
+        coding, _, params = item.strip().partition(";")
+        if not coding:
+            continue
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        weights[coding.strip()] = quality
+    return weights
+
+def negotiate_encoding(header: str) -> Optional[str]:
+    """Best coding we can produce: br when accepted and available, then gzip, else None"""
+    weights = parse_accept_encoding(header)
+    wildcard = weights.get("*", 0.0)
+    available = (["br"] if brotli_backend() is not None else []) + ["gzip"]
+    ranked = [(weights.get(coding, wildcard), -i, coding) for i, coding in enumerate(available)]
+    quality, _, coding = max(ranked)
+    return coding if quality > 0 else None
+
+def compress_body(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli_backend().compress(body, quality=RESPONSE_CONFIG["brotli_quality"])
+    return gzip.compress(body, compresslevel=RESPONSE_CONFIG["gzip_level"], mtime=0)
+
+def is_compressible(content_type: str) -> bool:
+    return content_type.partition(";")[0].strip().lower().startswith(COMPRESSIBLE_TYPES)
+
+class CompressionMiddleware:
+    """
+    Negotiated br/gzip for complete JSON/text responses above minimum_size.
+    Streaming responses (NDJSON events, file downloads) pass through untouched
+    so their chunks are not held back. ETags get the negotiated coding
+    whenever one is negotiated, on 200 and 304 alike, so a revalidation
+    answers with the tag the client stored.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = RESPONSE_CONFIG["minimum_size"]):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or not RESPONSE_CONFIG["compression"]:
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        start_message: Optional[Message] = None
+        passthrough = False
+
+        async def send_compressed(message: Message):
+            nonlocal start_message, passthrough
+            if message["type"] == "http.response.start":
+                headers = Headers(raw=message["headers"])
+                if message["status"] == 304 and encoding is not None and "etag" in headers:
+                    not_modified_headers = MutableHeaders(raw=message["headers"])
+                    not_modified_headers.add_vary_header("Accept-Encoding")
+                    not_modified_headers["ETag"] = coded_etag(headers["etag"], encoding)
+                passthrough = "content-encoding" in headers or not is_compressible(headers.get("content-type", ""))
+                if passthrough:
+                    await send(message)
+                else:
+                    start_message = message
+                return
+            if passthrough or message["type"] != "http.response.body" or start_message is None:
+                await send(message)
+                return
+
+            start, start_message = start_message, None
+            body = message.get("body", b"")
+            headers = MutableHeaders(raw=start["headers"])
+            headers.add_vary_header("Accept-Encoding")
+            if message.get("more_body", False) or encoding is None or len(body) < self.minimum_size:
+                passthrough = True
+                if encoding is not None and not message.get("more_body", False) and "etag" in headers:
+                    # Same tag as a compressed body would get: a 304 cannot know the body size
+                    headers["ETag"] = coded_etag(headers["etag"], encoding)
+                await send(start)
+                await send(message)
+                return
+
+            if len(body) >= RESPONSE_CONFIG["thread_minimum_size"]:
+                compressed = await anyio.to_thread.run_sync(compress_body, body, encoding)
+            else:
+                compressed = compress_body(body, encoding)
+            headers["Content-Encoding"] = encoding
+            headers["Content-Length"] = str(len(compressed))
+            if "etag" in headers:
+                headers["ETag"] = coded_etag(headers["etag"], encoding)
+            await send(start)
+            await send({**message, "body": compressed})
+
+        await self.app(scope, receive, send_compressed)
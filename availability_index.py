@@ -0,0 +1,130 @@
+import os
+import logging
+from datetime import date
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from employee_snapshot import EmployeeSnapshot
+
+# ============================================
+# LOGGING SETUP
+# ============================================
+logger = logging.getLogger("availability_logger")
+
+# ============================================
+# CONFIGURATION
+# ============================================
+WEEKLY_CAPACITY_HOURS = int(os.getenv("WEEKLY_CAPACITY_HOURS", "40"))
+
+# Keys are row * DAY_SPAN + day ordinal, which keeps every employee's
+# breakpoints contiguous and globally sorted in one flat array.
+DAY_SPAN = 1 << 22            # > date.max.toordinal()
+OPEN_START = 0                # day ordinal used for "no start date"
+
+# ============================================
+# DATE HELPERS
+# ============================================
+def parse_day(value) -> Optional[int]:
+    """Day ordinal for a date / ISO string from Supabase, or None"""
+    if value is None or value == "":
+        return None
+    if isinstance(value, date):
+        return value.toordinal()
+    try:
+        return date.fromisoformat(str(value)[:10]).toordinal()
+    except ValueError:
+        return None
+
+# ============================================
+# INDEX CONSTRUCTION
+# ============================================
+def build_availability_columns(rows: int, row_of_user: Dict, assignments: Iterable[Dict],
+                               project_dates: Dict) -> Dict[str, np.ndarray]:
+    """
+    Per-employee step function of assigned weekly hours over time, stored as
+    sorted breakpoint keys + load per segment, plus a sparse table for O(1)
+    range-max. Assignments on projects without dates are treated as open-ended.
+    """
+    event_rows: List[int] = list(range(rows))
+    event_days: List[int] = [OPEN_START] * rows     # sentinel segment per employee
+    event_hours: List[float] = [0.0] * rows
+
+    for assignment in assignments:
+        row = row_of_user.get(assignment.get("user_id"))
+        hours = assignment.get("assigned_hours") or 0
+        if row is None or not hours:
+            continue
+        start, end = project_dates.get(assignment.get("project_id"), (None, None))
+        event_rows.append(row)
+        event_days.append(start if start is not None else OPEN_START)
+        event_hours.append(float(hours))
+        if end is not None:
+            event_rows.append(row)
+            event_days.append(end + 1)
+            event_hours.append(-float(hours))
+
+    keys = np.asarray(event_rows, dtype=np.int64) * DAY_SPAN + np.asarray(event_days, dtype=np.int64)
+    unique_keys, inverse = np.unique(keys, return_inverse=True)
+    deltas = np.bincount(inverse, weights=np.asarray(event_hours), minlength=len(unique_keys))
+
+    # Running sum restarted at each employee's sentinel breakpoint
+    running = np.cumsum(deltas)
+    owner = unique_keys // DAY_SPAN
+    first = np.searchsorted(unique_keys, np.arange(rows, dtype=np.int64) * DAY_SPAN)
+    base = running[first] - deltas[first]
+    load = np.maximum(running - base[owner], 0).astype(np.float32)
+
+    return {
+        "availability_keys": unique_keys,
+        "availability_rmq": build_sparse_table(load),
+    }
+
+def build_sparse_table(values: np.ndarray) -> np.ndarray:
+    """table[k, i] = max(values[i : i + 2**k]) (clamped at the end)"""
+    levels = max(1, int(np.floor(np.log2(max(len(values), 1)))) + 1)
+    table = np.empty((levels, len(values)), dtype=values.dtype)
+    table[0] = values
+    for k in range(1, levels):
+        step = 1 << (k - 1)
+        table[k] = table[k - 1]
+        table[k, :-step] = np.maximum(table[k - 1, :-step], table[k - 1, step:])
+    return table
+
+# ============================================
+# QUERIES
+# ============================================
+def peak_assigned_hours(snapshot: EmployeeSnapshot, rows: np.ndarray,
+                        start: Optional[int], end: Optional[int]) -> np.ndarray:
+    """Highest weekly hours already assigned to each row at any point in [start, end]"""
+    keys = snapshot["availability_keys"]
+    table = snapshot["availability_rmq"]
+    rows = np.asarray(rows, dtype=np.int64)
+
+    start = OPEN_START if start is None else start
+    end = DAY_SPAN - 1 if end is None else max(end, start)
+
+    lo = np.searchsorted(keys, rows * DAY_SPAN + start, side="right") - 1
+    hi = np.searchsorted(keys, rows * DAY_SPAN + end, side="right") - 1
+
+    width = hi - lo + 1
+    level = np.floor(np.log2(width)).astype(np.int64)
+    return np.maximum(table[level, lo], table[level, hi - (1 << level) + 1])
+
+def remaining_capacity(snapshot: EmployeeSnapshot, rows: np.ndarray,
+                       start: Optional[int], end: Optional[int]) -> np.ndarray:
+    """
+    Weekly hours still free for every day between start and end, capped at the
+    employee's own total_available_hours so part-time staff are never sized as
+    full WEEKLY_CAPACITY_HOURS workers.
+    """
+    rows = np.asarray(rows, dtype=np.int64)
+    remaining = WEEKLY_CAPACITY_HOURS - peak_assigned_hours(snapshot, rows, start, end)
+    return np.maximum(np.minimum(remaining, snapshot["total_available_hours"][rows]), 0)
+
+def project_window(project: Optional[Dict]) -> Tuple[Optional[int], Optional[int]]:
+    """(start, end) day ordinals for a project row; a missing start means today"""
+    if not project:
+        return date.today().toordinal(), None
+    start = parse_day(project.get("start_date")) or date.today().toordinal()
+    return start, parse_day(project.get("end_date"))
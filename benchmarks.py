@@ -0,0 +1,625 @@
+# benchmarks.py
+"""
+Micro-benchmarks for the backend hot paths.
+
+    python benchmarks.py scoring --employees 100000
+    python benchmarks.py ocr --corpus ./cv_corpus
+    python benchmarks.py docx --corpus ./cv_corpus
+    python benchmarks.py pdf --corpus ./cv_corpus
+    python benchmarks.py json --projects 50 --per-project 50
+    python benchmarks.py startup --budget-ms 1500
+    python benchmarks.py skills
+"""
+import argparse
+import glob
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+# ============================================
+# HELPERS
+# ============================================
+def time_call(func: Callable, repeat: int) -> Dict[str, float]:
+    """Run func `repeat` times and return latency stats in milliseconds"""
+    func()  # warm caches / lazy per-generation structures
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return {
+        "mean_ms": sum(samples) / len(samples),
+        "p50_ms": samples[len(samples) // 2],
+        "p95_ms": samples[min(len(samples) - 1, int(len(samples) * 0.95))],
+    }
+
+def print_table(title: str, rows: Dict[str, Dict[str, float]]):
+    print(f"\n📊 {title}")
+    print(f"   {'case':<28}{'mean ms':>10}{'p50 ms':>10}{'p95 ms':>10}")
+    for name, stats in rows.items():
+        print(f"   {name:<28}{stats['mean_ms']:>10.2f}{stats['p50_ms']:>10.2f}{stats['p95_ms']:>10.2f}")
+
+# ============================================
+# RECOMMENDATION SCORING
+# ============================================
+def synthetic_skill_sets(employees: int, vocabulary: int, per_employee: int, seed: int) -> List[set]:
+    """Zipf-distributed skills so a few are common and most are rare"""
+    rng = np.random.default_rng(seed)
+    ranks = np.arange(1, vocabulary + 1)
+    probabilities = (1.0 / ranks) / (1.0 / ranks).sum()
+    draws = rng.choice(vocabulary, size=(employees, per_employee), p=probabilities)
+    return [{f"skill{i}" for i in row} for row in draws]
+
+def bench_scoring(args) -> int:
+    from employee_snapshot import EmployeeSnapshot, pack_skill_bits, write_snapshot
+    from skill_scoring import build_tfidf_columns, match_credit, rank_candidates, tfidf_scores
+
+    print(f"🚀 Building synthetic snapshot: {args.employees} employees, {args.vocabulary} skills")
+    skill_sets = synthetic_skill_sets(args.employees, args.vocabulary, args.skills_per_employee, args.seed)
+    vocabulary = {f"skill{i}": i for i in range(args.vocabulary)}
+    # Two-level synthetic hierarchy: every skill implies one of the 50 most common
+    implied_sets = [{f"skill{int(s[5:]) % 50}" for s in skills} - skills for skills in skill_sets]
+    levels = np.random.default_rng(args.seed).integers(0, 3, size=args.employees).astype(np.int16)
+
+    columns = {
+        "experience_level": levels,
+        "total_available_hours": np.full(args.employees, 40, dtype=np.int32),
+        "skill_bits": pack_skill_bits(skill_sets, vocabulary),
+        "implied_bits": pack_skill_bits(implied_sets, vocabulary),
+        **build_tfidf_columns(skill_sets, vocabulary, implied_sets),
+    }
+    meta = {
+        "rows": args.employees,
+        "skills": list(vocabulary),
+        "experience_levels": ["advanced", "beginner", "intermediate"],
+    }
+
+    with tempfile.TemporaryDirectory() as directory:
+        generation = write_snapshot(directory, columns, meta)
+        snapshot = EmployeeSnapshot(generation, os.path.join(directory, generation))
+        required = {"skill0", "skill7", "skill42", "skill180"}
+        quantity = 10
+
+        def match_mode():
+            candidates = np.flatnonzero(snapshot["experience_level"] == 2)
+            counts, credit = match_credit(snapshot, candidates, required)
+            keep = credit > 0
+            order = rank_candidates(credit[keep] * 2, [counts[keep]])[:quantity]
+            return candidates[keep][order]
+
+        def tfidf_mode():
+            candidates = np.flatnonzero(snapshot["experience_level"] == 2)
+            counts, credit = match_credit(snapshot, candidates, required)
+            keep = credit > 0
+            candidates, counts = candidates[keep], counts[keep]
+            scores = tfidf_scores(snapshot, required)[candidates]
+            order = rank_candidates(scores, [counts, snapshot["total_available_hours"][candidates]])[:quantity]
+            return candidates[order]
+
+        def tfidf_matvec_only():
+            return tfidf_scores(snapshot, required)
+
+        rows = {
+            "match (bitmask + implied)": time_call(match_mode, args.repeat),
+            "tfidf (filter + rank)": time_call(tfidf_mode, args.repeat),
+            "tfidf mat-vec only": time_call(tfidf_matvec_only, args.repeat),
+        }
+
+        if args.pandas_baseline:
+            import pandas as pd
+            frame = pd.DataFrame({"skills_normalized": skill_sets, "experience_level": levels})
+            group = frame[frame["experience_level"] == 2]
+
+            def pandas_apply():
+                candidates = group.copy()
+                candidates["match_count"] = candidates["skills_normalized"].apply(lambda s: len(s & required))
+                candidates = candidates[candidates["match_count"] > 0].copy()
+                candidates["score"] = candidates["match_count"] * 2
+                return candidates.nlargest(quantity, "score")
+
+            rows["pandas apply (pre-026)"] = time_call(pandas_apply, max(3, args.repeat // 10))
+
+        print_table(f"Scoring one requirement over {args.employees} employees", rows)
+    return 0
+
+# ============================================
+# OCR PREPROCESSING
+# ============================================
+OCR_VARIANTS = {
+    "fixed 300dpi (legacy)": {"adaptive": False},
+    "adaptive dpi only": {"adaptive": True, "binarize": False, "crop": False, "deskew": False},
+    "adaptive + crop": {"adaptive": True, "binarize": False, "crop": True, "deskew": False},
+    "adaptive + binarize": {"adaptive": True, "binarize": True, "crop": True, "deskew": False},
+    "adaptive full (deskew)": {"adaptive": True, "binarize": True, "crop": True, "deskew": True},
+}
+
+SYNTHETIC_CV_LINES = [
+    "Jane Doe", "Email: jane.doe@example.com", "Skills",
+    "Python, Django, React, PostgreSQL, Docker, Kubernetes",
+    "Work Experience", "Senior developer building REST APIs with FastAPI and Java",
+    "Led migration from MySQL to PostgreSQL and AWS", "Education", "BSc Computer Science",
+]
+
+@contextmanager
+def ocr_options(**overrides):
+    from ocr_preprocess import OCR_CONFIG
+    saved = dict(OCR_CONFIG)
+    OCR_CONFIG.update(overrides)
+    try:
+        yield
+    finally:
+        OCR_CONFIG.clear()
+        OCR_CONFIG.update(saved)
+
+def synthetic_scans(directory: str, count: int, seed: int) -> List[str]:
+    """Scanned-looking one-page PDFs (300dpi raster, random skew, font size and noise) with .txt truth"""
+    import fitz
+    import numpy as np
+    from PIL import Image, ImageDraw, ImageFont
+
+    rng = np.random.default_rng(seed)
+    paths = []
+    for i in range(count):
+        point_size = float(rng.choice([9, 10, 11, 12, 14]))
+        page = Image.new("L", (2480, 3508), 255)
+        draw = ImageDraw.Draw(page)
+        font = ImageFont.load_default(size=int(point_size * 300 / 72))
+        y = 300
+        for line in SYNTHETIC_CV_LINES:
+            draw.text((250, y), line, fill=0, font=font)
+            y += int(point_size * 1.6 * 300 / 72)
+        page = page.rotate(float(rng.uniform(-3, 3)), fillcolor=255)
+        noisy = np.asarray(page, dtype=np.int16) + rng.normal(0, 18, (page.height, page.width))
+        page = Image.fromarray(np.clip(noisy, 0, 255).astype(np.uint8))
+
+        image_path = os.path.join(directory, f"scan{i}.png")
+        page.save(image_path)
+        document = fitz.open()
+        pdf_page = document.new_page(width=595, height=842)
+        pdf_page.insert_image(pdf_page.rect, filename=image_path)
+        pdf_path = os.path.join(directory, f"scan{i}.pdf")
+        document.save(pdf_path)
+        document.close()
+        os.unlink(image_path)
+        with open(pdf_path[:-4] + ".txt", "w", encoding="utf-8") as f:
+            f.write("\n".join(SYNTHETIC_CV_LINES))
+        paths.append(pdf_path)
+    return paths
+
+def word_recall(truth: str, text: str) -> float:
+    truth_words = re.findall(r"\w+", truth.lower())
+    found = set(re.findall(r"\w+", text.lower()))
+    return sum(1 for word in truth_words if word in found) / len(truth_words) if truth_words else 1.0
+
+def skill_f1(truth: str, text: str) -> float:
+    from skill_taxonomy import find_skills_in_text
+    expected, found = find_skills_in_text(truth), find_skills_in_text(text)
+    if not expected and not found:
+        return 1.0
+    hits = len(expected & found)
+    return 2 * hits / (len(expected) + len(found))
+
+def bench_ocr(args) -> int:
+    import tracemalloc
+    from extract_skills import ExtractionBudget, ocr_pdf_page
+    from pdf_text import open_pdf
+
+    with tempfile.TemporaryDirectory() as scratch:
+        if args.corpus:
+            pdfs = sorted(glob.glob(os.path.join(args.corpus, "*.pdf")))
+        else:
+            print(f"🧪 No --corpus given, generating {args.synthetic} synthetic scans")
+            pdfs = synthetic_scans(scratch, args.synthetic, args.seed)
+        if not pdfs:
+            print("❌ No PDFs found")
+            return 1
+
+        truths: Dict[str, Optional[str]] = {}
+        for pdf in pdfs:
+            sidecar = pdf[:-4] + ".txt"
+            truths[pdf] = open(sidecar, encoding="utf-8").read() if os.path.exists(sidecar) else None
+
+        results = {}
+        reference: Dict[str, str] = {}
+        for name, overrides in OCR_VARIANTS.items():
+            texts, seconds, peak = {}, 0.0, 0
+            with ocr_options(**overrides):
+                for pdf in pdfs:
+                    with open(pdf, "rb") as f:
+                        document = open_pdf(f.read())
+                    pages = min(document.page_count, args.max_pages)
+                    tracemalloc.start()
+                    start = time.perf_counter()
+                    texts[pdf] = "\n".join(
+                        ocr_pdf_page(document, page, ExtractionBudget(3600)) or "" for page in range(1, pages + 1)
+                    )
+                    seconds += time.perf_counter() - start
+                    document.close()
+                    peak = max(peak, tracemalloc.get_traced_memory()[1])
+                    tracemalloc.stop()
+            if not reference:
+                reference = texts   # legacy output is the truth where no sidecar exists
+
+            recall = [word_recall(truths[pdf] or reference[pdf], texts[pdf]) for pdf in pdfs]
+            f1 = [skill_f1(truths[pdf] or reference[pdf], texts[pdf]) for pdf in pdfs]
+            results[name] = (seconds / len(pdfs), peak / 1e6, sum(recall) / len(recall), sum(f1) / len(f1))
+
+    print(f"\n📊 OCR over {len(pdfs)} documents (accuracy vs sidecar .txt, else vs legacy output)")
+    print(f"   {'variant':<26}{'s/doc':>8}{'peak MB':>10}{'word recall':>13}{'skill F1':>10}")
+    for name, (seconds, peak_mb, recall, f1) in results.items():
+        print(f"   {name:<26}{seconds:>8.2f}{peak_mb:>10.1f}{recall:>13.3f}{f1:>10.3f}")
+    return 0
+
+# ============================================
+# PDF TEXT LAYER: PYMUPDF VS PYPDF2
+# ============================================
+def synthetic_text_pdfs(count: int, pages: int) -> List[bytes]:
+    """Text-layer CVs: SYNTHETIC_CV_LINES plus filler paragraphs on every page"""
+    import fitz
+    filler = "Delivered services with Python, Java and PostgreSQL for enterprise clients. " * 12
+    documents = []
+    for i in range(count):
+        document = fitz.open()
+        for p in range(pages):
+            page = document.new_page()
+            body = "\n".join(SYNTHETIC_CV_LINES) + f"\nPage {p + 1} of CV {i}\n" + filler
+            page.insert_textbox(fitz.Rect(50, 50, 545, 792), body, fontsize=10)
+        documents.append(document.tobytes())
+        document.close()
+    return documents
+
+def pypdf2_via_temp_file(pdf_bytes: bytes) -> str:
+    """The previous extract_skills path: write a temp file, reopen it with PyPDF2"""
+    from PyPDF2 import PdfReader
+    with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp:
+        tmp.write(pdf_bytes)
+    try:
+        with open(tmp.name, "rb") as f:
+            return "\n".join(page.extract_text() or "" for page in PdfReader(f).pages)
+    finally:
+        os.unlink(tmp.name)
+
+def engine_text(pdf_bytes: bytes, engine: str) -> str:
+    from pdf_text import open_pdf
+    with open_pdf(pdf_bytes, [engine]) as pdf:
+        return "\n".join(pdf.page_text(i) for i in range(pdf.page_count))
+
+def bench_pdf(args) -> int:
+    if args.corpus:
+        documents = []
+        for path in sorted(glob.glob(os.path.join(args.corpus, "*.pdf"))):
+            with open(path, "rb") as f:
+                documents.append(f.read())
+    else:
+        print(f"🧪 No --corpus given, generating {args.synthetic} synthetic {args.pages}-page PDFs")
+        documents = synthetic_text_pdfs(args.synthetic, args.pages)
+    if not documents:
+        print("❌ No PDFs found")
+        return 1
+
+    from pdf_text import open_pdf
+    total_pages = sum(open_pdf(pdf).page_count for pdf in documents)
+    variants = {
+        "pypdf2 + temp file (old)": pypdf2_via_temp_file,
+        "pypdf2 in memory": lambda pdf: engine_text(pdf, "pypdf2"),
+        "pymupdf in memory": lambda pdf: engine_text(pdf, "pymupdf"),
+    }
+    timings, texts = {}, {}
+    for name, extract in variants.items():
+        texts[name] = [extract(pdf) for pdf in documents]
+        timings[name] = time_call(lambda: [extract(pdf) for pdf in documents], args.repeat)
+
+    print_table(f"PDF text layer, {len(documents)} documents / {total_pages} pages per call", timings)
+    baseline = texts["pypdf2 + temp file (old)"]
+    print(f"   {'case':<28}{'pages/s':>10}{'word recall vs old':>20}")
+    for name, stats in timings.items():
+        recall = sum(word_recall(old, new) for old, new in zip(baseline, texts[name])) / len(documents)
+        print(f"   {name:<28}{total_pages / (stats['p50_ms'] / 1000):>10.0f}{recall:>20.3f}")
+    return 0
+
+# ============================================
+# DOCX: STREAMING PARSER VS PYTHON-DOCX
+# ============================================
+def synthetic_docx(directory: str, count: int, rows: int, seed: int) -> List[str]:
+    """CVs with a skills paragraph block and one large table with merged cells"""
+    import random
+    from docx import Document
+
+    rng = random.Random(seed)
+    skills = ["Python", "Java", "React", "Docker", "Kubernetes", "PostgreSQL", "AWS", "Go", "Terraform"]
+    paths = []
+    for i in range(count):
+        document = Document()
+        for line in SYNTHETIC_CV_LINES:
+            document.add_paragraph(line)
+        table = document.add_table(rows=rows, cols=4)
+        for r, row in enumerate(table.rows):
+            for c, cell in enumerate(row.cells):
+                cell.text = f"{rng.choice(skills)} project {r}-{c}"
+        for r in range(0, rows - 1, 7):
+            table.cell(r, 0).merge(table.cell(r, 1))            # horizontal merge
+            table.cell(r, 3).merge(table.cell(r + 1, 3))        # vertical merge
+        document.add_paragraph("References available on request")
+        path = os.path.join(directory, f"cv{i}.docx")
+        document.save(path)
+        paths.append(path)
+    return paths
+
+def bench_docx(args) -> int:
+    from extract_skills import extract_text_from_docx_legacy
+    from docx_stream import extract_docx_text
+
+    with tempfile.TemporaryDirectory() as scratch:
+        if args.corpus:
+            paths = sorted(glob.glob(os.path.join(args.corpus, "*.docx")))
+        else:
+            print(f"🧪 No --corpus given, generating {args.synthetic} synthetic CVs with {args.rows}-row tables")
+            paths = synthetic_docx(scratch, args.synthetic, args.rows, args.seed)
+        if not paths:
+            print("❌ No DOCX files found")
+            return 1
+
+        variants = {"python-docx": extract_text_from_docx_legacy, "streaming": extract_docx_text}
+        texts: Dict[str, Dict[str, str]] = {}
+        timings = {}
+        for name, extract in variants.items():
+            texts[name] = {path: extract(path) for path in paths}
+            timings[name] = time_call(lambda: [extract(path) for path in paths], args.repeat)
+
+    legacy, streaming = texts["python-docx"], texts["streaming"]
+    recall = sum(word_recall(legacy[p], streaming[p]) for p in paths) / len(paths)
+    f1 = sum(skill_f1(legacy[p], streaming[p]) for p in paths) / len(paths)
+    missing = sum(len(set(legacy[p].splitlines()) - set(streaming[p].splitlines())) for p in paths)
+
+    print_table(f"DOCX extraction, {len(paths)} documents per call", timings)
+    speedup = timings["python-docx"]["p50_ms"] / max(timings["streaming"]["p50_ms"], 1e-9)
+    print(f"   speedup: {speedup:.1f}x")
+    print(f"   streaming vs python-docx: word recall {recall:.3f}, skill F1 {f1:.3f}, "
+          f"{missing} legacy lines not reproduced verbatim")
+    return 0
+
+# ============================================
+# API RESPONSES: SERIALIZATION & COMPRESSION
+# ============================================
+def synthetic_recommendation_frame(projects: int, per_project: int, seed: int):
+    """get_recommendations' projects frame, recommended_employees holding NumPy scalars"""
+    import pandas as pd
+    rng = np.random.default_rng(seed)
+    skills = [f"Skill {i}" for i in range(200)]
+    rows = []
+    for _ in range(projects):
+        recommended = [{
+            "employee_id": rng.integers(1, 10**6), "user_id": f"user-{rng.integers(1, 10**6)}",
+            "assignment_type": "Full-Time", "assigned_hours": np.int64(40),
+            "allocation_percent": np.float64(100.0), "total_available_hours": np.int64(rng.integers(0, 40)),
+            "available_hours_in_window": np.int64(rng.integers(0, 40)),
+        } for _ in range(per_project)]
+        rows.append({
+            "project_id": int(rng.integers(1, 1000)), "experience_level": "Senior",
+            "required_skills": ", ".join(rng.choice(skills, 6)), "preferred_assignment_type": "Full-Time",
+            "quantity_needed": per_project, "recommended_employees": recommended,
+        })
+    return pd.DataFrame(rows)
+
+def synthetic_extraction_response(files: int) -> dict:
+    """/extract_skills response with per-file sections, skills and text previews"""
+    results = [{
+        "filename": f"cv_{i}.pdf",
+        "personal_info": {"name": f"Candidate {i}", "email": f"c{i}@example.com", "phone": "+1 555 010 0000"},
+        "skills": SYNTHETIC_CV_LINES[:4] * 5,
+        "sections": ["header", "skills", "experience", "education"],
+        "text_preview": " ".join(SYNTHETIC_CV_LINES) * 8,
+        "pdf_engine": "pymupdf", "pdf_engine_fallback_from": [], "truncated": False,
+        "processing_time_seconds": 0.42,
+    } for i in range(files)]
+    return {"results": results, "total_files": files, "successful": files, "failed": 0}
+
+def bench_json(args) -> int:
+    from fastapi.encoders import jsonable_encoder
+    from fastapi.responses import JSONResponse
+    from api_responses import (FastJSONResponse, brotli_backend, compress_body, dumps, frame_records,
+                               json_backend)
+
+    columns = ["experience_level", "required_skills", "preferred_assignment_type", "recommended_employees"]
+    frame = synthetic_recommendation_frame(args.projects, args.per_project, args.seed)
+    # The old path could only serialize Python scalars, so its frame holds those
+    plain = frame.copy()
+    plain["recommended_employees"] = [
+        [{key: value.item() if hasattr(value, "item") else value for key, value in employee.items()}
+         for employee in employees]
+        for employees in plain["recommended_employees"]
+    ]
+    extraction = synthetic_extraction_response(args.files)
+
+    def old_recommendations():
+        return JSONResponse(jsonable_encoder({"recommendations": plain[columns].to_dict(orient="records")})).body
+
+    def new_recommendations():
+        return FastJSONResponse({"recommendations": frame_records(frame, columns)}).body
+
+    payloads = {"recommendations": new_recommendations(), "extraction": dumps(extraction)}
+    timings = {
+        "recs: to_dict+encoder+json": time_call(old_recommendations, args.repeat),
+        "recs: frame_records+orjson": time_call(new_recommendations, args.repeat),
+        "extract: encoder+json": time_call(lambda: JSONResponse(jsonable_encoder(extraction)).body, args.repeat),
+        "extract: FastJSONResponse": time_call(lambda: FastJSONResponse(extraction).body, args.repeat),
+    }
+    backend = "orjson" if json_backend() is not None else "stdlib json (orjson not installed)"
+    print_table(f"Response serialization ({backend}), {args.projects}x{args.per_project} recommendations, "
+                f"{args.files} extraction results", timings)
+
+    encodings = ["gzip"] + (["br"] if brotli_backend() is not None else [])
+    print(f"   {'payload':<18}{'raw KB':>10}" + "".join(f"{e + ' KB':>10}{e + ' ms':>9}" for e in encodings))
+    for name, body in payloads.items():
+        row = f"   {name:<18}{len(body) / 1024:>10.1f}"
+        for encoding in encodings:
+            stats = time_call(lambda: compress_body(body, encoding), args.repeat)
+            row += f"{len(compress_body(body, encoding)) / 1024:>10.1f}{stats['p50_ms']:>9.2f}"
+        print(row)
+    if "br" not in encodings:
+        print("   (brotli not installed: br column skipped)")
+    return 0
+
+# ============================================
+# STARTUP: APP IMPORT TIME
+# ============================================
+IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+def bench_startup(args) -> int:
+    """Import the app in a fresh interpreter under -X importtime and enforce the budget"""
+    from startup_report import HEAVY_MODULES, STARTUP_BUDGET_MS
+
+    budget_ms = args.budget_ms if args.budget_ms is not None else STARTUP_BUDGET_MS
+    repo_dir = os.path.dirname(os.path.abspath(__file__))
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {args.module}"],
+        cwd=repo_dir, capture_output=True, text=True,
+    )
+    wall_ms = (time.perf_counter() - start) * 1000
+    if proc.returncode != 0:
+        print(proc.stderr[-2000:])
+        print(f"❌ import {args.module} failed")
+        return 1
+
+    cumulative: Dict[str, float] = {}
+    for line in proc.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            # Indentation marks nesting; keep the outermost (largest) entry per top-level name
+            name = match.group(4)
+            cumulative[name] = max(cumulative.get(name, 0.0), int(match.group(2)) / 1000)
+
+    total_ms = cumulative.get(args.module, 0.0)
+    heavy = sorted({name.split(".")[0] for name in cumulative} & set(HEAVY_MODULES))
+
+    print(f"\n📊 import {args.module}: {total_ms:.1f} ms (process wall {wall_ms:.1f} ms, budget {budget_ms:.0f} ms)")
+    print(f"   {'module':<40}{'cumulative ms':>15}")
+    top = sorted(cumulative.items(), key=lambda item: -item[1])[:args.top]
+    for name, ms in top:
+        print(f"   {name:<40}{ms:>15.1f}")
+
+    failed = False
+    if total_ms > budget_ms:
+        print(f"❌ Import time {total_ms:.1f} ms exceeds budget {budget_ms:.0f} ms")
+        failed = True
+    if heavy:
+        print(f"❌ Heavy modules imported at boot: {', '.join(heavy)}")
+        failed = True
+    if not failed:
+        print("✅ Startup within budget, no heavy modules at boot")
+    return 1 if failed else 0
+
+# ============================================
+# SKILL NORMALIZATION PROBES
+# ============================================
+# Profile entry -> expected canonical keys. The negative cases carry a meaningful
+# extra word that fuzzy similarity used to swallow ("React Native" -> react).
+SKILL_PROBES = [
+    ("HTML/CSS", ["html", "css"]),
+    ("Docker, Kubernetes & Terraform", ["docker", "kubernetes", "terraform"]),
+    ("React Native", ["react native"]),
+    ("Java EE", ["java ee"]),
+    ("Azure DevOps", ["azure devops"]),
+    ("ReactJS", ["react"]),
+    ("Microsoft Azure", ["azure"]),
+    ("Rest-API", ["api_integration"]),
+    ("postgres", ["postgresql"]),
+    ("Pythn", ["python"]),
+    ("Pyhton programming", ["python"]),
+    ("Kubernetis", ["kubernetes"]),
+    ("ui/ux design tool", ["figma"]),
+]
+
+def bench_skills(args) -> int:
+    """Check normalize_skills against the probe table and time uncached lookups"""
+    from skill_taxonomy import normalize_skills, resolve_skill
+
+    failed = False
+    print(f"\n📊 {len(SKILL_PROBES)} skill normalization probes")
+    for text, expected in SKILL_PROBES:
+        actual = normalize_skills(text)
+        ok = actual == expected
+        failed = failed or not ok
+        print(f"   {'✅' if ok else '❌'} {text!r:<36} -> {actual}" + ("" if ok else f" (expected {expected})"))
+
+    def uncached():
+        resolve_skill.cache_clear()
+        for text, _ in SKILL_PROBES:
+            normalize_skills(text)
+
+    stats = time_call(uncached, args.repeat)
+    print(f"   uncached pass: mean {stats['mean_ms']:.2f} ms, p95 {stats['p95_ms']:.2f} ms")
+    if not failed:
+        print("✅ All skill probes match")
+    return 1 if failed else 0
+
+# ============================================
+# ENTRY POINT
+# ============================================
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Resource Management System benchmarks")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    scoring = subparsers.add_parser("scoring", help="match vs tfidf recommendation scoring")
+    scoring.add_argument("--employees", type=int, default=100_000)
+    scoring.add_argument("--vocabulary", type=int, default=2_000)
+    scoring.add_argument("--skills-per-employee", type=int, default=8)
+    scoring.add_argument("--repeat", type=int, default=50)
+    scoring.add_argument("--seed", type=int, default=7)
+    scoring.add_argument("--pandas-baseline", action="store_true")
+    scoring.set_defaults(func=bench_scoring)
+
+    ocr = subparsers.add_parser("ocr", help="speed/accuracy of each OCR preprocessing option")
+    ocr.add_argument("--corpus", help="directory of PDFs, optionally with <name>.txt ground truth")
+    ocr.add_argument("--synthetic", type=int, default=10, help="synthetic scans to generate without --corpus")
+    ocr.add_argument("--max-pages", type=int, default=3)
+    ocr.add_argument("--seed", type=int, default=7)
+    ocr.set_defaults(func=bench_ocr)
+
+    pdf = subparsers.add_parser("pdf", help="text-layer throughput of each PDF engine")
+    pdf.add_argument("--corpus", help="directory of PDF CVs")
+    pdf.add_argument("--synthetic", type=int, default=20, help="synthetic PDFs to generate without --corpus")
+    pdf.add_argument("--pages", type=int, default=3)
+    pdf.add_argument("--repeat", type=int, default=5)
+    pdf.set_defaults(func=bench_pdf)
+
+    docx = subparsers.add_parser("docx", help="streaming vs python-docx DOCX text extraction")
+    docx.add_argument("--corpus", help="directory of .docx CVs")
+    docx.add_argument("--synthetic", type=int, default=10, help="synthetic CVs to generate without --corpus")
+    docx.add_argument("--rows", type=int, default=400, help="table rows per synthetic CV")
+    docx.add_argument("--repeat", type=int, default=3)
+    docx.add_argument("--seed", type=int, default=7)
+    docx.set_defaults(func=bench_docx)
+
+    api_json = subparsers.add_parser("json", help="response serialization and compression")
+    api_json.add_argument("--projects", type=int, default=50)
+    api_json.add_argument("--per-project", type=int, default=50)
+    api_json.add_argument("--files", type=int, default=50, help="extraction results in the payload")
+    api_json.add_argument("--repeat", type=int, default=20)
+    api_json.add_argument("--seed", type=int, default=7)
+    api_json.set_defaults(func=bench_json)
+
+    startup = subparsers.add_parser("startup", help="app import time per module, fails over budget")
+    startup.add_argument("--module", default="main")
+    startup.add_argument("--budget-ms", type=float, default=None)
+    startup.add_argument("--top", type=int, default=15)
+    startup.set_defaults(func=bench_startup)
+
+    skills = subparsers.add_parser("skills", help="skill normalization probes, fails on mismatch")
+    skills.add_argument("--repeat", type=int, default=20)
+    skills.set_defaults(func=bench_skills)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,246 @@
+# bulk_ingest.py
+"""
+Offline skill backfill: run the extract_skills pipeline over a directory of CVs
+(or a local export of the `cvs` bucket, laid out as <employee_id>/<file>) on a
+process pool and append one JSON result per file to a JSONL file.
+
+    python bulk_ingest.py ./cvs_export --output skills.jsonl
+    python bulk_ingest.py ./cvs_export --output skills.jsonl --update-db
+    python bulk_ingest.py --db-only --output skills.jsonl
+
+The output file doubles as the checkpoint: rerunning the same command skips
+every file already recorded, so a crashed backfill resumes where it stopped.
+"""
+import argparse
+import hashlib
+import json
+import logging
+import multiprocessing
+import os
+import sys
+import time
+from collections import OrderedDict
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+# ============================================
+# LOGGING SETUP
+# ============================================
+logger = logging.getLogger("bulk_ingest_logger")
+
+# ============================================
+# CONFIGURATION
+# ============================================
+INGEST_CONFIG = {
+    "workers": os.cpu_count() or 1,
+    "file_timeout": 120,          # extraction budget per file (seconds)
+    "max_tasks_per_child": 200,   # recycle workers so OCR/NLP memory growth stays bounded
+    "flush_every": 50,            # results between fsyncs of the output file
+    "progress_every": 100,
+    "db_batch_size": 200,         # employees per user_details read/write batch
+}
+
+# File types extract_from_bytes can handle
+INGEST_SUFFIXES = {".pdf", ".docx", ".png", ".jpg", ".jpeg"}
+
+# ============================================
+# DISCOVERY & CHECKPOINT
+# ============================================
+def checkpoint_key(rel_path: str, size: int, mtime_ns: int) -> str:
+    """Identifies one version of a file; a replaced file is ingested again"""
+    return f"{rel_path}:{size}:{mtime_ns}"
+
+def discover_files(root: str) -> Iterator[Tuple[str, str, int, int]]:
+    """(absolute path, path relative to root, size, mtime_ns) of every supported file, sorted"""
+    for folder, dirs, files in os.walk(root):
+        dirs.sort()
+        for name in sorted(files):
+            if os.path.splitext(name)[1].lower() not in INGEST_SUFFIXES:
+                continue
+            path = os.path.join(folder, name)
+            stat = os.stat(path)
+            yield path, os.path.relpath(path, root).replace(os.sep, "/"), stat.st_size, stat.st_mtime_ns
+
+def employee_id_for(rel_path: str) -> Optional[str]:
+    """Bucket exports store CVs as <employee_id>/<file>; flat directories have no owner"""
+    parts = rel_path.split("/")
+    return parts[0] if len(parts) > 1 else None
+
+def read_results(output_path: str) -> Iterator[Dict]:
+    """Records from a (possibly crash-truncated) JSONL output file"""
+    try:
+        with open(output_path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    continue    # torn last line from a crash
+    except FileNotFoundError:
+        return
+
+def load_checkpoint(output_path: str, retry_failed: bool) -> Set[str]:
+    done = set()
+    for record in read_results(output_path):
+        if retry_failed and record.get("error"):
+            continue
+        done.add(checkpoint_key(record["path"], record["size"], record["mtime_ns"]))
+    return done
+
+def open_output(output_path: str):
+    """Append handle; terminates a torn last line so new records start on their own line"""
+    needs_newline = False
+    if os.path.exists(output_path) and os.path.getsize(output_path) > 0:
+        with open(output_path, "rb") as f:
+            f.seek(-1, os.SEEK_END)
+            needs_newline = f.read(1) != b"\n"
+    handle = open(output_path, "a", encoding="utf-8")
+    if needs_newline:
+        handle.write("\n")
+    return handle
+
+# ============================================
+# WORKER PROCESS
+# ============================================
+def init_worker(log_level: int):
+    """One extraction per core: keep tesseract/BLAS single-threaded and preload spaCy"""
+    os.environ["OMP_THREAD_LIMIT"] = "1"
+    os.environ["OMP_NUM_THREADS"] = "1"
+    from extract_skills import get_nlp_model
+    logging.getLogger().setLevel(log_level)
+    try:
+        get_nlp_model()
+    except Exception as e:
+        logger.warning(f"⚠️ Worker {os.getpid()} could not preload spaCy: {e}")
+
+def ingest_file(task: Tuple[str, str, int, int, float]) -> Dict:
+    path, rel_path, size, mtime_ns, timeout = task
+    from extract_skills import extract_from_bytes
+
+    record = {"path": rel_path, "employee_id": employee_id_for(rel_path), "size": size, "mtime_ns": mtime_ns}
+    try:
+        with open(path, "rb") as f:
+            content = f.read()
+    except OSError as e:
+        return {**record, "skills": [], "error": f"read failed: {e}"}
+
+    result = extract_from_bytes(os.path.basename(path), content, time.monotonic() + timeout)
+    return {
+        **record,
+        "sha256": hashlib.sha256(content).hexdigest(),
+        "skills": result.get("skills", []),
+        "personal_info": result.get("personal_info", {}),
+        "sections": result.get("sections", []),
+        "truncated": result.get("truncated", False),
+        "processing_time_seconds": result.get("processing_time_seconds"),
+        "error": result.get("error"),
+    }
+
+# ============================================
+# EXTRACTION RUN
+# ============================================
+def run_extraction(args) -> Dict:
+    done = load_checkpoint(args.output, args.retry_failed)
+    tasks = [
+        (path, rel_path, size, mtime_ns, args.timeout)
+        for path, rel_path, size, mtime_ns in discover_files(args.directory)
+        if checkpoint_key(rel_path, size, mtime_ns) not in done
+    ]
+    logger.info(f"📂 {len(tasks)} files to ingest ({len(done)} already in {args.output}), "
+                f"{args.workers} workers")
+    stats = {"processed": 0, "failed": 0, "truncated": 0, "skipped": len(done)}
+    if not tasks:
+        return stats
+
+    start = time.time()
+    worker_log_level = logging.DEBUG if args.verbose else logging.WARNING
+    with open_output(args.output) as out, multiprocessing.Pool(
+        args.workers, initializer=init_worker, initargs=(worker_log_level,),
+        maxtasksperchild=INGEST_CONFIG["max_tasks_per_child"],
+    ) as pool:
+        for record in pool.imap_unordered(ingest_file, tasks, chunksize=1):
+            out.write(json.dumps(record, ensure_ascii=False) + "\n")
+            stats["processed"] += 1
+            stats["failed"] += bool(record.get("error"))
+            stats["truncated"] += bool(record.get("truncated"))
+
+            if stats["processed"] % INGEST_CONFIG["flush_every"] == 0:
+                out.flush()
+                os.fsync(out.fileno())
+            if stats["processed"] % INGEST_CONFIG["progress_every"] == 0:
+                elapsed = time.time() - start
+                rate = stats["processed"] / elapsed
+                eta = (len(tasks) - stats["processed"]) / rate if rate else 0
+                logger.info(f"⏱️  {stats['processed']}/{len(tasks)} files, {rate:.1f} files/s, "
+                            f"ETA {eta / 60:.1f} min, {stats['failed']} failed")
+        out.flush()
+        os.fsync(out.fileno())
+
+    stats["seconds"] = round(time.time() - start, 1)
+    return stats
+
+# ============================================
+# OPTIONAL USER_DETAILS UPDATE
+# ============================================
+def skills_by_employee(output_path: str) -> "OrderedDict[str, List[str]]":
+    """Union of extracted skills per employee over every CV recorded in the output"""
+    merged: "OrderedDict[str, List[str]]" = OrderedDict()
+    for record in read_results(output_path):
+        employee_id = record.get("employee_id")
+        if not employee_id or record.get("error"):
+            continue
+        skills = merged.setdefault(employee_id, [])
+        skills.extend(skill for skill in record.get("skills", []) if skill not in skills)
+    return merged
+
+def push_skill_updates(output_path: str, batch_size: int, dry_run: bool = False) -> Dict:
+    """
+    Merge extracted skills into user_details.skills through the batched
+    write-back (one select and one merge_employee_skills call per batch).
+    Existing skills are never removed, so it is safe to rerun after a crash. Employee ids without a user_details row are listed in missing_ids.
+    """
+    from project_recommendation import employee_store, get_supabase_client
+    from skill_writeback import write_skills
+
+    client = get_supabase_client()
+    if client is None:
+        raise RuntimeError("Database connection not available")
+
+    stats = write_skills(client, skills_by_employee(output_path), batch_size, dry_run)
+    if stats["updated"] and not dry_run:
+        employee_store.invalidate()
+    return stats
+
+# ============================================
+# ENTRY POINT
+# ============================================
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Bulk CV skill extraction to JSONL")
+    parser.add_argument("directory", nargs="?", help="directory of CVs or local export of the cvs bucket")
+    parser.add_argument("--output", required=True, help="JSONL results file (also the resume checkpoint)")
+    parser.add_argument("--workers", type=int, default=INGEST_CONFIG["workers"])
+    parser.add_argument("--timeout", type=float, default=INGEST_CONFIG["file_timeout"],
+                        help="extraction budget per file in seconds")
+    parser.add_argument("--retry-failed", action="store_true", help="reprocess files recorded with an error")
+    parser.add_argument("--update-db", action="store_true", help="merge extracted skills into user_details")
+    parser.add_argument("--db-only", action="store_true", help="skip extraction, only push the existing output")
+    parser.add_argument("--db-batch-size", type=int, default=INGEST_CONFIG["db_batch_size"])
+    parser.add_argument("--dry-run", action="store_true", help="report user_details changes without writing")
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s | %(levelname)s | %(message)s")
+
+    if not args.db_only:
+        if not args.directory or not os.path.isdir(args.directory):
+            parser.error("directory is required (and must exist) unless --db-only is given")
+        stats = run_extraction(args)
+        logger.info(f"✅ Extraction done: {stats}")
+
+    if args.update_db or args.db_only:
+        stats = push_skill_updates(args.output, args.db_batch_size, args.dry_run)
+        logger.info(f"✅ user_details update done: {stats}")
+        if stats["failed"]:
+            return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
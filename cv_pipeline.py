@@ -0,0 +1,99 @@
+import time
+import asyncio
+import logging
+from typing import List, Tuple, Union
+
+from fastapi import APIRouter, UploadFile, File, Form, HTTPException
+from fastapi.responses import StreamingResponse
+
+from upload_cv import BufferedUpload, buffer_upload, iter_upload_file, store_validated, summarize_uploads
+from extract_skills import PROCESSING_CONFIG, extract_from_bytes, summarize_extraction
+from skill_writeback import submit_extraction
+from api_responses import FastJSONResponse, dumps
+
+# ---------- Logging Config ----------
+logger = logging.getLogger("cv_pipeline_logger")
+
+router = APIRouter()
+
+# -----------------------------
+# Fan one in-memory buffer out to storage and extraction
+# -----------------------------
+async def receive_file(file: UploadFile) -> Tuple[str, Union[BufferedUpload, dict]]:
+    """One upload through the /upload_cv checks (extension, magic bytes, size limit), or its rejection"""
+    try:
+        return file.filename, await buffer_upload(iter_upload_file(file), file.filename)
+    except ValueError as e:
+        logger.warning(f"⛔ Rejected {file.filename}: {e}")
+        return file.filename, {"filename": file.filename, "success": False, "error": str(e)}
+
+async def receive_all(files: List[UploadFile]) -> Tuple[List[Tuple[str, BufferedUpload]], List[dict]]:
+    """Read and validate every upload concurrently; accepted (filename, buffer) pairs and rejections"""
+    received = await asyncio.gather(*[receive_file(file) for file in files])
+    accepted = [(filename, upload) for filename, upload in received if isinstance(upload, BufferedUpload)]
+    rejected = [upload for _, upload in received if not isinstance(upload, BufferedUpload)]
+    return accepted, rejected
+
+async def upload_all(employee_id: str, accepted: List[Tuple[str, BufferedUpload]], rejected: List[dict]) -> dict:
+    saved_files = await asyncio.gather(*[
+        store_validated(filename, employee_id, upload) for filename, upload in accepted
+    ])
+    return summarize_uploads(employee_id, list(saved_files) + rejected)
+
+async def extract_all(employee_id: str, buffers: List[tuple], time_budget: float) -> dict:
+    start_time = time.time()
+    deadline = time.monotonic() + max(0.0, time_budget)
+    results = await asyncio.gather(*[
+        asyncio.to_thread(extract_from_bytes, filename, content, deadline) for filename, content in buffers
+    ])
+    summary = summarize_extraction(results, time.time() - start_time)
+    # Queued for the batched user_details write-back; recommendations pick it up after the flush
+    summary["skills_queued"] = submit_extraction(employee_id, results)
+    return summary
+
+# -----------------------------
+# Upload + Extract in one request
+# -----------------------------
+@router.post("/upload_and_extract/")
+async def upload_and_extract(
+    employee_id: str = Form(...),
+    files: List[UploadFile] = File(...),
+    stream: bool = False,
+    time_budget: float = PROCESSING_CONFIG["timeout"]
+):
+    """
+    Receive each CV once, then upload it and extract skills from the same
+    bytes concurrently. With ?stream=true the response is NDJSON with an
+    "upload" and an "extraction" event, each sent as soon as it is ready.
+    Extraction stops at time_budget seconds and reports truncated files.
+    Extracted skills are merged into the employee's user_details row.
+    Files /upload_cv would reject (type, signature, size) are reported in the
+    upload result and never extracted.
+    """
+    if not files:
+        raise HTTPException(status_code=400, detail="No files uploaded")
+
+    logger.info(f"🚀 Upload + extract for employee {employee_id} with {len(files)} files")
+    # Each CV is read once into memory; storage and extraction share that buffer
+    accepted, rejected = await receive_all(files)
+    buffers = [(filename, upload.content) for filename, upload in accepted]
+
+    upload_task = asyncio.create_task(upload_all(employee_id, accepted, rejected))
+    extract_task = asyncio.create_task(extract_all(employee_id, buffers, time_budget))
+
+    if not stream:
+        upload_result, extraction_result = await asyncio.gather(upload_task, extract_task)
+        return FastJSONResponse({**upload_result, "extraction": extraction_result})
+
+    async def events():
+        pending = {upload_task: "upload", extract_task: "extraction"}
+        try:
+            while pending:
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    event = pending.pop(task)
+                    yield dumps({"event": event, "data": task.result()}) + b"\n"
+        finally:
+            await asyncio.gather(upload_task, return_exceptions=True)
+
+    return StreamingResponse(events(), media_type="application/x-ndjson")
@@ -0,0 +1,183 @@
+import re
+import logging
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from span_store import SPAN_BOLD_FLAG, SpanStore
+
+# ============================================
+# LOGGING SETUP
+# ============================================
+logger = logging.getLogger("cv_sections_logger")
+
+# ============================================
+# SECTION VOCABULARY
+# ============================================
+HEADER_SECTION = "header"   # everything before the first heading (name, contact details)
+
+SECTION_HEADINGS = {
+    "contact": ["personal information", "personal details", "contact", "contact information", "contact details"],
+    "summary": ["summary", "professional summary", "profile", "about me", "objective", "career objective"],
+    "skills": ["skills", "technical skills", "key skills", "core skills", "core competencies",
+               "competencies", "technologies", "tech stack", "tools", "expertise"],
+    "experience": ["experience", "work experience", "professional experience", "employment",
+                   "employment history", "work history", "career history"],
+    "projects": ["projects", "key projects", "personal projects", "academic projects"],
+    "education": ["education", "academic background", "qualifications"],
+    "certifications": ["certifications", "certificates", "licenses", "courses", "training"],
+    "languages": ["languages"],
+    "interests": ["interests", "hobbies", "activities"],
+    "references": ["references", "referees"],
+}
+
+HEADING_LOOKUP = {alias: section for section, aliases in SECTION_HEADINGS.items() for alias in aliases}
+
+# Sections worth matching skills against; education, hobbies etc. mostly add false positives.
+# "languages" often lists programming languages ("Languages: Python, Java, SQL").
+SKILL_SECTIONS = ("skills", "experience", "projects", "summary", "certifications", "languages")
+CONTACT_SECTIONS = (HEADER_SECTION, "contact")
+
+# A heading line: optional bullet/numbering, one known alias, optional colon and inline content
+HEADING_PATTERN = re.compile(
+    r"^[\s\-•*#\d.)]*(" + "|".join(sorted(map(re.escape, HEADING_LOOKUP), key=len, reverse=True)) +
+    r")\s*(?::\s*(.*))?$",
+    re.IGNORECASE
+)
+
+# Word stems for layout headings that are not exact aliases, e.g. "TECHNICAL STACK"
+HEADING_STEMS = {
+    "skill": "skills", "stack": "skills", "technical": "skills", "tool": "skills", "technolog": "skills",
+    "experience": "experience", "employment": "experience", "career": "experience",
+    "project": "projects", "education": "education", "academic": "education",
+    "certif": "certifications", "training": "certifications", "course": "certifications",
+    "contact": "contact", "personal": "contact", "summary": "summary", "profile": "summary",
+    "interest": "interests", "hobb": "interests", "language": "languages", "referee": "references",
+    "reference": "references",
+}
+OTHER_SECTION = "other"     # layout heading we cannot classify (awards, publications, ...)
+
+MAX_HEADING_WORDS = 5
+CONTACT_FALLBACK_LINES = 15
+SPAN_HEADING_SIZE_RATIO = 1.15
+
+# ============================================
+# TEXT SEGMENTATION
+# ============================================
+def match_heading(line: str) -> Optional[Tuple[str, str]]:
+    """(section, inline content) when the line is a known section heading"""
+    stripped = line.strip()
+    if not stripped or len(stripped.split()) > MAX_HEADING_WORDS and ":" not in stripped:
+        return None
+    match = HEADING_PATTERN.match(stripped)
+    if not match:
+        return None
+    return HEADING_LOOKUP[match.group(1).lower()], (match.group(2) or "").strip()
+
+def split_sections(lines: List[str], heading_hints: Optional[List[bool]] = None) -> Dict[str, str]:
+    """
+    Group lines under the most recent heading. heading_hints marks lines that
+    look like headings from layout (large or bold font); such lines open a
+    section even when the text is not a known alias, e.g. "TECHNICAL STACK".
+    """
+    sections: "OrderedDict[str, List[str]]" = OrderedDict()
+    current = HEADER_SECTION
+
+    for i, line in enumerate(lines):
+        heading = match_heading(line)
+        if heading is None and heading_hints and heading_hints[i]:
+            heading = guess_heading(line)
+            # The name line at the top is usually large/bold too; keep it in the header
+            if heading is None and current != HEADER_SECTION:
+                heading = (OTHER_SECTION, "")
+        if heading is not None:
+            current, inline = heading
+            sections.setdefault(current, [])
+            if inline:
+                sections[current].append(inline)
+            continue
+        if line.strip():
+            sections.setdefault(current, []).append(line)
+
+    return OrderedDict((name, "\n".join(body)) for name, body in sections.items())
+
+def guess_heading(line: str) -> Optional[Tuple[str, str]]:
+    """Map an unknown layout heading to a section by the first word stem it contains"""
+    for word in re.findall(r"[a-z]+", line.lower()):
+        for stem, section in HEADING_STEMS.items():
+            if word.startswith(stem):
+                return section, ""
+    return None
+
+def segment_text(text: str) -> Dict[str, str]:
+    return split_sections(text.split("\n"))
+
+# ============================================
+# LAYOUT (SPAN) SEGMENTATION
+# ============================================
+def span_lines(spans: SpanStore) -> Tuple[List[str], List[bool]]:
+    """
+    Rebuild reading-order lines from a SpanStore and
+    flag the ones set larger than body text or in bold.
+    """
+    visible = np.flatnonzero(spans.visible)
+    if not len(visible):
+        return [], []
+    body_size = spans.body_size()
+
+    # Spans sharing a page and baseline (to the nearest 2pt) form one line, read left to right
+    page = spans.page[visible]
+    baseline = np.round(spans.bbox[visible, 3].astype(np.float64) / 2)
+    order = np.lexsort((spans.bbox[visible, 0], baseline, page))
+    visible, page, baseline = visible[order], page[order], baseline[order]
+    starts = np.flatnonzero(np.r_[True, (page[1:] != page[:-1]) | (baseline[1:] != baseline[:-1])])
+
+    large = np.maximum.reduceat(spans.size[visible], starts) >= body_size * SPAN_HEADING_SIZE_RATIO
+    bold = np.logical_and.reduceat((spans.flags[visible] & SPAN_BOLD_FLAG) != 0, starts)
+    bounds = np.r_[starts, len(visible)]
+
+    lines, hints = [], []
+    for line, (start, end) in enumerate(zip(bounds[:-1], bounds[1:])):
+        text = " ".join(spans.text(i).strip() for i in visible[start:end])
+        lines.append(text)
+        hints.append(bool((large[line] or bold[line]) and len(text.split()) <= MAX_HEADING_WORDS))
+    return lines, hints
+
+def segment_spans(spans: SpanStore) -> Dict[str, str]:
+    lines, hints = span_lines(spans)
+    return split_sections(lines, hints)
+
+def segment_cv(text: str, spans: Optional[SpanStore] = None) -> Dict[str, str]:
+    """Sections from layout when spans are available and useful, else from plain text"""
+    if spans:
+        sections = segment_spans(spans)
+        if len(sections) > 1:
+            return sections
+        logger.debug("Layout segmentation found no headings, falling back to text")
+    return segment_text(text)
+
+# ============================================
+# FOCUSED VIEWS FOR THE EXPENSIVE STAGES
+# ============================================
+def contact_block(sections: Dict[str, str], text: str) -> str:
+    """Text for NER: the header/contact sections, or the first lines if there are none"""
+    block = "\n".join(sections[name] for name in CONTACT_SECTIONS if sections.get(name))
+    if block.strip():
+        return block
+    return "\n".join(text.split("\n")[:CONTACT_FALLBACK_LINES])
+
+def skill_text(sections: Dict[str, str], text: str) -> str:
+    """Text for skill matching: skill-bearing sections, or everything if none were found"""
+    block = "\n".join(sections[name] for name in SKILL_SECTIONS if sections.get(name))
+    return block if block.strip() else text
+
+def skill_signal_complete(sections: Dict[str, str]) -> bool:
+    """
+    True once the skills and experience sections have both been closed by a
+    later heading, i.e. reading more pages cannot add to either of them.
+    """
+    names = list(sections)
+    if "skills" not in names or "experience" not in names:
+        return False
+    return max(names.index("skills"), names.index("experience")) < len(names) - 1
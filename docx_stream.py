@@ -0,0 +1,109 @@
+import zipfile
+import logging
+import xml.etree.ElementTree as ET
+from typing import IO, Dict, Iterator, List, Tuple, Union
+
+# ============================================
+# LOGGING SETUP
+# ============================================
+logger = logging.getLogger("docx_stream_logger")
+
+# ============================================
+# WORDPROCESSINGML NAMES
+# ============================================
+DOCUMENT_PART = "word/document.xml"
+READ_CHUNK_SIZE = 64 * 1024
+
+W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+MC = "{http://schemas.openxmlformats.org/markup-compatibility/2006}"
+
+PARAGRAPH, ROW, CELL = f"{W}p", f"{W}tr", f"{W}tc"
+TEXT, TAB, BREAK, CARRIAGE_RETURN = f"{W}t", f"{W}tab", f"{W}br", f"{W}cr"
+# Text boxes are stored twice (DrawingML + VML fallback); only read the first copy
+FALLBACK = f"{MC}Fallback"
+
+PARAGRAPH_BLOCK, ROW_BLOCK = "paragraph", "row"
+
+# ============================================
+# STREAMING EXTRACTION
+# ============================================
+class DocxTextTarget:
+    """
+    Expat parser target: builds no element tree, only the text of the
+    paragraphs and table rows still open, and queues finished blocks.
+    """
+
+    def __init__(self):
+        self.blocks: List[Tuple[str, str]] = []
+        self.paragraphs: List[List[str]] = []   # open paragraphs (text boxes nest them)
+        self.cells: List[List[str]] = []        # open table cells (nested tables nest them)
+        self.rows: List[List[str]] = []         # open table rows
+        self.skip_depth = 0
+        self.in_text = False
+
+    def start(self, tag: str, attrib: Dict[str, str]):
+        if tag == FALLBACK:
+            self.skip_depth += 1
+        elif self.skip_depth:
+            return
+        elif tag == TEXT:
+            self.in_text = True
+        elif tag == PARAGRAPH:
+            self.paragraphs.append([])
+        elif tag == CELL:
+            self.cells.append([])
+        elif tag == ROW:
+            self.rows.append([])
+        elif tag == TAB and self.paragraphs:
+            self.paragraphs[-1].append("\t")
+        elif (tag == BREAK or tag == CARRIAGE_RETURN) and self.paragraphs:
+            self.paragraphs[-1].append("\n")
+
+    def data(self, text: str):
+        if self.in_text and self.paragraphs:
+            self.paragraphs[-1].append(text)
+
+    def end(self, tag: str):
+        if tag == FALLBACK:
+            self.skip_depth -= 1
+        elif self.skip_depth:
+            return
+        elif tag == TEXT:
+            self.in_text = False
+        elif tag == PARAGRAPH:
+            text = "".join(self.paragraphs.pop())
+            if self.cells:
+                self.cells[-1].append(text)
+            elif text.strip():
+                self.blocks.append((PARAGRAPH_BLOCK, text))
+        elif tag == CELL:
+            text = "\n".join(self.cells.pop()).strip()
+            if self.rows and text:
+                self.rows[-1].append(text)
+        elif tag == ROW:
+            text = " ".join(self.rows.pop())
+            if text:
+                self.blocks.append((ROW_BLOCK, text))
+
+    def close(self):
+        return None
+
+def iter_docx_blocks(source: Union[str, IO[bytes]]) -> Iterator[Tuple[str, str]]:
+    """
+    Yield ("paragraph", text) and ("row", text) in document order straight
+    from word/document.xml, reading it in chunks. Table rows are their cells'
+    text joined by a space, as in the python-docx extractor; paragraphs in
+    cells and text boxes are included.
+    """
+    with zipfile.ZipFile(source) as archive, archive.open(DOCUMENT_PART) as xml_stream:
+        target = DocxTextTarget()
+        parser = ET.XMLParser(target=target)
+        for chunk in iter(lambda: xml_stream.read(READ_CHUNK_SIZE), b""):
+            parser.feed(chunk)
+            yield from target.blocks
+            target.blocks.clear()
+        parser.close()
+        yield from target.blocks
+
+def extract_docx_text(source: Union[str, IO[bytes]]) -> str:
+    return "\n".join(text for _, text in iter_docx_blocks(source))
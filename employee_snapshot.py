@@ -0,0 +1,284 @@
+import os
+import json
+import time
+import shutil
+import logging
+import tempfile
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+# ============================================
+# LOGGING SETUP
+# ============================================
+logger = logging.getLogger("employee_snapshot_logger")
+
+# ============================================
+# CONFIGURATION
+# ============================================
+SNAPSHOT_CONFIG = {
+    "directory": os.getenv(
+        "EMPLOYEE_SNAPSHOT_DIR",
+        os.path.join(tempfile.gettempdir(), "rms_employee_snapshot")
+    ),
+    "ttl_seconds": int(os.getenv("EMPLOYEE_SNAPSHOT_TTL", "60")),
+    "keep_generations": 2,
+    "lock_timeout": 30,
+}
+
+CURRENT_POINTER = "CURRENT"
+LOCK_FILE = "build.lock"
+INVALIDATED_FILE = "INVALIDATED"    # mtime = newest change any worker knows the snapshot lacks
+META_FILE = "meta.json"
+GENERATION_PREFIX = "gen-"
+
+# Bits set per byte value, used to popcount skill bitmasks without numpy>=2.0
+POPCOUNT_TABLE = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+# ============================================
+# BITMASK HELPERS
+# ============================================
+def pack_skill_bits(skill_sets: List[Iterable[str]], vocabulary: Dict[str, int]) -> np.ndarray:
+    """Pack per-employee skill sets into a (rows, words) uint64 bitmask matrix"""
+    words = max(1, (len(vocabulary) + 63) // 64)
+    bits = np.zeros((len(skill_sets), words), dtype=np.uint64)
+    for row, skills in enumerate(skill_sets):
+        for skill in skills:
+            index = vocabulary.get(skill)
+            if index is not None:
+                bits[row, index >> 6] |= np.uint64(1 << (index & 63))
+    return bits
+
+def count_bits(words: np.ndarray) -> np.ndarray:
+    """Popcount each row of a uint64 bitmask matrix"""
+    if words.size == 0:
+        return np.zeros(words.shape[0], dtype=np.int64)
+    as_bytes = np.ascontiguousarray(words).view(np.uint8).reshape(words.shape[0], -1)
+    return POPCOUNT_TABLE[as_bytes].sum(axis=1, dtype=np.int64)
+
+# ============================================
+# SNAPSHOT (READ SIDE)
+# ============================================
+class EmployeeSnapshot:
+    """Read-only, memory-mapped view of one snapshot generation"""
+
+    def __init__(self, generation: str, path: str):
+        self.generation = generation
+        self.path = path
+        with open(os.path.join(path, META_FILE), "r", encoding="utf-8") as f:
+            self.meta = json.load(f)
+
+        # mmap_mode="r" maps the .npy files straight from the page cache, so
+        # every worker process shares the same physical pages.
+        self.columns = {
+            name: np.load(os.path.join(path, f"{name}.npy"), mmap_mode="r", allow_pickle=False)
+            for name in self.meta["columns"]
+        }
+        self.skill_index = {skill: i for i, skill in enumerate(self.meta["skills"])}
+        self.level_index = {level: i for i, level in enumerate(self.meta["experience_levels"])}
+        # Per-process objects derived from this generation (e.g. sparse matrices)
+        self.derived: Dict[str, object] = {}
+
+    def __len__(self) -> int:
+        return int(self.meta["rows"])
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self.columns[name]
+
+    @property
+    def built_at(self) -> float:
+        return float(self.meta["built_at"])
+
+    def skill_mask(self, skills: Iterable[str]) -> np.ndarray:
+        """Bitmask row for a set of already-normalized skills"""
+        return pack_skill_bits([skills], self.skill_index)[0]
+
+    def level_code(self, level: str) -> Optional[int]:
+        return self.level_index.get(level)
+
+# ============================================
+# SNAPSHOT (WRITE SIDE)
+# ============================================
+def write_snapshot(directory: str, columns: Dict[str, np.ndarray], meta: Dict) -> str:
+    """Write a new generation to disk and atomically point CURRENT at it"""
+    os.makedirs(directory, exist_ok=True)
+    generation = f"{GENERATION_PREFIX}{time.time_ns()}-{os.getpid()}"
+    staging = os.path.join(directory, f".{generation}.tmp")
+    os.makedirs(staging)
+
+    for name, values in columns.items():
+        np.save(os.path.join(staging, f"{name}.npy"), np.ascontiguousarray(values), allow_pickle=False)
+
+    # built_at may be passed in as the time the source data was read
+    meta = dict(meta, columns=sorted(columns), generation=generation)
+    meta.setdefault("built_at", time.time())
+    with open(os.path.join(staging, META_FILE), "w", encoding="utf-8") as f:
+        json.dump(meta, f)
+
+    os.rename(staging, os.path.join(directory, generation))
+
+    pointer_tmp = os.path.join(directory, f".{CURRENT_POINTER}.{os.getpid()}.tmp")
+    with open(pointer_tmp, "w", encoding="utf-8") as f:
+        f.write(generation)
+    os.replace(pointer_tmp, os.path.join(directory, CURRENT_POINTER))
+
+    logger.info(f"📦 Wrote employee snapshot {generation} ({meta.get('rows', 0)} rows)")
+    return generation
+
+def read_current_generation(directory: str) -> Optional[str]:
+    try:
+        with open(os.path.join(directory, CURRENT_POINTER), "r", encoding="utf-8") as f:
+            return f.read().strip() or None
+    except FileNotFoundError:
+        return None
+
+def prune_generations(directory: str, keep: int):
+    """Remove old generations; workers still mapping them keep their pages"""
+    current = read_current_generation(directory)
+    try:
+        generations = sorted(
+            name for name in os.listdir(directory) if name.startswith(GENERATION_PREFIX)
+        )
+    except FileNotFoundError:
+        return
+
+    for name in generations[:-keep] if keep > 0 else generations:
+        if name == current:
+            continue
+        try:
+            shutil.rmtree(os.path.join(directory, name))
+        except OSError as e:
+            logger.debug(f"Could not prune snapshot {name}: {e}")
+
+# ============================================
+# PER-PROCESS STORE
+# ============================================
+class SnapshotStore:
+    """
+    Keeps the current generation mapped in this process and rebuilds it when
+    it is older than the TTL. Only one process builds at a time; the others
+    keep serving the previous generation until CURRENT flips.
+    """
+
+    def __init__(self, builder: Callable[[], Tuple[Dict[str, np.ndarray], Dict]],
+                 directory: Optional[str] = None, ttl_seconds: Optional[int] = None,
+                 schema: int = 1):
+        self.builder = builder
+        self.schema = schema
+        self.directory = directory or SNAPSHOT_CONFIG["directory"]
+        self.ttl_seconds = SNAPSHOT_CONFIG["ttl_seconds"] if ttl_seconds is None else ttl_seconds
+        self._snapshot: Optional[EmployeeSnapshot] = None
+
+    def get(self) -> EmployeeSnapshot:
+        generation = read_current_generation(self.directory)
+        meta = self._read_meta(generation)
+
+        # A generation written with another column layout cannot be served at all
+        usable = meta is not None and meta.get("schema", 1) == self.schema
+        if not usable or self._is_stale(meta):
+            generation = self._refresh(has_fallback=usable) or generation
+
+        if self._snapshot is None or self._snapshot.generation != generation:
+            self._snapshot = EmployeeSnapshot(generation, os.path.join(self.directory, generation))
+            logger.info(f"🔁 Mapped employee snapshot {generation}")
+
+        return self._snapshot
+
+    def refresh(self) -> EmployeeSnapshot:
+        """Force a rebuild regardless of TTL"""
+        self._refresh(has_fallback=False, force=True)
+        return self.get()
+
+    def invalidate(self):
+        """
+        Mark every generation built before now as stale, for all workers
+        sharing the directory; the next get() anywhere rebuilds it.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, INVALIDATED_FILE)
+        with open(path, "a", encoding="utf-8"):
+            pass
+        os.utime(path)
+        logger.info("🧹 Employee snapshot invalidated")
+
+    def _read_meta(self, generation: Optional[str]) -> Optional[Dict]:
+        if generation is None:
+            return None
+        if self._snapshot is not None and self._snapshot.generation == generation:
+            return self._snapshot.meta
+        try:
+            with open(os.path.join(self.directory, generation, META_FILE), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _is_stale(self, meta: Dict) -> bool:
+        built_at = float(meta.get("built_at", 0))
+        return time.time() - built_at > self.ttl_seconds or built_at < self._invalidated_at()
+
+    def _invalidated_at(self) -> float:
+        try:
+            return os.path.getmtime(os.path.join(self.directory, INVALIDATED_FILE))
+        except FileNotFoundError:
+            return 0.0
+
+    def _refresh(self, has_fallback: bool, force: bool = False) -> Optional[str]:
+        os.makedirs(self.directory, exist_ok=True)
+        lock_path = os.path.join(self.directory, LOCK_FILE)
+
+        deadline = time.time() + SNAPSHOT_CONFIG["lock_timeout"]
+        while True:
+            try:
+                fd = os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+                os.close(fd)
+                break
+            except FileExistsError:
+                if self._lock_is_abandoned(lock_path):
+                    self._remove_lock(lock_path)
+                    continue
+                if has_fallback and not force:
+                    # Another worker is building; keep serving what we have.
+                    return None
+                if time.time() > deadline:
+                    self._remove_lock(lock_path)
+                    continue
+                time.sleep(0.05)
+
+        try:
+            # Someone may have finished a build while we waited for the lock.
+            generation = read_current_generation(self.directory)
+            meta = self._read_meta(generation)
+            if (not force and meta is not None and meta.get("schema", 1) == self.schema
+                    and not self._is_stale(meta)):
+                return generation
+
+            try:
+                # Taken before the fetch, so a write landing mid-build still invalidates it
+                fetched_at = time.time()
+                columns, meta = self.builder()
+            except Exception as e:
+                if not has_fallback:
+                    raise
+                logger.error(f"❌ Snapshot rebuild failed, serving previous generation: {e}")
+                return None
+
+            generation = write_snapshot(self.directory, columns,
+                                        dict(meta, schema=self.schema, built_at=fetched_at))
+            prune_generations(self.directory, SNAPSHOT_CONFIG["keep_generations"])
+            return generation
+        finally:
+            self._remove_lock(lock_path)
+
+    @staticmethod
+    def _lock_is_abandoned(lock_path: str) -> bool:
+        try:
+            return time.time() - os.path.getmtime(lock_path) > SNAPSHOT_CONFIG["lock_timeout"]
+        except FileNotFoundError:
+            return False
+
+    @staticmethod
+    def _remove_lock(lock_path: str):
+        try:
+            os.unlink(lock_path)
+        except FileNotFoundError:
+            pass
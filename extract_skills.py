@@ -1,36 +1,38 @@
 import os
 import re
-import tempfile
 import logging
 import asyncio
-import concurrent.futures
 import time
 from functools import lru_cache
-from fastapi import APIRouter, UploadFile, File
-from pdf2image import convert_from_path
-import pytesseract
-from docx import Document
-from typing import List
+from fastapi import APIRouter, UploadFile, File, Form
+from typing import List, Optional
 from io import BytesIO
-from PIL import Image
-import spacy
-import PyPDF2
-from PyPDF2 import PdfReader
 import gc
+from skill_taxonomy import SKILL_TAXONOMY, display_name, find_skills_in_text, resolve_skill
+from ocr_cache import cached_ocr, page_cache
+from docx_stream import extract_docx_text
+from pdf_text import PDFEngine, engine_report, open_pdf
+from cv_sections import contact_block, segment_cv, segment_text, skill_signal_complete, skill_text
+from span_store import extract_text_with_coordinates
+from skill_writeback import skill_writeback, submit_extraction
+from api_responses import FastJSONResponse
 
 # ---------- CREATE ROUTER ----------
 router = APIRouter()
 
 # ---------- CONFIG ----------
-pytesseract.pytesseract.tesseract_cmd = os.getenv("TESSERACT_CMD", "/usr/bin/tesseract")
-POPPLER_PATH = os.getenv("POPPLER_PATH", "/usr/bin")
+# PDF/OCR/NLP libraries (fitz, pdf2image, pytesseract, docx, PIL, spacy, PyPDF2) are
+# imported on first use so workers that never extract don't pay for them at boot.
+TESSERACT_CMD = os.getenv("TESSERACT_CMD", "/usr/bin/tesseract")
 
 # ---------- OPTIMIZATION CONFIG ----------
 PROCESSING_CONFIG = {
     "max_workers": min(4, os.cpu_count() or 1),
     "max_pdf_pages": 50,
     "chunk_size": 10,
-    "timeout": 300,
+    "timeout": 300,                      # default per-request extraction budget (seconds)
+    "stop_when_skills_complete": True,   # stop OCR once skills + experience sections are closed
+    "docx_streaming": os.getenv("DOCX_STREAMING", "1") == "1",   # 0 = python-docx object model
 }
 
 # ---------- LOGGING CONFIG ----------
@@ -43,33 +45,8 @@ logger = logging.getLogger("ocr_nlp_logger")
 router = APIRouter()
 
 # ---------- SKILLS / FRAMEWORKS ----------
-SKILL_KEYWORDS = [
-    "Python", "Java", "JavaScript", "React", "SQL", "NoSQL",
-    "API Design", "Project Management", "Agile", "Scrum", "System Architecture",
-    "Leadership", "Teamwork", "Communication", "Machine Learning"
-]
-
-SKILL_SYNONYMS = {
-    "JS": "JavaScript",
-    "PM": "Project Management",
-    "ML": "Machine Learning",
-    "DB": "SQL",
-}
-
-COMMON_FRAMEWORKS = [
-    "Django", "Flask", "FastAPI", "Vue", "Angular",
-    "Node.js", "Express", "Spring Boot"
-]
-
-TECH_TERMS = {
-    "Python", "Java", "JavaScript", "React", "SQL", "NoSQL",
-    "Django", "Flask", "FastAPI", "Vue", "Angular", "Node.js", "Express",
-    "Spring Boot", "PyTorch", "TensorFlow", "Keras", "Docker", "Kubernetes",
-    "Terraform", "AWS", "GCP", "Azure", "MongoDB", "PostgreSQL", "MySQL"
-}
-
-# Combine all skill-related terms for better matching
-ALL_SKILLS_SET = set(SKILL_KEYWORDS) | set(COMMON_FRAMEWORKS) | TECH_TERMS | set(SKILL_SYNONYMS.values())
+# The vocabulary lives in skill_taxonomy.py and is shared with the recommendation engine
+ALL_SKILLS_SET = {display_name(canonical) for canonical in SKILL_TAXONOMY}
 
 # ---------- PRE-COMPILED REGEX PATTERNS ----------
 HEADING_PATTERNS = [re.compile(rf"\b{re.escape(h)}\b", re.IGNORECASE) for h in [
@@ -85,20 +62,20 @@ FULL_NAME_PATTERN = re.compile(r"Full Name[:\s]*(.+)", re.IGNORECASE)
 EMPLOYEE_ID_PATTERN = re.compile(r"(Employee ID|ID)[:\s]*(.+)", re.IGNORECASE)
 LOCATION_PATTERN = re.compile(r"Location[:\s]*(.+)", re.IGNORECASE)
 
-# Improved skill patterns with case-insensitive matching
-SKILL_PATTERNS = {}
-ALL_SKILL_TERMS = SKILL_KEYWORDS + COMMON_FRAMEWORKS + list(SKILL_SYNONYMS.keys())
-for term in ALL_SKILL_TERMS:
-    SKILL_PATTERNS[term] = re.compile(r'\b' + re.escape(term) + r'\b', re.IGNORECASE)
-
 # ---------- CACHED NLP MODEL ----------
 @lru_cache(maxsize=1)
 def get_nlp_model():
     """Cache the NLP model to avoid reloading"""
+    import spacy
     logger.info("Loading spaCy model...")
     return spacy.load("en_core_web_sm")
 
-nlp = get_nlp_model()
+@lru_cache(maxsize=1)
+def get_tesseract():
+    """Import pytesseract on first OCR and point it at the configured binary"""
+    import pytesseract
+    pytesseract.pytesseract.tesseract_cmd = TESSERACT_CMD
+    return pytesseract
 
 # ------------------------------------------------------
 #   TIMING DECORATOR FOR DEBUGGING
@@ -119,31 +96,111 @@ def timing_decorator(func_name=""):
         return wrapper
     return decorator
 
+# ------------------------------------------------------
+#   PER-REQUEST TIME BUDGET
+# ------------------------------------------------------
+class ExtractionBudget:
+    """Wall-clock deadline shared by the files of one request; stages check it between pages"""
+
+    def __init__(self, seconds: Optional[float] = None, deadline: Optional[float] = None):
+        seconds = PROCESSING_CONFIG["timeout"] if seconds is None else seconds
+        self.deadline = deadline if deadline is not None else time.monotonic() + seconds
+        self.pages_processed: List[int] = []
+        self.blank_pages: List[int] = []
+        self.truncated = False
+        self.stop_reason: Optional[str] = None
+
+    def remaining(self) -> float:
+        return max(0.0, self.deadline - time.monotonic())
+
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+    def stop(self, reason: str, truncated: bool = True):
+        self.stop_reason = reason
+        self.truncated = truncated
+        if truncated:
+            logger.warning(f"⏳ Stopping extraction early: {reason}")
+        else:
+            logger.info(f"🏁 Stopping extraction early: {reason}")
+
+    def report(self) -> dict:
+        return {
+            "truncated": self.truncated,
+            "pages_processed": self.pages_processed,
+            "blank_pages_skipped": self.blank_pages,
+            "stop_reason": self.stop_reason,
+        }
+
 # ------------------------------------------------------
 #   FIXED DUAL APPROACH: PDF TEXT EXTRACTION WITH PROPER FILE HANDLING
 # ------------------------------------------------------
+def render_pdf_page(pdf: PDFEngine, page_number: int, dpi: int, budget: ExtractionBudget) -> "Image.Image":
+    return pdf.render_page(page_number, dpi, budget.remaining())
+
+def ocr_image(img: "Image.Image", budget: ExtractionBudget) -> str:
+    """Tesseract with the page cache in front; tesseract is killed when the budget runs out"""
+    from ocr_preprocess import OCR_CONFIG
+    config = OCR_CONFIG["tesseract_config"]
+    return cached_ocr(img, config, "eng", lambda: get_tesseract().image_to_string(
+        img,
+        config=config,
+        lang="eng",
+        timeout=max(1, budget.remaining())
+    ))
+
+def ocr_pdf_page(pdf: PDFEngine, page_number: int, budget: ExtractionBudget) -> Optional[str]:
+    """
+    OCR one PDF page; None when it is blank. In adaptive mode a 72dpi probe
+    picks the render DPI (or skips the page) and the full render is
+    binarized, cropped and deskewed before tesseract sees it.
+    """
+    from ocr_preprocess import OCR_CONFIG, choose_dpi, prepare_for_ocr
+    if not OCR_CONFIG["adaptive"]:
+        img = render_pdf_page(pdf, page_number, OCR_CONFIG["fixed_dpi"], budget)
+    else:
+        probe = render_pdf_page(pdf, page_number, OCR_CONFIG["probe_dpi"], budget)
+        dpi = choose_dpi(probe)
+        if dpi is None:
+            logger.info(f"Skipping blank page {page_number}")
+            return None
+        img = prepare_for_ocr(render_pdf_page(pdf, page_number, dpi, budget))
+        if img is None:
+            return None
+        logger.debug(f"OCR page {page_number} at {dpi} dpi, {img.width}x{img.height} after crop")
+
+    page_text = ocr_image(img, budget)
+    # Explicitly clean up image to free memory
+    del img
+    return page_text
+
 @timing_decorator("PDF Text Extraction")
-def extract_text_from_pdf_fixed(pdf_path):
-    """Extract text from PDF using both direct extraction and OCR fallback with proper file handling"""
-    logger.info(f"Starting dual PDF extraction for: {pdf_path}")
+def extract_text_from_pdf_fixed(pdf: PDFEngine, budget: Optional[ExtractionBudget] = None):
+    """
+    Extract text from an opened PDF using its text layer, falling back to
+    page-by-page OCR for scanned PDFs. Pages are read first to last and the
+    loop stops when the budget runs out or the skills/experience sections are complete.
+    """
+    logger.info(f"Starting dual PDF extraction with {pdf.name} ({pdf.page_count} pages)")
+    budget = budget or ExtractionBudget()
     
     text = ""
     
     # First attempt: Direct text extraction (for text-based PDFs)
     direct_text = ""
+    direct_pages = []
     try:
         logger.info("Attempting direct text extraction from PDF...")
-        with open(pdf_path, 'rb') as file:
-            pdf_reader = PdfReader(file)
-            
-            for i, page in enumerate(pdf_reader.pages):
-                if i >= PROCESSING_CONFIG["max_pdf_pages"]:
-                    break
-                page_text = page.extract_text()
-                if page_text.strip():
-                    direct_text += page_text + "\n"
-            
-            logger.info(f"Direct extraction got {len(direct_text)} characters")
+        for i in range(min(pdf.page_count, PROCESSING_CONFIG["max_pdf_pages"])):
+            if budget.expired():
+                budget.stop("time budget exhausted during text extraction")
+                break
+            page_text = pdf.page_text(i)
+            direct_pages.append(i + 1)
+            if page_text.strip():
+                direct_text += page_text + "\n"
+
+        logger.info(f"Direct extraction got {len(direct_text)} characters")
             
     except Exception as e:
         logger.info(f"Direct extraction failed: {e}")
@@ -152,48 +209,45 @@ def extract_text_from_pdf_fixed(pdf_path):
     # Check if direct extraction got meaningful text
     if len(direct_text.strip()) > 100:  # If we got substantial text
         text = direct_text
+        budget.pages_processed = direct_pages
         logger.info("Using direct text extraction (text-based PDF)")
     else:
         logger.info("Direct extraction insufficient - trying OCR for scanned PDF...")
+        budget.truncated, budget.stop_reason = False, None
         
-        # Second attempt: OCR extraction (for scanned PDFs)
-        try:
-            images = convert_from_path(
-                pdf_path, 
-                poppler_path=POPPLER_PATH,
-                first_page=1, 
-                last_page=PROCESSING_CONFIG["max_pdf_pages"],
-                dpi=300,
-                grayscale=True
-            )
-            logger.info(f"PDF converted into {len(images)} image pages for OCR")
-
-            # Process pages with OCR
-            ocr_text = ""
-            for i, img in enumerate(images):
-                logger.debug(f"OCR processing page {i + 1}")
-                
-                # Use optimized OCR configuration
-                page_text = pytesseract.image_to_string(
-                    img, 
-                    config='--psm 6 -c preserve_interword_spaces=1',
-                    lang='eng'
-                )
-                
-                ocr_text += page_text + "\n"
-                logger.debug(f"OCR page {i+1} extracted {len(page_text)} characters")
-                
-                # Explicitly clean up image to free memory
-                del img
-                if i % 5 == 0:  # Force garbage collection periodically
-                    gc.collect()
-            
-            text = ocr_text
-            logger.info(f"OCR extraction completed with {len(text)} characters")
-            
-        except Exception as ocr_error:
-            logger.error(f"OCR extraction also failed: {ocr_error}")
-            text = ""
+        # Second attempt: OCR extraction (for scanned PDFs), one page at a time so
+        # a large scan is never rasterized beyond what the budget allows
+        ocr_text = ""
+        page_count = min(pdf.page_count, PROCESSING_CONFIG["max_pdf_pages"])
+        for page_number in range(1, page_count + 1):
+            if budget.expired():
+                budget.stop(f"time budget exhausted after {len(budget.pages_processed)} of {page_count} pages")
+                break
+            try:
+                page_text = ocr_pdf_page(pdf, page_number, budget)
+            except RuntimeError as ocr_timeout:
+                budget.stop(f"OCR of page {page_number} hit the time budget ({ocr_timeout})")
+                break
+            except Exception as ocr_error:
+                logger.error(f"OCR of page {page_number} failed: {ocr_error}")
+                continue
+
+            budget.pages_processed.append(page_number)
+            if page_text is None:
+                budget.blank_pages.append(page_number)
+                continue
+            ocr_text += page_text + "\n"
+            logger.debug(f"OCR page {page_number} done, {len(ocr_text)} characters so far")
+            if page_number % 5 == 0:  # Force garbage collection periodically
+                gc.collect()
+
+            if (PROCESSING_CONFIG["stop_when_skills_complete"] and page_number < page_count
+                    and skill_signal_complete(segment_text(ocr_text))):
+                budget.stop("skills and experience sections complete", truncated=False)
+                break
+        
+        text = ocr_text
+        logger.info(f"OCR extraction completed with {len(text)} characters from pages {budget.pages_processed}")
 
     # Final check and debug info
     if text.strip():
@@ -217,10 +271,27 @@ def extract_text_from_pdf_fixed(pdf_path):
 # ------------------------------------------------------
 @timing_decorator("DOCX Text Extraction")
 def extract_text_from_docx_optimized(docx_file):
-    logger.info("Starting optimized DOCX text extraction")
+    """Stream paragraphs and table rows in document order from word/document.xml"""
+    if not PROCESSING_CONFIG["docx_streaming"]:
+        return extract_text_from_docx_legacy(docx_file)
+
+    logger.info("Starting streaming DOCX text extraction")
+    try:
+        text = extract_docx_text(docx_file)
+    except Exception as e:
+        logger.error(f"DOCX extraction failed: {e}")
+        text = ""
+
+    logger.info(f"Finished DOCX extraction. Characters: {len(text)}")
+    return text
+
+def extract_text_from_docx_legacy(docx_file):
+    """python-docx object model: all body paragraphs first, then table rows"""
+    logger.info("Starting python-docx DOCX text extraction")
     text_parts = []
 
     try:
+        from docx import Document
         doc = Document(docx_file)
 
         # Process paragraphs
@@ -265,7 +336,7 @@ def clean_ocr_text_improved(text):
 #   IMPROVED PERSONAL INFO EXTRACTION
 # ------------------------------------------------------
 @timing_decorator("Personal Info Extraction")
-def extract_personal_info_improved(text):
+def extract_personal_info_improved(text, sections=None):
     logger.info("Extracting personal info (improved)")
     info = {}
     
@@ -300,8 +371,9 @@ def extract_personal_info_improved(text):
                 info["Location"] = match.group(1).strip()
 
     logger.debug("Applying NLP fallback for personal info")
-    # Use original text for better NLP results
-    doc = nlp(text[:100000])
+    # NER only needs the header/contact block, not the whole CV
+    ner_text = contact_block(sections, text) if sections else text[:100000]
+    doc = get_nlp_model()(ner_text)
 
     # Extract entities in single pass
     entities = {}
@@ -333,173 +405,147 @@ def extract_skills_robust(text):
         logger.warning("No text provided for skill extraction")
         return []
 
-    # Debug: Check if common terms exist in text
-    common_terms_in_text = [term for term in ['Python', 'Java', 'SQL', 'React'] 
-                           if term.lower() in text.lower()]
-    logger.debug(f"Common terms found in text: {common_terms_in_text}")
-
-    # Method 1: Direct case-insensitive search (fastest)
-    text_lower = text.lower()
-    for skill in ALL_SKILLS_SET:
-        if skill.lower() in text_lower:
-            # More precise check with word boundaries
-            pattern = re.compile(r'\b' + re.escape(skill.lower()) + r'\b', re.IGNORECASE)
-            if pattern.search(text):
-                found_skills.add(skill)
-                logger.debug(f"Skill found (direct): {skill}")
-
-    # Method 2: Regex pattern matching
-    for term, pattern in SKILL_PATTERNS.items():
-        if pattern.search(text) and SKILL_SYNONYMS.get(term, term) not in found_skills:
-            actual_term = SKILL_SYNONYMS.get(term, term)
-            found_skills.add(actual_term)
-            logger.debug(f"Skill found (regex): {actual_term}")
-
-    # Method 3: Check for multi-word skills
-    multiword_skills = [skill for skill in ALL_SKILLS_SET if ' ' in skill]
-    for skill in multiword_skills:
-        if skill.lower() in text_lower and skill not in found_skills:
-            found_skills.add(skill)
-            logger.debug(f"Skill found (multi-word): {skill}")
-
-    # Method 4: NLP-based extraction as final fallback
+    # Method 1: single regex pass over every taxonomy surface form
+    for canonical in find_skills_in_text(text):
+        found_skills.add(display_name(canonical))
+        logger.debug(f"Skill found (taxonomy): {display_name(canonical)}")
+
+    # Method 2: NLP-based fuzzy matching of proper nouns as final fallback
     if len(found_skills) < 3:  # If we found very few skills, try NLP
         logger.debug("Trying NLP-based skill extraction as fallback")
         nlp_text = text if len(text) < 30000 else text[:30000]
-        doc = nlp(nlp_text)
+        doc = get_nlp_model()(nlp_text)
         
         for token in doc:
-            if token.text in ALL_SKILLS_SET and token.text not in found_skills:
-                found_skills.add(token.text)
-                logger.debug(f"Skill found (NLP): {token.text}")
+            if token.pos_ != "PROPN":
+                continue
+            canonical = resolve_skill(token.text)
+            if canonical and display_name(canonical) not in found_skills:
+                found_skills.add(display_name(canonical))
+                logger.debug(f"Skill found (NLP): {token.text} -> {display_name(canonical)}")
 
     result = sorted(found_skills)
     logger.info(f"Final extracted skills: {result} (total: {len(result)})")
     return result
 
 # ------------------------------------------------------
-#   FIXED FILE PROCESSING WORKER WITH PROPER FILE CLEANUP AND TIMING
+#   FIXED FILE PROCESSING WORKER WITH TIMING
 # ------------------------------------------------------
-async def process_single_file_fixed(file: UploadFile):
-    """Process a single file asynchronously with proper file handling"""
-    temp_file_path = None
+def extract_from_bytes(filename: str, content: bytes, deadline: Optional[float] = None):
+    """
+    Extract personal info and skills from an in-memory file (blocking; run in a
+    thread). deadline is a time.monotonic() value shared by the whole request.
+    """
     file_start_time = time.time()
+    budget = ExtractionBudget(deadline=deadline)
+    engine_info = {}
     
     try:
-        logger.info(f"📁 STARTING FILE PROCESSING: {file.filename}")
-        content = await file.read()
-        suffix = os.path.splitext(file.filename)[1].lower()
+        logger.info(f"📁 STARTING FILE PROCESSING: {filename}")
+        suffix = os.path.splitext(filename)[1].lower()
         text = ""
+        spans = None
 
         if suffix == ".pdf":
-            logger.info(f"Handling PDF file: {file.filename}")
-            
-            # Create temporary file with explicit cleanup
-            with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp_pdf:
-                tmp_pdf.write(content)
-                tmp_pdf.flush()
-                temp_file_path = tmp_pdf.name
-            
-            # Extract text from the temporary file
-            text = extract_text_from_pdf_fixed(temp_file_path)
-            
-            # Explicitly close and delete the temporary file
-            if temp_file_path and os.path.exists(temp_file_path):
-                os.unlink(temp_file_path)
-                temp_file_path = None
+            logger.info(f"Handling PDF file: {filename}")
+
+            # Parsed straight from memory; PyPDF2 only if PyMuPDF rejects the file
+            with open_pdf(content) as pdf:
+                engine_info = engine_report(pdf)
+                text = extract_text_from_pdf_fixed(pdf, budget)
+                # Layout spans for section detection, from the same parsed document
+                if text.strip():
+                    spans = extract_text_with_coordinates(pdf)
 
         elif suffix == ".docx":
-            logger.info(f"Handling DOCX file: {file.filename}")
+            logger.info(f"Handling DOCX file: {filename}")
             docx_file = BytesIO(content)
             text = extract_text_from_docx_optimized(docx_file)
 
         elif suffix in [".png", ".jpg", ".jpeg"]:
-            logger.info(f"Handling image file: {file.filename}")
+            logger.info(f"Handling image file: {filename}")
+
+            from PIL import Image
+            from ocr_preprocess import OCR_CONFIG, prepare_for_ocr
 
             # IMPORTANT: Convert to RGB always
             img = Image.open(BytesIO(content)).convert("RGB")
+            if OCR_CONFIG["adaptive"]:
+                # Photos and scans have no reliable DPI; scale by measured text size instead
+                img = prepare_for_ocr(img, rescale=True)
 
-            # OCR in thread to avoid blocking
-            with concurrent.futures.ThreadPoolExecutor() as executor:
-                text = await asyncio.get_event_loop().run_in_executor(
-                    executor, 
-                    lambda: pytesseract.image_to_string(
-                        img,
-                        lang="eng",
-                        config="--psm 6 -c preserve_interword_spaces=1"
-                    )
-                )
+            try:
+                text = ocr_image(img, budget) if img is not None else ""
+                budget.pages_processed.append(1)
+            except RuntimeError as ocr_timeout:
+                budget.stop(f"image OCR hit the time budget ({ocr_timeout})")
+                text = ""
 
             logger.debug(f"Image OCR text length: {len(text)}")
 
         else:
             logger.warning(f"Unsupported file type: {suffix}")
             return {
-                "filename": file.filename,
+                "filename": filename,
                 "personal_info": {},
                 "skills": []
             }
 
         if not text.strip():
-            logger.warning(f"No text extracted from file: {file.filename}")
+            logger.warning(f"No text extracted from file: {filename}")
             return {
-                "filename": file.filename,
+                "filename": filename,
                 "personal_info": {},
-                "skills": []
+                "skills": [],
+                **budget.report(),
+                **engine_info
             }
 
         # Debug: Log extracted text characteristics
-        logger.info(f"Extracted {len(text)} characters from {file.filename}")
+        logger.info(f"Extracted {len(text)} characters from {filename}")
         
+        # Split into sections so NER and skill matching only see the relevant parts
+        sections = segment_cv(text, spans)
+        logger.info(f"Sections found in {filename}: {list(sections)}")
+
         # Process personal info and skills
-        personal_info = extract_personal_info_improved(text)
-        skills = extract_skills_robust(text)
+        personal_info = extract_personal_info_improved(text, sections)
+        # Segmentation is trusted; skill_text falls back to the full text when no skill section exists
+        skills = extract_skills_robust(skill_text(sections, text))
         
         file_end_time = time.time()
         file_duration = file_end_time - file_start_time
-        logger.info(f"✅ COMPLETED FILE: {file.filename} in {file_duration:.2f} seconds")
+        logger.info(f"✅ COMPLETED FILE: {filename} in {file_duration:.2f} seconds")
 
         return {
-            "filename": file.filename,
+            "filename": filename,
             "personal_info": personal_info,
             "skills": skills,
+            "sections": list(sections),
+            **budget.report(),
+            **engine_info,
             "processing_time_seconds": round(file_duration, 2)
         }
 
     except Exception as e:
         file_end_time = time.time()
         file_duration = file_end_time - file_start_time
-        logger.error(f"❌ ERROR processing file {file.filename} after {file_duration:.2f} seconds: {e}", exc_info=True)
-        # Ensure temp file is cleaned up even if there's an error
-        if temp_file_path and os.path.exists(temp_file_path):
-            try:
-                os.unlink(temp_file_path)
-            except Exception as cleanup_error:
-                logger.warning(f"Could not cleanup temp file {temp_file_path}: {cleanup_error}")
+        logger.error(f"❌ ERROR processing file {filename} after {file_duration:.2f} seconds: {e}", exc_info=True)
         return {
-            "filename": file.filename,
+            "filename": filename,
             "personal_info": {},
             "skills": [],
             "processing_time_seconds": round(file_duration, 2),
             "error": str(e)
         }
 
-# ------------------------------------------------------
-#   FIXED API ROUTE WITH COMPREHENSIVE TIMING
-# ------------------------------------------------------
-@router.post("/extract_skills/")
-async def extract_skills_endpoint_fixed(files: List[UploadFile] = File(...)):
-    total_start_time = time.time()
-    logger.info(f"🚀 API /extract_skills called with {len(files)} files")
-    
-    # Process files concurrently
-    tasks = [process_single_file_fixed(file) for file in files]
-    results = await asyncio.gather(*tasks)
-    
-    # Calculate timing statistics
-    total_end_time = time.time()
-    total_duration = total_end_time - total_start_time
-    
+async def process_single_file_fixed(file: UploadFile, deadline: Optional[float] = None):
+    """Process a single uploaded file without blocking the event loop"""
+    content = await file.read()
+    return await asyncio.to_thread(extract_from_bytes, file.filename, content, deadline)
+
+def summarize_extraction(results: List[dict], total_duration: float) -> dict:
+    """Build the /extract_skills response body (and log the summary)"""
     # Extract all unique skills and timing info
     all_skills = sorted(set(
         skill for r in results for skill in r["skills"]
@@ -508,6 +554,7 @@ async def extract_skills_endpoint_fixed(files: List[UploadFile] = File(...)):
     # Calculate processing statistics
     successful_files = [r for r in results if r.get("skills")]
     failed_files = [r for r in results if not r.get("skills")]
+    truncated_files = [r["filename"] for r in results if r.get("truncated")]
     total_processing_time = sum(r.get("processing_time_seconds", 0) for r in results)
     avg_processing_time = total_processing_time / len(results) if results else 0
 
@@ -516,6 +563,8 @@ async def extract_skills_endpoint_fixed(files: List[UploadFile] = File(...)):
     logger.info(f"   Total files processed: {len(results)}")
     logger.info(f"   Successful extractions: {len(successful_files)}")
     logger.info(f"   Failed extractions: {len(failed_files)}")
+    logger.info(f"   Truncated by time budget: {len(truncated_files)}")
+    logger.info(f"   OCR page cache: {page_cache.stats()}")
     logger.info(f"   Total unique skills found: {len(all_skills)}")
     logger.info(f"   Total API processing time: {total_duration:.2f} seconds")
     logger.info(f"   Average file processing time: {avg_processing_time:.2f} seconds")
@@ -532,13 +581,15 @@ async def extract_skills_endpoint_fixed(files: List[UploadFile] = File(...)):
     logger.info("=" * 60)
 
     # Add timing information to response
-    response = {
+    return {
         "results": results, 
         "skills": all_skills,
         "processing_stats": {
             "total_files": len(results),
             "successful_files": len(successful_files),
             "failed_files": len(failed_files),
+            "truncated_files": truncated_files,
+            "ocr_page_cache": page_cache.stats(),
             "total_unique_skills": len(all_skills),
             "total_processing_time_seconds": round(total_duration, 2),
             "average_file_processing_time_seconds": round(avg_processing_time, 2),
@@ -547,6 +598,40 @@ async def extract_skills_endpoint_fixed(files: List[UploadFile] = File(...)):
             }
         }
     }
+
+# ------------------------------------------------------
+#   FIXED API ROUTE WITH COMPREHENSIVE TIMING
+# ------------------------------------------------------
+@router.post("/extract_skills/")
+async def extract_skills_endpoint_fixed(
+    files: List[UploadFile] = File(...),
+    time_budget: float = PROCESSING_CONFIG["timeout"],
+    employee_id: Optional[str] = Form(None)
+):
+    """
+    Extract skills from CVs; files still running when time_budget (seconds)
+    ends return partial results. With employee_id the skills are merged into
+    user_details server-side (batched write-back).
+    """
+    total_start_time = time.time()
+    logger.info(f"🚀 API /extract_skills called with {len(files)} files (budget {time_budget}s)")
+    deadline = time.monotonic() + max(0.0, time_budget)
+    
+    # Process files concurrently
+    tasks = [process_single_file_fixed(file, deadline) for file in files]
+    results = await asyncio.gather(*tasks)
+    
+    # Calculate timing statistics
+    total_end_time = time.time()
+    total_duration = total_end_time - total_start_time
+    
+    response = summarize_extraction(results, total_duration)
+    response["skills_queued"] = submit_extraction(employee_id, results)
     
     logger.info(f"🎯 RETURNING RESPONSE after {total_duration:.2f} seconds")
-    return response
\ No newline at end of file
+    return FastJSONResponse(response)
+
+@router.get("/extract_skills/writeback_stats/")
+def get_writeback_stats():
+    """Skill write-back totals, including employee ids whose skills had no user_details row"""
+    return skill_writeback.stats()
@@ -0,0 +1,125 @@
+import os
+import shutil
+import logging
+import tempfile
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Union
+
+# ============================================
+# LOGGING SETUP
+# ============================================
+logger = logging.getLogger("local_storage_logger")
+
+# ============================================
+# CONFIGURATION
+# ============================================
+LOCAL_STORAGE_CONFIG = {
+    "directory": os.getenv(
+        "CV_LOCAL_STORAGE_DIR",
+        os.path.join(tempfile.gettempdir(), "rms_local_storage")
+    ),
+    "public_url": os.getenv("CV_LOCAL_STORAGE_URL", "http://localhost:8000/local_storage").rstrip("/"),
+}
+
+# ============================================
+# LOCAL STAND-IN FOR SUPABASE STORAGE
+# ============================================
+class LocalStorageError(Exception):
+    """Carries status/code like storage3's StorageApiError"""
+
+    def __init__(self, message: str, code: str, status: str):
+        super().__init__(message)
+        self.message = message
+        self.code = code
+        self.status = status
+
+class LocalBucket:
+    """The subset of the storage3 bucket API the backend uses, backed by a directory"""
+
+    def __init__(self, root: str, bucket: str):
+        self.bucket = bucket
+        self.root = os.path.join(root, bucket)
+        os.makedirs(self.root, exist_ok=True)
+
+    def _resolve(self, path: str) -> str:
+        full_path = os.path.abspath(os.path.join(self.root, path))
+        if not full_path.startswith(os.path.abspath(self.root) + os.sep):
+            raise ValueError(f"Path escapes bucket: {path}")
+        return full_path
+
+    def upload(self, path: str, file: Union[bytes, str], file_options: Optional[Dict] = None):
+        target = self._resolve(path)
+        if os.path.exists(target):
+            raise LocalStorageError(f"The resource already exists: {path}", "Duplicate", "409")
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        staging = f"{target}.{os.getpid()}.tmp"
+        if isinstance(file, (bytes, bytearray)):
+            with open(staging, "wb") as f:
+                f.write(file)
+        else:
+            shutil.copyfile(file, staging)
+        os.replace(staging, target)
+        return {"Key": f"{self.bucket}/{path}"}
+
+    def list(self, path: Optional[str] = None, options: Optional[Dict] = None) -> List[Dict]:
+        options = options or {}
+        folder = self._resolve(path) if path else self.root
+        try:
+            names = sorted(os.listdir(folder))
+        except FileNotFoundError:
+            return []
+
+        search = options.get("search")
+        names = [name for name in names if not name.endswith(".tmp") and (not search or search in name)]
+        stats = {name: os.stat(os.path.join(folder, name)) for name in names}
+
+        sort_by = options.get("sortBy") or {"column": "name", "order": "asc"}
+        if sort_by.get("column") in ("created_at", "updated_at"):
+            names.sort(key=lambda name: (stats[name].st_mtime_ns, name))
+        if sort_by.get("order") == "desc":
+            names.reverse()
+
+        offset = int(options.get("offset", 0))
+        limit = int(options.get("limit", 100))
+
+        items = []
+        for name in names[offset:offset + limit]:
+            modified = datetime.fromtimestamp(stats[name].st_mtime, tz=timezone.utc).isoformat()
+            items.append({
+                "name": name,
+                "created_at": modified,
+                "updated_at": modified,
+                "metadata": {"size": stats[name].st_size},
+            })
+        return items
+
+    def remove(self, paths: List[str]) -> List[Dict]:
+        removed = []
+        for path in paths:
+            try:
+                os.unlink(self._resolve(path))
+                removed.append({"name": path})
+            except FileNotFoundError:
+                pass
+        return removed
+
+    def get_public_url(self, path: str) -> str:
+        return f"{LOCAL_STORAGE_CONFIG['public_url']}/{self.bucket}/{path}"
+
+class LocalStorage:
+    def __init__(self, root: str):
+        self.root = root
+
+    def from_(self, bucket: str) -> LocalBucket:
+        return LocalBucket(self.root, bucket)
+
+    def list_buckets(self) -> List[Dict]:
+        os.makedirs(self.root, exist_ok=True)
+        return [{"name": name} for name in sorted(os.listdir(self.root))]
+
+class LocalStorageClient:
+    """Drop-in for the Supabase client's `.storage` attribute in local runs and tests"""
+
+    def __init__(self, directory: Optional[str] = None):
+        self.storage = LocalStorage(directory or LOCAL_STORAGE_CONFIG["directory"])
+        logger.info(f"🗄️ Using local storage at {self.storage.root}")
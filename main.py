@@ -1,12 +1,34 @@
 # main.py
+from startup_report import timed_import, log_startup_report, startup_report
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from upload_cv import router as upload_router
-from project_recommendation import router as recommend_router
-from extract_skills import router as skills_router  # This imports your extract_skills endpoint
+from api_responses import CompressionMiddleware, FastJSONResponse
+import asyncio
 import os
 
-app = FastAPI(title="Resource Management System API")
+# Routers are imported through timed_import so boot cost per module shows up in the
+# startup report. Heavy libraries (spaCy, OCR, PDF, pandas, supabase) load on first use.
+upload_router = timed_import("upload_cv").router
+recommend_router = timed_import("project_recommendation").router
+skills_router = timed_import("extract_skills").router  # This imports your extract_skills endpoint
+pipeline_router = timed_import("cv_pipeline").router
+resumable_router = timed_import("resumable_upload").router
+warmup = timed_import("warmup")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Preload models/clients/indexes; /ready stays 503 until the required parts are warm
+    await asyncio.to_thread(warmup.start_warmup)
+    yield
+    # Don't lose skills still waiting for the batched user_details write-back
+    from skill_writeback import skill_writeback
+    await asyncio.to_thread(skill_writeback.flush)
+
+# orjson for every response; negotiated br/gzip for large JSON bodies
+app = FastAPI(title="Resource Management System API", lifespan=lifespan,
+              default_response_class=FastJSONResponse)
+app.add_middleware(CompressionMiddleware)
 
 # CORS configuration
 origins = [
@@ -22,12 +44,15 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag"],  # read by the frontend's conditional fetch
 )
 
 # Include ONLY the endpoints you actually have
 app.include_router(upload_router, prefix="/api")
 app.include_router(recommend_router, prefix="/api")
 app.include_router(skills_router, prefix="/api")  # This adds /api/extract_skills
+app.include_router(pipeline_router, prefix="/api")  # This adds /api/upload_and_extract
+app.include_router(resumable_router, prefix="/api")  # This adds /api/upload_cv/resumable
 
 # Root endpoint - Update to show only ACTUAL endpoints
 @app.get("/")
@@ -38,9 +63,16 @@ async def root():
             "api_docs": "/docs",
             "api_redoc": "/redoc", 
             "health": "/health",
+            "ready": "/ready",
+            "startup_report": "/startup_report",
             "upload_cv": "/api/upload_cv",
+            "upload_cv_resumable": "/api/upload_cv/resumable",
+            "list_cv_bulk": "/api/list_cv/bulk",
+            "delete_cv_bulk": "/api/delete_cv/bulk",
             "recommendations": "/api/recommendations/{project_id}",
-            "extract_skills": "/api/extract_skills"  # ONLY THIS from extract_skills.py
+            "skill_normalization_stats": "/api/skills/normalization_stats",
+            "extract_skills": "/api/extract_skills",  # ONLY THIS from extract_skills.py
+            "upload_and_extract": "/api/upload_and_extract"
         },
         "frontend": "https://finalpls-resource-management-system-frontend.onrender.com"
     }
@@ -50,6 +82,19 @@ async def root():
 async def health():
     return {"status": "healthy", "service": "Resource Management System API"}
 
+# Readiness for the load balancer: 200 only once every required component is warm
+@app.get("/ready")
+async def ready():
+    report = warmup.readiness()
+    return FastJSONResponse(status_code=200 if report["ready"] else 503, content=report)
+
+# Import time per module and boot total
+@app.get("/startup_report")
+async def get_startup_report():
+    return {**startup_report(), "warmup_duration_ms": warmup.readiness()["warmup_duration_ms"]}
+
+log_startup_report()
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=int(os.getenv("PORT", 8000)))
\ No newline at end of file
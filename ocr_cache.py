@@ -0,0 +1,116 @@
+import os
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Callable, Optional
+
+if TYPE_CHECKING:  # PIL is only needed once a page is actually OCR'd
+    from PIL import Image
+
+# ============================================
+# LOGGING SETUP
+# ============================================
+logger = logging.getLogger("ocr_cache_logger")
+
+# ============================================
+# CONFIGURATION
+# ============================================
+OCR_CACHE_CONFIG = {
+    "memory_entries": int(os.getenv("OCR_CACHE_SIZE", "1024")),
+    "directory": os.getenv("OCR_CACHE_DIR") or None,   # unset = memory tier only
+}
+
+# ============================================
+# PAGE-LEVEL OCR CACHE
+# ============================================
+def page_key(image: "Image.Image", config: str, lang: str) -> str:
+    """Hash of the exact raster tesseract would see plus everything that changes its output"""
+    digest = hashlib.blake2b(digest_size=20)
+    digest.update(f"{image.mode}|{image.width}x{image.height}|{lang}|{config}|".encode())
+    digest.update(image.tobytes())
+    return digest.hexdigest()
+
+class PageOCRCache:
+    """Bounded in-memory LRU of page text, backed by an optional on-disk tier"""
+
+    def __init__(self, memory_entries: int, directory: Optional[str] = None):
+        self.memory_entries = memory_entries
+        self.directory = directory
+        self._entries: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def _disk_path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], f"{key}.txt")
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            text = self._entries.get(key)
+            if text is not None:
+                self._entries.move_to_end(key)
+                self.memory_hits += 1
+                return text
+
+        if self.directory:
+            try:
+                with open(self._disk_path(key), "r", encoding="utf-8") as f:
+                    text = f.read()
+            except FileNotFoundError:
+                text = None
+            if text is not None:
+                with self._lock:
+                    self.disk_hits += 1
+                self._remember(key, text)
+                return text
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, key: str, text: str):
+        self._remember(key, text)
+        if self.directory:
+            path = self._disk_path(key)
+            try:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                staging = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+                with open(staging, "w", encoding="utf-8") as f:
+                    f.write(text)
+                os.replace(staging, path)
+            except OSError as e:
+                logger.warning(f"⚠️ Could not persist OCR cache entry {key}: {e}")
+
+    def _remember(self, key: str, text: str):
+        with self._lock:
+            self._entries[key] = text
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.memory_entries:
+                self._entries.popitem(last=False)
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.memory_hits + self.disk_hits + self.misses
+            return {
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": round((self.memory_hits + self.disk_hits) / lookups, 4) if lookups else 0.0,
+                "memory_entries": len(self._entries),
+                "disk_tier": bool(self.directory),
+            }
+
+page_cache = PageOCRCache(OCR_CACHE_CONFIG["memory_entries"], OCR_CACHE_CONFIG["directory"])
+
+def cached_ocr(image: "Image.Image", config: str, lang: str, run: Callable[[], str]) -> str:
+    """Return cached text for an identical page raster, otherwise run tesseract and store it"""
+    key = page_key(image, config, lang)
+    text = page_cache.get(key)
+    if text is None:
+        text = run()
+        page_cache.put(key, text)
+    return text
@@ -0,0 +1,182 @@
+import os
+import logging
+from typing import Optional, Tuple
+
+import numpy as np
+from PIL import Image
+
+# ============================================
+# LOGGING SETUP
+# ============================================
+logger = logging.getLogger("ocr_preprocess_logger")
+
+# ============================================
+# CONFIGURATION
+# ============================================
+OCR_CONFIG = {
+    "adaptive": os.getenv("OCR_ADAPTIVE", "0") == "1",   # opt-in until benchmarked; 0 = legacy fixed 300dpi full page
+    "probe_dpi": 72,              # cheap render used to measure the page before OCR
+    "min_dpi": 150,
+    "max_dpi": 300,
+    "fixed_dpi": 300,
+    "target_line_px": 28,         # ink height of a text line (~cap height 20px) tesseract reads reliably
+    "max_pixels": 12_000_000,     # caps DPI for oversized pages (A3, posters)
+    "blank_ink_ratio": 0.002,     # pages with less ink than this are skipped
+    "crop_margin_px": 10,
+    "binarize": True,
+    "crop": True,
+    "deskew": True,
+    "max_skew_degrees": 5.0,
+    "skew_step_degrees": 0.25,
+    "skew_sample_points": 20_000,
+    "tesseract_config": "--psm 6 -c preserve_interword_spaces=1",
+}
+
+DPI_STEP = 25
+LINE_STRIPS = 4     # measure lines per vertical strip so multi-column CVs don't merge rows
+
+# ============================================
+# VECTORIZED IMAGE HELPERS
+# ============================================
+def to_gray_array(image: Image.Image) -> np.ndarray:
+    return np.asarray(image.convert("L"), dtype=np.uint8)
+
+def otsu_threshold(gray: np.ndarray) -> int:
+    """Global threshold maximizing between-class variance (one histogram pass)"""
+    hist = np.bincount(gray.ravel(), minlength=256).astype(np.float64)
+    levels = np.arange(256, dtype=np.float64)
+    weight_dark = np.cumsum(hist)
+    weight_light = weight_dark[-1] - weight_dark
+    mass_dark = np.cumsum(hist * levels)
+    mean_dark = mass_dark / np.maximum(weight_dark, 1)
+    mean_light = (mass_dark[-1] - mass_dark) / np.maximum(weight_light, 1)
+    between = weight_dark * weight_light * (mean_dark - mean_light) ** 2
+    return int(np.argmax(between))
+
+def ink_mask(gray: np.ndarray) -> np.ndarray:
+    """True where a pixel is text/ink (dark on a light page)"""
+    threshold = otsu_threshold(gray)
+    # A near-uniform page has no meaningful split; treat it as blank
+    if gray.max() - gray.min() < 32:
+        return np.zeros(gray.shape, dtype=bool)
+    return gray <= threshold
+
+def run_lengths(flags: np.ndarray) -> np.ndarray:
+    """Lengths of consecutive True runs in a 1-D bool array"""
+    padded = np.concatenate(([0], flags.astype(np.int8), [0]))
+    edges = np.flatnonzero(np.diff(padded))
+    return edges[1::2] - edges[::2]
+
+def estimate_line_height(ink: np.ndarray) -> Optional[float]:
+    """Median height in pixels of text lines, from row ink profiles per vertical strip"""
+    heights = []
+    for strip in np.array_split(ink, LINE_STRIPS, axis=1):
+        rows_with_ink = strip.sum(axis=1) > max(1, strip.shape[1] // 200)
+        runs = run_lengths(rows_with_ink)
+        heights.extend(runs[runs >= 2].tolist())
+    if not heights:
+        return None
+    return float(np.median(heights))
+
+def content_bbox(ink: np.ndarray, margin: int) -> Optional[Tuple[int, int, int, int]]:
+    """(left, top, right, bottom) around all ink, padded by margin"""
+    rows = np.flatnonzero(ink.any(axis=1))
+    cols = np.flatnonzero(ink.any(axis=0))
+    if rows.size == 0 or cols.size == 0:
+        return None
+    height, width = ink.shape
+    return (
+        max(0, int(cols[0]) - margin), max(0, int(rows[0]) - margin),
+        min(width, int(cols[-1]) + 1 + margin), min(height, int(rows[-1]) + 1 + margin),
+    )
+
+def estimate_skew(ink: np.ndarray) -> float:
+    """
+    Text angle in degrees by projection profiles: shear a sample of ink pixels
+    by every candidate angle at once and keep the angle whose row histogram is
+    sharpest (sum of squared bin counts).
+    """
+    ys, xs = np.nonzero(ink)
+    if ys.size < 100:
+        return 0.0
+    limit = OCR_CONFIG["skew_sample_points"]
+    if ys.size > limit:
+        pick = np.random.default_rng(0).choice(ys.size, size=limit, replace=False)
+        ys, xs = ys[pick], xs[pick]
+
+    max_angle, step = OCR_CONFIG["max_skew_degrees"], OCR_CONFIG["skew_step_degrees"]
+    angles = np.arange(-max_angle, max_angle + step / 2, step)
+    slopes = np.tan(np.radians(angles))[:, None]
+    sheared = np.rint(ys[None, :] - xs[None, :] * slopes).astype(np.int64)
+
+    offset = sheared.min()
+    span = int(sheared.max() - offset) + 1
+    bins = (np.arange(len(angles))[:, None] * span + (sheared - offset)).ravel()
+    hist = np.bincount(bins, minlength=len(angles) * span).reshape(len(angles), span)
+    scores = (hist.astype(np.float64) ** 2).sum(axis=1)
+    return float(angles[int(np.argmax(scores))])
+
+# ============================================
+# PAGE PLANNING (ON THE CHEAP PROBE RENDER)
+# ============================================
+def choose_dpi(probe: Image.Image, probe_dpi: Optional[int] = None) -> Optional[int]:
+    """
+    Render DPI for OCR from a low-resolution probe of the page, or None when
+    the page is blank. Small text gets more DPI, large text less, and the page
+    area caps the total pixel count.
+    """
+    probe_dpi = probe_dpi or OCR_CONFIG["probe_dpi"]
+    ink = ink_mask(to_gray_array(probe))
+    if ink.mean() < OCR_CONFIG["blank_ink_ratio"]:
+        return None
+
+    line_height = estimate_line_height(ink)
+    if line_height:
+        dpi = probe_dpi * OCR_CONFIG["target_line_px"] / line_height
+    else:
+        dpi = OCR_CONFIG["max_dpi"]
+
+    width_in, height_in = probe.width / probe_dpi, probe.height / probe_dpi
+    dpi = min(dpi, (OCR_CONFIG["max_pixels"] / (width_in * height_in)) ** 0.5)
+    dpi = int(round(dpi / DPI_STEP) * DPI_STEP)
+    return max(OCR_CONFIG["min_dpi"], min(OCR_CONFIG["max_dpi"], dpi))
+
+# ============================================
+# FULL-RESOLUTION CLEANUP BEFORE TESSERACT
+# ============================================
+def prepare_for_ocr(image: Image.Image, rescale: bool = False) -> Optional[Image.Image]:
+    """
+    Binarize, crop to the ink bounding box and deskew. With rescale (images
+    with unknown DPI) the result is also resized so text lines land near
+    target_line_px. Returns None for a blank page.
+    """
+    gray = to_gray_array(image)
+    ink = ink_mask(gray)
+    if ink.mean() < OCR_CONFIG["blank_ink_ratio"]:
+        return None
+
+    if OCR_CONFIG["crop"]:
+        bbox = content_bbox(ink, OCR_CONFIG["crop_margin_px"])
+        if bbox is not None:
+            left, top, right, bottom = bbox
+            gray, ink = gray[top:bottom, left:right], ink[top:bottom, left:right]
+
+    if rescale:
+        line_height = estimate_line_height(ink)
+        if line_height:
+            factor = min(1.0, OCR_CONFIG["target_line_px"] / line_height)
+            if factor < 0.9:
+                size = (max(1, int(gray.shape[1] * factor)), max(1, int(gray.shape[0] * factor)))
+                gray = np.asarray(Image.fromarray(gray).resize(size, Image.LANCZOS))
+                ink = ink_mask(gray)
+
+    pixels = np.where(ink, 0, 255).astype(np.uint8) if OCR_CONFIG["binarize"] else gray
+    prepared = Image.fromarray(pixels)
+
+    if OCR_CONFIG["deskew"]:
+        angle = estimate_skew(ink)
+        if abs(angle) >= OCR_CONFIG["skew_step_degrees"]:
+            prepared = prepared.rotate(angle, resample=Image.BILINEAR, expand=True, fillcolor=255)
+            logger.debug(f"Deskewed page by {angle:.2f}°")
+
+    return prepared
@@ -0,0 +1,191 @@
+import io
+import os
+import logging
+from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING, Dict, List, Optional
+
+if TYPE_CHECKING:
+    from PIL import Image
+
+# ============================================
+# LOGGING SETUP
+# ============================================
+logger = logging.getLogger("pdf_text_logger")
+
+# ============================================
+# CONFIGURATION
+# ============================================
+PDF_ENGINE_CONFIG = {
+    # Tried in order; the first engine that can open the file handles it
+    "engines": [name.strip() for name in os.getenv("PDF_TEXT_ENGINES", "pymupdf,pypdf2").split(",") if name.strip()],
+    "poppler_path": os.getenv("POPPLER_PATH", "/usr/bin"),
+}
+
+# ============================================
+# ENGINES
+# ============================================
+class PDFEngine(ABC):
+    """
+    One opened PDF held in memory: page count, text layer per page and page
+    rasters for OCR. Constructors raise when the engine rejects the file.
+    """
+    name = ""
+    # Open PyMuPDF document for layout helpers (spans, tables, images); None for other engines
+    document = None
+
+    def __init__(self, pdf_bytes: bytes):
+        self.pdf_bytes = pdf_bytes
+        self.fallback_from: List[str] = []    # engines that rejected this file before this one
+
+    @property
+    @abstractmethod
+    def page_count(self) -> int:
+        ...
+
+    @abstractmethod
+    def page_text(self, index: int) -> str:
+        """Text layer of a 0-based page"""
+
+    @abstractmethod
+    def render_page(self, page_number: int, dpi: int, timeout: float) -> "Image.Image":
+        """Grayscale raster of a 1-based page for OCR"""
+
+    def metadata(self) -> Dict:
+        return {}
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+class PyMuPDFEngine(PDFEngine):
+    """MuPDF straight from bytes: fast text layer and in-process rendering (no poppler, no temp file)"""
+    name = "pymupdf"
+
+    def __init__(self, pdf_bytes: bytes):
+        super().__init__(pdf_bytes)
+        import fitz
+        self.document = fitz.open(stream=pdf_bytes, filetype="pdf")
+        if self.document.needs_pass and not self.document.authenticate(""):
+            self.document.close()
+            raise ValueError("PDF is password protected")
+        if self.document.page_count == 0:
+            self.document.close()
+            raise ValueError("PDF has no pages")
+
+    @property
+    def page_count(self) -> int:
+        return self.document.page_count
+
+    def page_text(self, index: int) -> str:
+        page = self.document[index]
+        text = page.get_text()
+        if not text.strip():
+            # Some generators only expose text through blocks
+            text = "\n".join(block[4] for block in page.get_text("blocks") if block[4])
+        return text
+
+    def render_page(self, page_number: int, dpi: int, timeout: float) -> "Image.Image":
+        import fitz
+        from PIL import Image
+        pixmap = self.document[page_number - 1].get_pixmap(dpi=dpi, colorspace=fitz.csGRAY, alpha=False)
+        return Image.frombytes("L", (pixmap.width, pixmap.height), pixmap.samples)
+
+    def metadata(self) -> Dict:
+        metadata = self.document.metadata or {}
+        return {
+            "title": metadata.get("title", ""),
+            "author": metadata.get("author", ""),
+            "subject": metadata.get("subject", ""),
+            "keywords": metadata.get("keywords", ""),
+            "creator": metadata.get("creator", ""),
+            "producer": metadata.get("producer", ""),
+            "creation_date": metadata.get("creationDate", ""),
+            "modification_date": metadata.get("modDate", ""),
+        }
+
+    def close(self):
+        self.document.close()
+
+class PyPDF2Engine(PDFEngine):
+    """Pure-Python fallback for files MuPDF rejects; pages are rendered by poppler"""
+    name = "pypdf2"
+
+    def __init__(self, pdf_bytes: bytes):
+        super().__init__(pdf_bytes)
+        from PyPDF2 import PdfReader
+        self.reader = PdfReader(io.BytesIO(pdf_bytes), strict=False)
+        if self.reader.is_encrypted:
+            self.reader.decrypt("")
+        self._page_count = len(self.reader.pages)
+
+    @property
+    def page_count(self) -> int:
+        return self._page_count
+
+    def page_text(self, index: int) -> str:
+        return self.reader.pages[index].extract_text() or ""
+
+    def render_page(self, page_number: int, dpi: int, timeout: float) -> "Image.Image":
+        from pdf2image import convert_from_bytes
+        return convert_from_bytes(
+            self.pdf_bytes,
+            poppler_path=PDF_ENGINE_CONFIG["poppler_path"],
+            first_page=page_number,
+            last_page=page_number,
+            dpi=dpi,
+            grayscale=True,
+            timeout=max(1, int(timeout)),
+        )[0]
+
+    def metadata(self) -> Dict:
+        metadata = self.reader.metadata or {}
+        return {
+            "title": metadata.get("/Title", ""),
+            "author": metadata.get("/Author", ""),
+            "subject": metadata.get("/Subject", ""),
+            "keywords": metadata.get("/Keywords", ""),
+            "creator": metadata.get("/Creator", ""),
+            "producer": metadata.get("/Producer", ""),
+            "creation_date": metadata.get("/CreationDate", ""),
+            "modification_date": metadata.get("/ModDate", ""),
+        }
+
+PDF_ENGINES = {engine.name: engine for engine in (PyMuPDFEngine, PyPDF2Engine)}
+
+# ============================================
+# ENGINE SELECTION
+# ============================================
+def open_pdf(pdf_bytes: bytes, engines: Optional[List[str]] = None) -> PDFEngine:
+    """Open with the first configured engine that accepts the file"""
+    names = engines or PDF_ENGINE_CONFIG["engines"]
+    rejected: List[str] = []
+    errors: List[str] = []
+    for name in names:
+        engine_class = PDF_ENGINES.get(name)
+        if engine_class is None:
+            logger.warning(f"⚠️ Unknown PDF engine {name!r} in PDF_TEXT_ENGINES")
+            continue
+        try:
+            engine = engine_class(pdf_bytes)
+        except ImportError as e:
+            errors.append(f"{name}: not installed ({e})")
+            continue
+        except Exception as e:
+            rejected.append(name)
+            errors.append(f"{name}: {e}")
+            logger.info(f"PDF rejected by {name}: {e}")
+            continue
+        engine.fallback_from = rejected
+        if rejected:
+            logger.info(f"📄 Using {name} after {', '.join(rejected)} rejected the file")
+        return engine
+    raise ValueError(f"No PDF engine could open the file ({'; '.join(errors) or 'no engines configured'})")
+
+def engine_report(engine: PDFEngine) -> Dict:
+    """Per-file record of which engine produced the text"""
+    return {"pdf_engine": engine.name, "pdf_engine_fallback_from": engine.fallback_from}
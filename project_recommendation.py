@@ -1,6 +1,5 @@
-import fitz  # PyMuPDF
-from fastapi import APIRouter, UploadFile, File, HTTPException
-import pandas as pd
+from fastapi import APIRouter, UploadFile, File, Header, HTTPException
+import numpy as np
 import json
 import logging
 from typing import List, Dict, Set, Tuple, Optional
@@ -9,6 +8,13 @@ import io
 import os
 import re
 from dataclasses import dataclass
+from employee_snapshot import SnapshotStore, pack_skill_bits
+from skill_scoring import RANKING_MODES, build_tfidf_columns, match_credit, rank_candidates, tfidf_scores
+from pdf_text import PDFEngine, open_pdf
+from span_store import extract_text_with_coordinates
+from api_responses import etag_matches, frame_records, make_etag, not_modified, tagged_response
+from availability_index import build_availability_columns, parse_day, project_window, remaining_capacity
+from skill_taxonomy import normalize_skills, find_skills_in_text, implied_skills, cache_stats as skill_cache_stats
 
 # ============================================
 # LOGGING SETUP
@@ -53,28 +59,9 @@ def get_supabase_client():
 # ============================================
 # CONSTANTS & CONFIGURATION
 # ============================================
-SKILL_MAP = {
-    "python": {"python", "python3", "python programming", "python basics"},
-    "java": {"java", "java basics", "java programming"},
-    "javascript": {"javascript", "js", "js programming"},
-    "html": {"html", "html5"},
-    "css": {"css", "css3"},
-    "figma": {"figma", "ui/ux design tool"},
-    "kotlin": {"kotlin", "kotlin programming"},
-    "api_integration": {"api integration", "api design", "rest api", "rest api integration"},
-    "ui": {"ui", "ui design", "user interface"},
-    "ux": {"ux", "ux design", "user experience"}
-}
-
 EXP_WEIGHT = {"beginner": 1, "intermediate": 2, "advanced": 3}
 MANAGER_ROLES = {"pm", "project manager", "proj. mgr.", "rm", "resource manager", "resource lead"}
 
-# Pre-compute normalized skill mapping for faster lookups
-NORMALIZED_SKILL_LOOKUP = {}
-for normalized, variants in SKILL_MAP.items():
-    for variant in variants:
-        NORMALIZED_SKILL_LOOKUP[variant] = normalized
-
 # ============================================
 # DATA CLASSES
 # ============================================
@@ -83,105 +70,46 @@ class PDFData:
     text: str
     metadata: Dict
     num_pages: int
+    engine: str = ""
 
 # ============================================
-# PDF PROCESSING WITH PyMuPDF
+# PDF PROCESSING (PyMuPDF, PyPDF2 FALLBACK)
 # ============================================
-def extract_text_from_pdf(pdf_bytes: bytes) -> PDFData:
+def open_resume_pdf(pdf_bytes: bytes) -> PDFEngine:
     """
-    Extract text from PDF using PyMuPDF with fallback strategies
+    Open a PDF once with the shared engines (pdf_text.py); text, spans, tables
+    and images are then all read from the same parsed document
     """
     try:
-        pdf_document = fitz.open(stream=pdf_bytes, filetype="pdf")
-        num_pages = pdf_document.page_count
-        full_text = []
-        metadata = {}
-        
-        # Extract metadata
-        doc_metadata = pdf_document.metadata
-        if doc_metadata:
-            metadata = {
-                "title": doc_metadata.get("title", ""),
-                "author": doc_metadata.get("author", ""),
-                "subject": doc_metadata.get("subject", ""),
-                "keywords": doc_metadata.get("keywords", ""),
-                "creator": doc_metadata.get("creator", ""),
-                "producer": doc_metadata.get("producer", ""),
-                "creation_date": doc_metadata.get("creationDate", ""),
-                "modification_date": doc_metadata.get("modDate", "")
-            }
-        
-        # Extract text from each page
-        for page_num in range(num_pages):
-            page = pdf_document[page_num]
-            
-            # Method 1: Standard text extraction
-            text = page.get_text()
-            
-            # Method 2: If no text found, try with textpage for better extraction
-            if not text.strip():
-                textpage = page.get_textpage()
-                text = textpage.extractText()
-            
-            # Method 3: If still no text, try OCR-like extraction with blocks
-            if not text.strip():
-                blocks = page.get_text("blocks")
-                text = "\n".join([block[4] for block in blocks if block[4]])
-            
-            full_text.append(text)
-        
-        pdf_document.close()
-        
-        return PDFData(
-            text="\n".join(full_text),
-            metadata=metadata,
-            num_pages=num_pages
-        )
-        
+        return open_pdf(pdf_bytes)
     except Exception as e:
         logger.error(f"Error extracting PDF text: {str(e)}")
         raise Exception(f"Failed to extract PDF content: {str(e)}")
 
-def extract_text_with_coordinates(pdf_bytes: bytes) -> List[Dict]:
+def read_pdf_data(pdf: PDFEngine) -> PDFData:
+    return PDFData(
+        text="\n".join(pdf.page_text(i) for i in range(pdf.page_count)),
+        metadata=pdf.metadata(),
+        num_pages=pdf.page_count,
+        engine=pdf.name
+    )
+
+def extract_text_from_pdf(pdf_bytes: bytes) -> PDFData:
     """
-    Extract text with coordinates for structured analysis
+    Extract text from PDF with the shared text-layer engines (pdf_text.py)
     """
-    try:
-        pdf_document = fitz.open(stream=pdf_bytes, filetype="pdf")
-        structured_data = []
-        
-        for page_num in range(pdf_document.page_count):
-            page = pdf_document[page_num]
-            
-            # Get text with detailed information
-            blocks = page.get_text("dict")["blocks"]
-            
-            for block in blocks:
-                if "lines" in block:
-                    for line in block["lines"]:
-                        for span in line["spans"]:
-                            structured_data.append({
-                                "page": page_num + 1,
-                                "text": span["text"],
-                                "bbox": span["bbox"],
-                                "font": span["font"],
-                                "size": span["size"],
-                                "flags": span["flags"]
-                            })
-        
-        pdf_document.close()
-        return structured_data
-        
-    except Exception as e:
-        logger.error(f"Error extracting structured PDF data: {str(e)}")
-        return []
+    with open_resume_pdf(pdf_bytes) as pdf:
+        return read_pdf_data(pdf)
 
-def extract_tables_from_pdf(pdf_bytes: bytes) -> List[pd.DataFrame]:
+def extract_tables_from_pdf(pdf: PDFEngine) -> List["pd.DataFrame"]:
     """
-    Extract tables from PDF using PyMuPDF
+    Extract tables from an opened PDF using its PyMuPDF document
     """
+    pdf_document = pdf.document
+    if pdf_document is None:
+        logger.info(f"Table extraction needs PyMuPDF, skipped for the {pdf.name} engine")
+        return []
     try:
-        pdf_document = fitz.open(stream=pdf_bytes, filetype="pdf")
         tables = []
         
         for page_num in range(pdf_document.page_count):
@@ -196,39 +124,59 @@ def extract_tables_from_pdf(pdf_bytes: bytes) -> List[pd.DataFrame]:
                     df = table.to_pandas()
                     tables.append(df)
         
-        pdf_document.close()
         return tables
         
     except Exception as e:
         logger.error(f"Error extracting tables from PDF: {str(e)}")
         return []
 
-def extract_images_from_pdf(pdf_bytes: bytes) -> List[Dict]:
+# Stream filter -> the "ext" PyMuPDF's extract_image() reports for it
+# (everything it has to decode is re-encoded as PNG)
+IMAGE_FILTER_FORMATS = {"DCTDecode": "jpeg", "JPXDecode": "jpx", "JBIG2Decode": "jb2"}
+
+def extract_images_from_pdf(pdf: PDFEngine, full: bool = False) -> List[Dict]:
     """
-    Extract images from PDF
+    Image inventory of an opened PDF: page, size and format read from each
+    image's xref dictionary, without decoding or copying the image stream.
+    full=True additionally extracts every image (once per xref) for a byte
+    preview; only use it when the image contents are really needed.
     """
+    pdf_document = pdf.document
+    if pdf_document is None:
+        logger.info(f"Image extraction needs PyMuPDF, skipped for the {pdf.name} engine")
+        return []
     try:
-        pdf_document = fitz.open(stream=pdf_bytes, filetype="pdf")
         images = []
-        
+        extracted: Dict[int, Dict] = {}
+
         for page_num in range(pdf_document.page_count):
             page = pdf_document[page_num]
-            image_list = page.get_images()
-            
+            # (xref, smask, width, height, bpc, colorspace, alt. colorspace, name, filter, ...)
+            image_list = page.get_images(full=True)
+
             for img_index, img in enumerate(image_list):
-                xref = img[0]
-                base_image = pdf_document.extract_image(xref)
-                
-                images.append({
+                xref, width, height, image_filter = img[0], img[2], img[3], img[8]
+                image = {
                     "page": page_num + 1,
                     "index": img_index,
-                    "width": base_image["width"],
-                    "height": base_image["height"],
-                    "format": base_image["ext"],
-                    "data": base_image["image"][:100] if base_image.get("image") else None  # Preview only
-                })
-        
-        pdf_document.close()
+                    "xref": xref,
+                    "width": width,
+                    "height": height,
+                    "format": IMAGE_FILTER_FORMATS.get(image_filter, "png"),
+                    "filter": image_filter,
+                }
+                if full:
+                    if xref not in extracted:
+                        base_image = pdf_document.extract_image(xref)
+                        extracted[xref] = {
+                            "width": base_image["width"],
+                            "height": base_image["height"],
+                            "format": base_image["ext"],
+                            "data": base_image["image"][:100] if base_image.get("image") else None  # Preview only
+                        }
+                    image.update(extracted[xref])
+                images.append(image)
+
         return images
         
     except Exception as e:
@@ -245,13 +193,8 @@ def analyze_resume_text(text: str) -> Dict:
     # Convert to lowercase for case-insensitive matching
     text_lower = text.lower()
     
-    # Extract potential skills
-    found_skills = []
-    for normalized_skill, variants in SKILL_MAP.items():
-        for variant in variants:
-            if variant in text_lower:
-                found_skills.append(normalized_skill)
-                break  # Avoid duplicate adds if multiple variants match
+    # Extract potential skills (canonical keys from the shared taxonomy)
+    found_skills = find_skills_in_text(text)
     
     # Extract experience level patterns
     experience_level = "beginner"  # default
@@ -309,12 +252,6 @@ def analyze_resume_text(text: str) -> Dict:
 # ============================================
 # UTILITY FUNCTIONS
 # ============================================
-@lru_cache(maxsize=512)
-def normalize_skill(skill: str) -> str:
-    """Cached skill normalization for faster repeated lookups"""
-    skill_lower = skill.lower().strip()
-    return NORMALIZED_SKILL_LOOKUP.get(skill_lower, skill_lower)
-
 def parse_skills(s) -> List[str]:
     """Fast skill parsing with type checking"""
     if isinstance(s, list):
@@ -334,7 +271,7 @@ def normalize_role(title: str) -> str:
 
 def normalize_skills_batch(skills_list: List[List[str]]) -> List[Set[str]]:
     """Batch normalize skills for better performance"""
-    return [set(normalize_skill(s) for s in skills) for skills in skills_list]
+    return [{key for s in skills for key in normalize_skills(s)} for skills in skills_list]
 
 def count_matches_fast(emp_skills_set: Set[str], required_skills_set: Set[str]) -> int:
     """Fast skill matching using pre-normalized sets"""
@@ -365,6 +302,111 @@ def calculate_assignment_details(assignment_type: str, total_available_hours: in
     
     return assigned_hours, allocation_percent, final_assignment_type
 
+# ============================================
+# EMPLOYEE SNAPSHOT
+# ============================================
+def to_id_column(values: List) -> np.ndarray:
+    """Store ids as int64 when they are all integers, otherwise as fixed-width strings"""
+    if all(isinstance(v, (int, np.integer)) and not isinstance(v, bool) for v in values):
+        return np.asarray(values, dtype=np.int64)
+    return np.asarray(["" if v is None else str(v) for v in values], dtype=str)
+
+def build_employee_columns(users: List[Dict], assignments: Optional[List[Dict]] = None,
+                           projects: Optional[List[Dict]] = None) -> Tuple[Dict[str, np.ndarray], Dict]:
+    """Turn user_details rows (+ active assignments) into the columnar arrays used by the snapshot"""
+    import pandas as pd
+    employees = pd.DataFrame(users)
+
+    # Set default values for missing columns
+    default_columns = {
+        "skills": [],
+        "total_available_hours": 40,
+        "job_title": "",
+        "status": "",
+        "experience_level": ""
+    }
+
+    for col, default_val in default_columns.items():
+        if col not in employees.columns:
+            employees[col] = [default_val] * len(employees) if isinstance(default_val, list) else default_val
+
+    # Parse and normalize skills efficiently
+    employees['skills_parsed'] = employees['skills'].apply(parse_skills)
+    employees['skills_normalized'] = employees['skills_parsed'].apply(
+        lambda skills: {key for s in skills for key in normalize_skills(s)}
+    )
+
+    # Normalize roles
+    employees['role'] = employees['job_title'].fillna("").astype(str).apply(normalize_role)
+
+    # Filter eligible employees once
+    eligible = employees[
+        (employees['role'] == "employee") &
+        (employees['status'].fillna("").astype(str).str.lower() == "available")
+    ]
+
+    skill_sets = eligible['skills_normalized'].tolist()
+    # Expand through the precomputed implication closure once, at build time
+    implied_sets = [implied_skills(own) - own for own in skill_sets]
+    skills = sorted(set().union(*skill_sets, *implied_sets))
+    levels = eligible['experience_level'].fillna("").astype(str).str.lower()
+    experience_levels = sorted(set(levels))
+    level_index = {level: i for i, level in enumerate(experience_levels)}
+
+    hours = pd.to_numeric(eligible['total_available_hours'], errors='coerce').fillna(40)
+    skill_index = {skill: i for i, skill in enumerate(skills)}
+
+    columns = {
+        "employee_id": to_id_column(eligible['employee_id'].tolist() if 'employee_id' in eligible else [None] * len(eligible)),
+        "user_id": to_id_column(eligible['id'].tolist() if 'id' in eligible else [None] * len(eligible)),
+        "total_available_hours": hours.to_numpy(dtype=np.int32),
+        "experience_level": np.asarray([level_index[level] for level in levels], dtype=np.int16),
+        "skill_bits": pack_skill_bits(skill_sets, skill_index),
+        "implied_bits": pack_skill_bits(implied_sets, skill_index),
+        **build_tfidf_columns(skill_sets, skill_index, implied_sets),
+    }
+
+    # project_assignments.user_id references user_details.user_id
+    user_keys = eligible['user_id'] if 'user_id' in eligible else eligible.get('id', pd.Series(dtype=object))
+    row_of_user = {key: row for row, key in enumerate(user_keys.tolist())}
+    project_dates = {
+        p.get('id'): (parse_day(p.get('start_date')), parse_day(p.get('end_date'))) for p in projects or []
+    }
+    columns.update(build_availability_columns(len(eligible), row_of_user, assignments or [], project_dates))
+
+    meta = {
+        "rows": len(eligible),
+        "skills": skills,
+        "experience_levels": experience_levels,
+    }
+    return columns, meta
+
+def fetch_employee_columns() -> Tuple[Dict[str, np.ndarray], Dict]:
+    """Snapshot builder: fetch all employees from Supabase and columnarize them"""
+    supabase_client = get_supabase_client()
+    if not supabase_client:
+        raise RuntimeError("Database connection not available")
+
+    users = supabase_client.table("user_details").select("*").execute().data or []
+
+    try:
+        assignments = supabase_client.table("project_assignments")\
+            .select("user_id, project_id, assigned_hours").eq("status", "assigned").execute().data or []
+        projects = supabase_client.table("projects").select("id, start_date, end_date").execute().data or []
+    except Exception as e:
+        logger.error(f"Could not load assignments for availability index: {e}")
+        assignments, projects = [], []
+
+    logger.info("Building employee snapshot from %d user_details rows and %d assignments",
+                len(users), len(assignments))
+    return build_employee_columns(users, assignments, projects)
+
+# Bump when the columns written by build_employee_columns change
+EMPLOYEE_SNAPSHOT_SCHEMA = 4
+
+# One store per worker process; the mapped files are shared between workers
+employee_store = SnapshotStore(fetch_employee_columns, schema=EMPLOYEE_SNAPSHOT_SCHEMA)
+
 # ============================================
 # PDF PROCESSING ENDPOINT
 # ============================================
@@ -379,21 +421,24 @@ async def process_resume(file: UploadFile = File(...)):
         # Read PDF file
         pdf_bytes = await file.read()
         
-        # Extract text from PDF
-        pdf_data = extract_text_from_pdf(pdf_bytes)
-        
+        # Parse once; text, tables and images all come from the same document
+        with open_resume_pdf(pdf_bytes) as pdf:
+            # Extract text from PDF
+            pdf_data = read_pdf_data(pdf)
+
+            # Optional: Extract tables (if needed)
+            tables = extract_tables_from_pdf(pdf)
+
+            # Optional: Extract images (preview only)
+            images = extract_images_from_pdf(pdf)
+
         # Analyze resume content
         analysis = analyze_resume_text(pdf_data.text)
         
-        # Optional: Extract tables (if needed)
-        tables = extract_tables_from_pdf(pdf_bytes)
-        
-        # Optional: Extract images (preview only)
-        images = extract_images_from_pdf(pdf_bytes)
-        
         return {
             "filename": file.filename,
             "num_pages": pdf_data.num_pages,
+            "pdf_engine": pdf_data.engine,
             "metadata": pdf_data.metadata,
             "analysis": analysis,
             "extracted_tables": len(tables),
@@ -408,9 +453,23 @@ async def process_resume(file: UploadFile = File(...)):
 # ============================================
 # MAIN RECOMMENDATION ENDPOINT
 # ============================================
+@router.get("/recommendations/{project_id}")
 @router.post("/recommendations/{project_id}")
-def get_recommendations(project_id: int):
-    """Get employee recommendations for a project"""
+def get_recommendations(project_id: int, ranking: str = "match", date_aware: bool = True,
+                        if_none_match: Optional[str] = Header(None)):
+    """
+    Get employee recommendations for a project.
+    ranking="match" scores by matched skill count; ranking="tfidf" scores by
+    IDF-weighted cosine similarity so rare skills count for more.
+    date_aware=True sizes assignments by the hours each employee still has
+    free across the project's start/end dates instead of total_available_hours.
+    The ETag covers the requirement rows, the project window and the employee
+    snapshot generation (which includes assignments); a matching If-None-Match
+    returns 304 before any scoring.
+    """
+    if ranking not in RANKING_MODES:
+        raise HTTPException(status_code=400, detail=f"Unknown ranking mode. Use one of: {', '.join(sorted(RANKING_MODES))}")
+
     try:
         # Get Supabase client
         supabase_client = get_supabase_client()
@@ -430,107 +489,107 @@ def get_recommendations(project_id: int):
             logger.info("No project requirements found for project_id=%s", project_id)
             return {"recommendations": []}
 
-        # Convert to DataFrame and normalize skills
-        projects = pd.DataFrame(project_req)
-        projects['required_skills_normalized'] = projects['required_skills'].apply(
-            lambda skills: set(normalize_skill(s) for s in skills)
-        )
+        # Map the shared employee snapshot (rebuilt from Supabase when stale)
+        snapshot = employee_store.get()
 
-        # Fetch all employees
-        users = supabase_client.table("user_details").select("*").execute().data
-        if not users:
-            logger.info("No employees found in the database.")
+        logger.info("Eligible employees in snapshot %s: %d found", snapshot.generation, len(snapshot))
+
+        if len(snapshot) == 0:
+            logger.info("No eligible employees available.")
             return {"recommendations": []}
 
-        # Prepare employees DataFrame
-        employees = pd.DataFrame(users)
-        
-        # Set default values for missing columns
-        default_columns = {
-            "skills": [],
-            "total_available_hours": 40,
-            "job_title": "",
-            "status": "",
-            "experience_level": ""
-        }
-        
-        for col, default_val in default_columns.items():
-            if col not in employees.columns:
-                employees[col] = default_val
-
-        # Parse and normalize skills efficiently
-        employees['skills_parsed'] = employees['skills'].apply(parse_skills)
-        employees['skills_normalized'] = employees['skills_parsed'].apply(
-            lambda skills: set(normalize_skill(s) for s in skills)
-        )
-        
-        # Normalize roles
-        employees['role'] = employees['job_title'].apply(normalize_role)
-        
-        # Filter eligible employees once
-        eligible_employees = employees[
-            (employees['role'] == "employee") & 
-            (employees['status'].str.lower() == "available")
-        ].copy()
+        window_start, window_end = None, None
+        if date_aware:
+            project_rows = supabase_client.table("projects").select("start_date, end_date")\
+                .eq("id", project_id).execute().data
+            window_start, window_end = project_window(project_rows[0] if project_rows else None)
 
-        logger.info("Eligible employees after filtering: %d found", len(eligible_employees))
+        # Everything the response is computed from; unchanged inputs -> 304 without scoring
+        etag = make_etag("recommendations", project_req, snapshot.generation,
+                         window_start, window_end, ranking, date_aware)
+        if etag_matches(if_none_match, etag):
+            logger.info("Recommendations for project_id=%s not modified", project_id)
+            return not_modified(etag)
 
-        if eligible_employees.empty:
-            logger.info("No eligible employees available.")
-            return {"recommendations": []}
+        # Convert to DataFrame and normalize skills
+        import pandas as pd
+        projects = pd.DataFrame(project_req)
+        projects['required_skills_normalized'] = projects['required_skills'].apply(
+            lambda skills: {key for s in skills for key in normalize_skills(s)}
+        )
 
-        # Pre-compute experience level groups for faster filtering
-        exp_groups = {
-            level: group for level, group in 
-            eligible_employees.groupby(eligible_employees['experience_level'].str.lower())
-        }
+        employee_ids = snapshot["employee_id"]
+        user_ids = snapshot["user_id"]
+        available_hours = snapshot["total_available_hours"]
+        experience_codes = snapshot["experience_level"]
 
         def recommend_employees_optimized(project_row):
-            """Optimized recommendation function with pre-computed data"""
+            """Optimized recommendation function over the columnar snapshot"""
             exp_level = project_row['experience_level'].lower()
             required_skills_set = project_row['required_skills_normalized']
             
             logger.info("Evaluating requirement: %s (%s)", 
                        project_row['required_skills'], exp_level)
             
-            # Get candidates from pre-grouped data
-            candidates = exp_groups.get(exp_level)
+            # Get candidates for this experience level
+            level_code = snapshot.level_code(exp_level)
+            candidates = (
+                np.flatnonzero(experience_codes == level_code)
+                if level_code is not None else np.empty(0, dtype=np.int64)
+            )
             
-            if candidates is None or candidates.empty:
+            if candidates.size == 0:
                 logger.debug("No candidates found for experience level: %s", exp_level)
                 return []
 
-            # Vectorized skill matching
-            candidates = candidates.copy()
-            candidates['match_count'] = candidates['skills_normalized'].apply(
-                lambda emp_skills: count_matches_fast(emp_skills, required_skills_set)
-            )
+            # Vectorized skill matching on the bitmask columns; skills held only
+            # by implication (React -> JavaScript) earn partial credit
+            match_count, credit = match_credit(snapshot, candidates, required_skills_set)
             
+            # Free weekly hours across the whole project window (interval index),
+            # never more than the employee's own total_available_hours
+            if date_aware:
+                free_hours = remaining_capacity(snapshot, candidates, window_start, window_end)
+            else:
+                free_hours = available_hours[candidates]
+
             # Filter and score in one pass
-            candidates = candidates[candidates['match_count'] > 0].copy()
-            candidates['score'] = candidates['match_count'] * EXP_WEIGHT.get(exp_level, 1)
-            
-            # Sort and limit
-            candidates = candidates.nlargest(project_row['quantity_needed'], 'score')
+            keep = (credit > 0) & (free_hours > 0) if date_aware else credit > 0
+            candidates, match_count, credit, free_hours = (
+                candidates[keep], match_count[keep], credit[keep], free_hours[keep]
+            )
+
+            if ranking == "tfidf":
+                score = tfidf_scores(snapshot, required_skills_set)[candidates]
+                order = rank_candidates(score, [match_count, free_hours])
+            else:
+                score = credit * EXP_WEIGHT.get(exp_level, 1)
+                order = rank_candidates(score, [match_count, free_hours] if date_aware else [match_count])
+
+            # Limit
+            order = order[:int(project_row['quantity_needed'])]
 
             # Build recommendations
             recommended_list = []
             preferred_type = project_row.get('preferred_assignment_type', 'Full-Time')
             
-            for _, emp in candidates.iterrows():
-                total_hours = emp.get('total_available_hours', 40)
+            for row, free in zip(candidates[order], free_hours[order]):
+                total_hours = int(available_hours[row])
                 assigned_hours, allocation_percent, final_type = calculate_assignment_details(
-                    preferred_type, total_hours
+                    preferred_type, int(free)
                 )
 
-                recommended_list.append({
-                    'employee_id': emp['employee_id'],
-                    'user_id': emp['id'],
+                recommendation = {
+                    'employee_id': employee_ids[row].item(),
+                    'user_id': user_ids[row].item(),
                     'assignment_type': final_type,
                     'assigned_hours': assigned_hours,
                     'allocation_percent': allocation_percent,
                     'total_available_hours': total_hours
-                })
+                }
+                if date_aware:
+                    recommendation['available_hours_in_window'] = int(free)
+                recommended_list.append(recommendation)
 
             logger.info("Recommended %d employees for %s", 
                        len(recommended_list), project_row['required_skills'])
@@ -541,15 +600,17 @@ def get_recommendations(project_id: int):
             recommend_employees_optimized, axis=1
         )
 
-        # Return results
-        return {
-            "recommendations": projects[[
+        logger.info("Skill normalization cache: %s", skill_cache_stats())
+
+        # Return results (serialized by orjson, bypassing jsonable_encoder)
+        return tagged_response({
+            "recommendations": frame_records(projects, [
                 'experience_level', 
                 'required_skills', 
                 'preferred_assignment_type', 
                 'recommended_employees'
-            ]].to_dict(orient='records')
-        }
+            ])
+        }, etag)
         
     except HTTPException:
         raise
@@ -557,6 +618,14 @@ def get_recommendations(project_id: int):
         logger.error(f"Error in recommendation system: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
+# ============================================
+# SKILL NORMALIZATION STATS
+# ============================================
+@router.get("/skills/normalization_stats/")
+def get_skill_normalization_stats():
+    """Hit rate and size of the bounded skill normalization cache"""
+    return skill_cache_stats()
+
 # ============================================
 # ENHANCED RESUME PROCESSING ENDPOINT
 # ============================================
@@ -571,17 +640,23 @@ async def process_resume_enhanced(file: UploadFile = File(...)):
         # Read PDF file
         pdf_bytes = await file.read()
         
-        # Extract text and metadata
-        pdf_data = extract_text_from_pdf(pdf_bytes)
-        
-        # Extract structured text with coordinates
-        structured_data = extract_text_with_coordinates(pdf_bytes)
-        
+        # Parse once; text, spans, tables and images all come from the same document
+        with open_resume_pdf(pdf_bytes) as pdf:
+            # Extract text and metadata
+            pdf_data = read_pdf_data(pdf)
+
+            # Extract structured text with coordinates
+            structured_data = extract_text_with_coordinates(pdf)
+
+            # Extract tables
+            tables = extract_tables_from_pdf(pdf)
+
+            # Extract images
+            images = extract_images_from_pdf(pdf)
+
         # Analyze resume content
         analysis = analyze_resume_text(pdf_data.text)
         
-        # Extract tables
-        tables = extract_tables_from_pdf(pdf_bytes)
         table_data = []
         for i, table in enumerate(tables):
             table_data.append({
@@ -591,9 +666,6 @@ async def process_resume_enhanced(file: UploadFile = File(...)):
                 "preview": table.head(3).to_dict(orient='records')
             })
         
-        # Extract images
-        images = extract_images_from_pdf(pdf_bytes)
-        
         # Generate statistics
         word_count = len(pdf_data.text.split())
         char_count = len(pdf_data.text)
@@ -602,6 +674,7 @@ async def process_resume_enhanced(file: UploadFile = File(...)):
         return {
             "filename": file.filename,
             "num_pages": pdf_data.num_pages,
+            "pdf_engine": pdf_data.engine,
             "metadata": pdf_data.metadata,
             "analysis": analysis,
             "statistics": {
@@ -642,6 +715,7 @@ async def process_multiple_resumes(files: List[UploadFile] = File(...)):
                 "filename": file.filename,
                 "status": "success",
                 "num_pages": pdf_data.num_pages,
+                "pdf_engine": pdf_data.engine,
                 "analysis": analysis
             })
             
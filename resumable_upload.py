@@ -0,0 +1,288 @@
+import os
+import json
+import asyncio
+import time
+import uuid
+import shutil
+import hashlib
+import logging
+import tempfile
+from typing import List
+
+from fastapi import APIRouter, Form, HTTPException, Request
+
+from upload_cv import (
+    ALLOWED_EXTENSIONS, MAGIC_HEADER_SIZE, MAX_FILE_SIZE, UPLOAD_CHUNK_SIZE,
+    store_content, summarize_uploads, validate_file_extension, validate_file_signature,
+)
+
+# ---------- Logging Config ----------
+logger = logging.getLogger("resumable_upload_logger")
+
+router = APIRouter()
+
+# ---------- Configuration ----------
+RESUMABLE_CONFIG = {
+    "directory": os.getenv(
+        "RESUMABLE_UPLOAD_DIR",
+        os.path.join(tempfile.gettempdir(), "rms_resumable_uploads")
+    ),
+    "session_ttl": int(os.getenv("RESUMABLE_SESSION_TTL", str(24 * 3600))),
+    "chunk_size": int(os.getenv("RESUMABLE_CHUNK_SIZE", str(5 * 1024 * 1024))),
+}
+
+SESSION_FILE = "session.json"
+PART_PREFIX = "part-"
+
+# ---------- Session Storage ----------
+def session_dir(session_id: str) -> str:
+    # Session ids are uuid4 hex; anything else could escape the staging directory
+    if len(session_id) != 32 or any(c not in "0123456789abcdef" for c in session_id):
+        raise HTTPException(status_code=404, detail="Upload session not found")
+    return os.path.join(RESUMABLE_CONFIG["directory"], session_id)
+
+def load_session(session_id: str) -> dict:
+    """Session metadata, or 404 when it never existed or has expired"""
+    path = session_dir(session_id)
+    try:
+        with open(os.path.join(path, SESSION_FILE), "r", encoding="utf-8") as f:
+            session = json.load(f)
+        last_activity = os.path.getmtime(path)
+    except (OSError, ValueError):
+        raise HTTPException(status_code=404, detail="Upload session not found")
+
+    if time.time() - last_activity > RESUMABLE_CONFIG["session_ttl"]:
+        shutil.rmtree(path, ignore_errors=True)
+        raise HTTPException(status_code=404, detail="Upload session expired")
+    return session
+
+def part_paths(session_id: str) -> List[str]:
+    """Staged chunk files in offset order (names are zero-padded offsets)"""
+    path = session_dir(session_id)
+    return [
+        os.path.join(path, name) for name in sorted(os.listdir(path))
+        if name.startswith(PART_PREFIX) and not name.endswith(".tmp")
+    ]
+
+def received_bytes(session_id: str) -> int:
+    return sum(os.path.getsize(part) for part in part_paths(session_id))
+
+def expire_sessions():
+    """Remove sessions with no activity within the TTL"""
+    directory = RESUMABLE_CONFIG["directory"]
+    try:
+        names = os.listdir(directory)
+    except FileNotFoundError:
+        return
+    cutoff = time.time() - RESUMABLE_CONFIG["session_ttl"]
+    for name in names:
+        path = os.path.join(directory, name)
+        try:
+            if os.path.getmtime(path) < cutoff:
+                shutil.rmtree(path, ignore_errors=True)
+                logger.info(f"🧹 Expired upload session {name}")
+        except FileNotFoundError:
+            continue
+
+# ---------- Assembly ----------
+def copy_range(source_fd: int, target_fd: int, count: int):
+    """Append count bytes from source to target in the kernel where supported"""
+    remaining = count
+    try:
+        while remaining > 0:
+            copied = os.copy_file_range(source_fd, target_fd, remaining)
+            if copied == 0:
+                break
+            remaining -= copied
+        return
+    except (AttributeError, OSError):
+        pass
+
+    try:
+        offset = count - remaining
+        while remaining > 0:
+            sent = os.sendfile(target_fd, source_fd, offset, remaining)
+            if sent == 0:
+                break
+            offset += sent
+            remaining -= sent
+        return
+    except (AttributeError, OSError):
+        pass
+
+    # Portable fallback (e.g. Windows): plain buffered copy of what is left
+    os.lseek(source_fd, count - remaining, os.SEEK_SET)
+    while remaining > 0:
+        chunk = os.read(source_fd, min(UPLOAD_CHUNK_SIZE, remaining))
+        if not chunk:
+            break
+        os.write(target_fd, chunk)
+        remaining -= len(chunk)
+
+def assemble_parts(parts: List[str], target: str):
+    """Concatenate staged chunks into one file without passing them through Python"""
+    with open(target, "wb") as out:
+        for part in parts:
+            with open(part, "rb") as source:
+                copy_range(source.fileno(), out.fileno(), os.fstat(source.fileno()).st_size)
+
+def remove_file(path: str):
+    if os.path.exists(path):
+        os.unlink(path)
+
+def hash_file(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(UPLOAD_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+# -----------------------------
+# Create Upload Session
+# -----------------------------
+@router.post("/upload_cv/resumable/")
+async def create_upload_session(
+    employee_id: str = Form(...),
+    filename: str = Form(...),
+    total_size: int = Form(...)
+):
+    """Start a resumable upload; chunks are then sent with PATCH at increasing offsets"""
+    if not validate_file_extension(filename):
+        raise HTTPException(status_code=400, detail=f"File type not allowed. Allowed types: {', '.join(ALLOWED_EXTENSIONS)}")
+    if total_size <= 0:
+        raise HTTPException(status_code=400, detail="File is empty")
+    if total_size > MAX_FILE_SIZE:
+        raise HTTPException(status_code=413, detail=f"File size exceeds {MAX_FILE_SIZE // (1024*1024)}MB limit")
+
+    expire_sessions()
+
+    session_id = uuid.uuid4().hex
+    path = os.path.join(RESUMABLE_CONFIG["directory"], session_id)
+    os.makedirs(path)
+    with open(os.path.join(path, SESSION_FILE), "w", encoding="utf-8") as f:
+        json.dump({
+            "employee_id": employee_id,
+            "filename": filename,
+            "total_size": total_size,
+            "created_at": time.time(),
+        }, f)
+
+    logger.info(f"🆕 Upload session {session_id} for {employee_id}: {filename} ({total_size} bytes)")
+    return {
+        "success": True,
+        "session_id": session_id,
+        "offset": 0,
+        "chunk_size": RESUMABLE_CONFIG["chunk_size"],
+        "expires_in": RESUMABLE_CONFIG["session_ttl"],
+    }
+
+# -----------------------------
+# Session Status (where to resume from)
+# -----------------------------
+@router.get("/upload_cv/resumable/{session_id}")
+async def upload_session_status(session_id: str):
+    session = load_session(session_id)
+    return {
+        "success": True,
+        "session_id": session_id,
+        "filename": session["filename"],
+        "offset": received_bytes(session_id),
+        "total_size": session["total_size"],
+    }
+
+# -----------------------------
+# Upload One Chunk
+# -----------------------------
+@router.patch("/upload_cv/resumable/{session_id}")
+async def upload_chunk(session_id: str, offset: int, request: Request):
+    """
+    Stage the raw request body as the chunk starting at `offset`. The offset
+    must equal the bytes received so far; on a mismatch the response is 409
+    with the offset to resume from. A dropped chunk leaves no partial data.
+    """
+    session = load_session(session_id)
+    received = received_bytes(session_id)
+    if offset != received:
+        raise HTTPException(status_code=409, detail={"error": "Offset mismatch", "offset": received})
+
+    path = session_dir(session_id)
+    part = os.path.join(path, f"{PART_PREFIX}{offset:012d}")
+    staging = f"{part}.{uuid.uuid4().hex[:8]}.tmp"
+    written = 0
+    header = b""
+
+    # Disk writes run in worker threads so a slow volume never stalls the event loop
+    try:
+        f = await asyncio.to_thread(open, staging, "wb")
+        try:
+            async for chunk in request.stream():
+                written += len(chunk)
+                if offset + written > session["total_size"]:
+                    raise HTTPException(status_code=413, detail="Chunk exceeds declared file size")
+                if offset == 0 and len(header) < MAGIC_HEADER_SIZE:
+                    header += chunk[:MAGIC_HEADER_SIZE - len(header)]
+                await asyncio.to_thread(f.write, chunk)
+        finally:
+            await asyncio.to_thread(f.close)
+
+        if offset == 0 and not validate_file_signature(session["filename"], header):
+            raise HTTPException(status_code=415, detail="File content does not match its extension")
+        if written == 0:
+            raise HTTPException(status_code=400, detail="Empty chunk")
+
+        await asyncio.to_thread(os.replace, staging, part)
+    finally:
+        if os.path.exists(staging):
+            await asyncio.to_thread(os.unlink, staging)
+
+    os.utime(path)  # activity keeps the session alive
+    return {
+        "success": True,
+        "session_id": session_id,
+        "offset": offset + written,
+        "total_size": session["total_size"],
+    }
+
+# -----------------------------
+# Finalize: assemble and hand off to storage
+# -----------------------------
+@router.post("/upload_cv/resumable/{session_id}/finalize")
+async def finalize_upload(session_id: str):
+    session = load_session(session_id)
+    received = received_bytes(session_id)
+    if received != session["total_size"]:
+        raise HTTPException(status_code=409, detail={"error": "Upload incomplete", "offset": received})
+
+    path = session_dir(session_id)
+    extension = os.path.splitext(session["filename"])[1].lower()
+    assembled = os.path.join(path, f"assembled{extension}")
+
+    try:
+        # Copying and hashing the whole file would otherwise block every other request
+        await asyncio.to_thread(assemble_parts, part_paths(session_id), assembled)
+        sha256 = await asyncio.to_thread(hash_file, assembled)
+        logger.info(f"🧩 Assembled session {session_id} ({received} bytes)")
+        result = await store_content(session["filename"], session["employee_id"], assembled, sha256, received)
+    except Exception:
+        # Keep the parts so /finalize can simply be retried
+        await asyncio.to_thread(remove_file, assembled)
+        raise
+
+    if not result["success"]:
+        await asyncio.to_thread(remove_file, assembled)
+        os.utime(path)  # the retry window starts now
+        logger.warning(f"⚠️ Finalize of session {session_id} failed, parts kept for a retry: {result.get('error')}")
+        return {**summarize_uploads(session["employee_id"], [result]), "session_id": session_id, "retryable": True}
+
+    await asyncio.to_thread(shutil.rmtree, path, ignore_errors=True)
+    return summarize_uploads(session["employee_id"], [result])
+
+# -----------------------------
+# Abort Upload
+# -----------------------------
+@router.delete("/upload_cv/resumable/{session_id}")
+async def abort_upload(session_id: str):
+    load_session(session_id)
+    shutil.rmtree(session_dir(session_id), ignore_errors=True)
+    logger.info(f"🗑️ Aborted upload session {session_id}")
+    return {"success": True, "message": f"Upload session {session_id} aborted"}
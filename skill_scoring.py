@@ -0,0 +1,133 @@
+import os
+import logging
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+
+from employee_snapshot import EmployeeSnapshot, count_bits
+
+# ============================================
+# LOGGING SETUP
+# ============================================
+logger = logging.getLogger("skill_scoring_logger")
+
+RANKING_MODES = {"match", "tfidf"}
+
+# Share of a full match awarded when an employee only has a skill by implication
+# (e.g. React counting toward a JavaScript requirement)
+IMPLIED_SKILL_CREDIT = float(os.getenv("IMPLIED_SKILL_CREDIT", "0.5"))
+
+@lru_cache(maxsize=1)
+def sparse_backend():
+    """scipy's csr_matrix, imported on the first TF-IDF query; None without scipy"""
+    try:
+        from scipy.sparse import csr_matrix
+        return csr_matrix
+    except ImportError:  # numpy fallback below is ~10x slower but still vectorized
+        return None
+
+# ============================================
+# SNAPSHOT COLUMNS
+# ============================================
+def build_tfidf_columns(skill_sets: List[Set[str]], vocabulary: Dict[str, int],
+                        implied_sets: Optional[List[Set[str]]] = None) -> Dict[str, np.ndarray]:
+    """
+    CSR arrays of L2-normalized IDF weights, one row per employee.
+    Rare skills get a larger weight than skills most employees list, and
+    implied skills enter the vector at IMPLIED_SKILL_CREDIT of their weight.
+    """
+    rows = len(skill_sets)
+    implied_sets = implied_sets or [set()] * rows
+    entries = [
+        sorted(
+            [(vocabulary[s], 1.0) for s in skills if s in vocabulary] +
+            [(vocabulary[s], IMPLIED_SKILL_CREDIT) for s in implied if s in vocabulary and s not in skills]
+        )
+        for skills, implied in zip(skill_sets, implied_sets)
+    ]
+
+    indptr = np.zeros(rows + 1, dtype=np.int64)
+    indptr[1:] = np.cumsum([len(row) for row in entries])
+    indices = np.fromiter((i for row in entries for i, _ in row), dtype=np.int32, count=int(indptr[-1]))
+    credit = np.fromiter((c for row in entries for _, c in row), dtype=np.float64, count=int(indptr[-1]))
+
+    document_frequency = np.bincount(indices, minlength=len(vocabulary))
+    idf = np.log((1.0 + rows) / (1.0 + document_frequency)) + 1.0
+
+    row_of_entry = np.repeat(np.arange(rows), np.diff(indptr))
+    weights = idf[indices] * credit
+    norms = np.sqrt(np.bincount(row_of_entry, weights=weights ** 2, minlength=rows))
+    weights = weights / np.where(norms > 0, norms, 1.0)[row_of_entry]
+
+    return {
+        "skill_indptr": indptr,
+        "skill_indices": indices,
+        "skill_weights": weights.astype(np.float32),
+        "skill_idf": idf.astype(np.float32),
+    }
+
+# ============================================
+# SCORING
+# ============================================
+def match_counts(snapshot: EmployeeSnapshot, rows: np.ndarray, required_skills: Iterable[str],
+                 column: str = "skill_bits") -> np.ndarray:
+    """Number of required skills each row has (popcount of the bitmask AND)"""
+    required_mask = snapshot.skill_mask(required_skills)
+    # Only the 64-bit words holding a required skill can contribute
+    words = np.flatnonzero(required_mask)
+    if words.size == 0:
+        return np.zeros(len(rows), dtype=np.int64)
+    return count_bits(snapshot[column][np.ix_(rows, words)] & required_mask[words])
+
+def match_credit(snapshot: EmployeeSnapshot, rows: np.ndarray,
+                 required_skills: Iterable[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """(exact match counts, exact + partial credit for skills held only by implication)"""
+    required_skills = set(required_skills)
+    exact = match_counts(snapshot, rows, required_skills)
+    implied = match_counts(snapshot, rows, required_skills, column="implied_bits")
+    return exact, exact + IMPLIED_SKILL_CREDIT * implied
+
+def tfidf_matrix(snapshot: EmployeeSnapshot):
+    """Sparse employee x skill matrix, built once per mapped generation"""
+    matrix = snapshot.derived.get("tfidf")
+    if matrix is None:
+        shape = (len(snapshot), len(snapshot.meta["skills"]))
+        data = snapshot["skill_weights"]
+        indices = snapshot["skill_indices"]
+        indptr = snapshot["skill_indptr"]
+        csr_matrix = sparse_backend()
+        if csr_matrix is not None:
+            matrix = csr_matrix((data, indices, indptr), shape=shape, copy=False)
+        else:
+            matrix = (data, indices, np.repeat(np.arange(shape[0]), np.diff(indptr)), shape[0])
+        snapshot.derived["tfidf"] = matrix
+    return matrix
+
+def tfidf_scores(snapshot: EmployeeSnapshot, required_skills: Iterable[str]) -> np.ndarray:
+    """Cosine similarity of every employee to the requirement in one sparse mat-vec"""
+    query = np.zeros(len(snapshot.meta["skills"]), dtype=np.float32)
+    for skill in required_skills:
+        index = snapshot.skill_index.get(skill)
+        if index is not None:
+            query[index] = snapshot["skill_idf"][index]
+
+    norm = np.linalg.norm(query)
+    if norm == 0:
+        return np.zeros(len(snapshot), dtype=np.float32)
+    query /= norm
+
+    matrix = tfidf_matrix(snapshot)
+    if sparse_backend() is not None:
+        return matrix @ query
+
+    data, indices, row_of_entry, rows = matrix
+    return np.bincount(row_of_entry, weights=data * query[indices], minlength=rows)
+
+def rank_candidates(scores: np.ndarray, tie_breakers: Optional[List[np.ndarray]] = None) -> np.ndarray:
+    """Positions sorted by score desc, then by each tie breaker desc, then original order"""
+    keys = [np.arange(len(scores))]
+    for tie_breaker in reversed(tie_breakers or []):
+        keys.append(-tie_breaker)
+    keys.append(-scores)
+    return np.lexsort(keys)
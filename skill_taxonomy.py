@@ -0,0 +1,323 @@
+import os
+import re
+import json
+import logging
+from collections import defaultdict
+from difflib import SequenceMatcher
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+
+# ============================================
+# LOGGING SETUP
+# ============================================
+logger = logging.getLogger("skill_taxonomy_logger")
+
+# ============================================
+# CONFIGURATION
+# ============================================
+FUZZY_CONFIG = {
+    "threshold": float(os.getenv("SKILL_FUZZY_THRESHOLD", "0.6")),
+    "min_length": 3,
+    # Share of a word's letters that must appear, in order, in the matched variant
+    "token_coverage": float(os.getenv("SKILL_TOKEN_COVERAGE", "0.75")),
+    "cache_size": int(os.getenv("SKILL_CACHE_SIZE", "4096")),
+    "taxonomy_file": os.getenv("SKILL_TAXONOMY_FILE", ""),
+}
+
+# ============================================
+# SHARED SKILL TAXONOMY
+# ============================================
+# canonical key -> display name + known variants (+ optional parents). The
+# canonical keys are what the recommendation engine stores; the display names
+# are what CV extraction returns to the frontend. "parents" are skills the
+# entry implies, e.g. knowing Django implies knowing Python.
+SKILL_TAXONOMY: Dict[str, Dict] = {
+    "python": {"display": "Python", "variants": ["python3", "py3", "python programming", "python basics"]},
+    "java": {"display": "Java", "variants": ["java basics", "java programming"]},
+    "javascript": {"display": "JavaScript", "variants": ["js", "js programming", "ecmascript", "es6"]},
+    "html": {"display": "HTML", "variants": ["html5"]},
+    "css": {"display": "CSS", "variants": ["css3"]},
+    "figma": {"display": "Figma", "variants": ["ui/ux design tool"], "parents": ["ui", "ux"]},
+    "kotlin": {"display": "Kotlin", "variants": ["kotlin programming"]},
+    "api_integration": {"display": "API Integration", "variants": [
+        "api integration", "api design", "rest api", "rest api integration", "restful api"
+    ]},
+    "ui": {"display": "UI", "variants": ["ui design", "user interface"]},
+    "ux": {"display": "UX", "variants": ["ux design", "user experience"]},
+    "react": {"display": "React", "variants": ["reactjs", "react.js"], "parents": ["javascript"]},
+    "sql": {"display": "SQL", "variants": ["db", "structured query language"]},
+    "nosql": {"display": "NoSQL", "variants": []},
+    "project management": {"display": "Project Management", "variants": ["pm"], "parents": ["leadership"]},
+    "agile": {"display": "Agile", "variants": []},
+    "scrum": {"display": "Scrum", "variants": [], "parents": ["agile"]},
+    "system architecture": {"display": "System Architecture", "variants": ["systems architecture"]},
+    "leadership": {"display": "Leadership", "variants": []},
+    "teamwork": {"display": "Teamwork", "variants": []},
+    "communication": {"display": "Communication", "variants": []},
+    "machine learning": {"display": "Machine Learning", "variants": ["ml"]},
+    "django": {"display": "Django", "variants": [], "parents": ["python"]},
+    "flask": {"display": "Flask", "variants": [], "parents": ["python"]},
+    "fastapi": {"display": "FastAPI", "variants": [], "parents": ["python", "api_integration"]},
+    "vue": {"display": "Vue", "variants": ["vuejs", "vue.js"], "parents": ["javascript"]},
+    "angular": {"display": "Angular", "variants": ["angularjs"], "parents": ["javascript"]},
+    "node.js": {"display": "Node.js", "variants": ["nodejs"], "parents": ["javascript"]},
+    "express": {"display": "Express", "variants": ["expressjs", "express.js"], "parents": ["node.js", "api_integration"]},
+    "spring boot": {"display": "Spring Boot", "variants": ["springboot"], "parents": ["java"]},
+    "pytorch": {"display": "PyTorch", "variants": [], "parents": ["machine learning", "python"]},
+    "tensorflow": {"display": "TensorFlow", "variants": [], "parents": ["machine learning", "python"]},
+    "keras": {"display": "Keras", "variants": [], "parents": ["tensorflow"]},
+    "docker": {"display": "Docker", "variants": []},
+    "kubernetes": {"display": "Kubernetes", "variants": ["k8s"], "parents": ["docker"]},
+    "terraform": {"display": "Terraform", "variants": []},
+    "aws": {"display": "AWS", "variants": ["amazon web services"]},
+    "gcp": {"display": "GCP", "variants": ["google cloud", "google cloud platform"]},
+    "azure": {"display": "Azure", "variants": ["microsoft azure"]},
+    "mongodb": {"display": "MongoDB", "variants": ["mongo"], "parents": ["nosql"]},
+    "postgresql": {"display": "PostgreSQL", "variants": ["postgres"], "parents": ["sql"]},
+    "mysql": {"display": "MySQL", "variants": [], "parents": ["sql"]},
+}
+
+def load_taxonomy_file(path: str) -> Dict[str, Dict]:
+    """Load extra taxonomy entries in the same shape as SKILL_TAXONOMY"""
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+if FUZZY_CONFIG["taxonomy_file"]:
+    try:
+        SKILL_TAXONOMY.update(load_taxonomy_file(FUZZY_CONFIG["taxonomy_file"]))
+    except Exception as e:
+        logger.error(f"❌ Failed to load skill taxonomy file {FUZZY_CONFIG['taxonomy_file']}: {e}")
+
+# ============================================
+# TEXT NORMALIZATION
+# ============================================
+SEPARATORS = re.compile(r"[\s\-_/.]+")
+# Profile entries such as "HTML/CSS" or "Docker, Kubernetes & Terraform" list several skills
+SKILL_LIST_SEPARATORS = re.compile(r"\s*[/,&]\s*")
+
+# Words that qualify a skill without naming a different one ("Python programming").
+# Any other extra word in a multi-word input ("React Native", "Java EE", "Azure
+# DevOps") names a distinct product, so fuzzy similarity must not absorb it.
+GENERIC_SKILL_WORDS = {
+    "programming", "language", "languages", "basics", "basic", "development", "developer",
+    "framework", "frameworks", "library", "libraries", "skills", "knowledge", "experience",
+    "advanced", "intermediate", "beginner", "expert", "proficient", "proficiency",
+}
+
+def clean_skill_text(skill: str) -> str:
+    """Lowercase and collapse separators so 'Rest-API' and 'rest api' compare equal"""
+    return SEPARATORS.sub(" ", skill.lower()).strip()
+
+def trigrams(text: str) -> Set[str]:
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+def token_coverage(token: str, variant: str) -> float:
+    blocks = SequenceMatcher(None, token, variant).get_matching_blocks()
+    return sum(block.size for block in blocks) / len(token)
+
+def covers_tokens(text: str, variant: str) -> bool:
+    """True when every word of text is generic or a (possibly misspelt) part of variant"""
+    return all(
+        token in GENERIC_SKILL_WORDS or token_coverage(token, variant) >= FUZZY_CONFIG["token_coverage"]
+        for token in text.split()
+    )
+
+# ============================================
+# TRIGRAM INDEX
+# ============================================
+class TrigramIndex:
+    """Inverted index from character trigrams to variant strings"""
+
+    def __init__(self):
+        self.postings: Dict[str, List[int]] = defaultdict(list)
+        self.variants: List[Tuple[str, str, int]] = []  # (variant, canonical, trigram count)
+
+    def add(self, variant: str, canonical: str):
+        grams = trigrams(variant)
+        variant_id = len(self.variants)
+        self.variants.append((variant, canonical, len(grams)))
+        for gram in grams:
+            self.postings[gram].append(variant_id)
+
+    def search(self, text: str, threshold: float) -> Optional[Tuple[str, float, str]]:
+        """Best (canonical skill, Dice similarity, matched variant), or None below threshold"""
+        grams = trigrams(text)
+        shared: Dict[int, int] = defaultdict(int)
+        for gram in grams:
+            for variant_id in self.postings.get(gram, ()):
+                shared[variant_id] += 1
+
+        best, best_score, best_variant = None, threshold, ""
+        for variant_id, count in shared.items():
+            variant, canonical, size = self.variants[variant_id]
+            score = 2.0 * count / (size + len(grams))
+            if score > best_score or (best is None and score == best_score):
+                best, best_score, best_variant = canonical, score, variant
+        return (best, best_score, best_variant) if best is not None else None
+
+# ============================================
+# LOOKUP TABLES (built once at import)
+# ============================================
+EXACT_LOOKUP: Dict[str, str] = {}
+TRIGRAM_INDEX = TrigramIndex()
+SKILL_TEXT_PATTERN: Optional[re.Pattern] = None
+
+# Transitive closure of "parents": IMPLICATION_MATRIX[i, j] is True when skill
+# SKILL_IDS[i] implies SKILL_IDS[j]. Depth is paid once here, never at ranking time.
+SKILL_IDS: List[str] = []
+SKILL_ID_INDEX: Dict[str, int] = {}
+IMPLICATION_MATRIX = np.zeros((0, 0), dtype=bool)
+
+def build_implication_closure(taxonomy: Dict[str, Dict]) -> Tuple[List[str], np.ndarray]:
+    """Dense boolean closure of the parent graph (cycles are tolerated)"""
+    ids = list(taxonomy)
+    index = {skill: i for i, skill in enumerate(ids)}
+    closure = np.zeros((len(ids), len(ids)), dtype=bool)
+    done = np.zeros(len(ids), dtype=bool)
+
+    def visit(i: int, path: Set[int]):
+        if done[i]:
+            return
+        path.add(i)
+        for parent in taxonomy[ids[i]].get("parents", []):
+            j = index.get(parent)
+            if j is None or j == i:
+                continue
+            closure[i, j] = True
+            if j not in path:
+                visit(j, path)
+                closure[i] |= closure[j]
+        path.discard(i)
+        done[i] = True
+
+    for i in range(len(ids)):
+        visit(i, set())
+    np.fill_diagonal(closure, False)
+    return ids, closure
+
+def compile_skill_pattern(forms: Set[str]) -> re.Pattern:
+    """One alternation over every surface form, longest first, on word boundaries"""
+    alternatives = [
+        r"\s+".join(re.escape(part) for part in form.split())
+        for form in sorted(forms, key=len, reverse=True) if form.strip()
+    ]
+    return re.compile(r"(?<!\w)(?:" + "|".join(alternatives) + r")(?!\w)", re.IGNORECASE)
+
+def rebuild_lookup():
+    """(Re)build the exact and fuzzy lookup structures from SKILL_TAXONOMY"""
+    global TRIGRAM_INDEX, SKILL_TEXT_PATTERN, SKILL_IDS, SKILL_ID_INDEX, IMPLICATION_MATRIX
+    EXACT_LOOKUP.clear()
+    index = TrigramIndex()
+    surface_forms = set()
+
+    for canonical, entry in SKILL_TAXONOMY.items():
+        forms = {canonical, entry.get("display", canonical).lower(), *entry.get("variants", [])}
+        for form in forms:
+            cleaned = clean_skill_text(form)
+            surface_forms.add(form.lower().strip())
+            EXACT_LOOKUP.setdefault(form.lower().strip(), canonical)
+            EXACT_LOOKUP.setdefault(cleaned, canonical)
+            EXACT_LOOKUP.setdefault(cleaned.replace(" ", ""), canonical)
+            if len(cleaned) >= FUZZY_CONFIG["min_length"]:
+                index.add(cleaned, canonical)
+
+    TRIGRAM_INDEX = index
+    SKILL_TEXT_PATTERN = compile_skill_pattern(surface_forms)
+    SKILL_IDS, IMPLICATION_MATRIX = build_implication_closure(SKILL_TAXONOMY)
+    SKILL_ID_INDEX = {skill: i for i, skill in enumerate(SKILL_IDS)}
+    resolve_skill.cache_clear()
+
+# ============================================
+# PUBLIC API
+# ============================================
+@lru_cache(maxsize=FUZZY_CONFIG["cache_size"])
+def resolve_skill(skill: str) -> Optional[str]:
+    """Canonical key for a skill string (exact first, then fuzzy), or None"""
+    skill_lower = skill.lower().strip()
+    canonical = EXACT_LOOKUP.get(skill_lower)
+    if canonical:
+        return canonical
+
+    cleaned = clean_skill_text(skill_lower)
+    canonical = EXACT_LOOKUP.get(cleaned) or EXACT_LOOKUP.get(cleaned.replace(" ", ""))
+    if canonical:
+        return canonical
+
+    if len(cleaned) < FUZZY_CONFIG["min_length"]:
+        return None
+
+    match = TRIGRAM_INDEX.search(cleaned, FUZZY_CONFIG["threshold"])
+    if match is None:
+        return None
+    canonical, score, variant = match
+    # Multi-word input: fuzzy similarity may fix typos but never swallow a meaningful extra word
+    if " " in cleaned and not covers_tokens(cleaned, variant):
+        logger.debug(f"Fuzzy skill match rejected: {skill!r} has words beyond {variant!r}")
+        return None
+    logger.debug(f"Fuzzy skill match: {skill!r} -> {canonical} ({score:.2f})")
+    return canonical
+
+def normalize_skill(skill: str) -> str:
+    """Canonical key for a skill; unknown skills fall back to their lowercase form"""
+    return resolve_skill(skill) or skill.lower().strip()
+
+def normalize_skills(skill: str) -> List[str]:
+    """
+    Canonical keys for a profile entry that may list several skills, e.g.
+    "HTML/CSS" -> ["html", "css"]; a known form containing a separator
+    ("ui/ux design tool") is still one skill
+    """
+    if EXACT_LOOKUP.get(skill.lower().strip()):
+        return [EXACT_LOOKUP[skill.lower().strip()]]
+    parts = [part for part in SKILL_LIST_SEPARATORS.split(skill) if part.strip()]
+    if len(parts) <= 1:
+        return [normalize_skill(skill)]
+    return [normalize_skill(part) for part in parts]
+
+def find_skills_in_text(text: str) -> Set[str]:
+    """Canonical keys of every taxonomy skill mentioned in free text"""
+    found = set()
+    for match in SKILL_TEXT_PATTERN.finditer(text):
+        form = " ".join(match.group(0).lower().split())
+        canonical = EXACT_LOOKUP.get(form) or EXACT_LOOKUP.get(clean_skill_text(form))
+        if canonical:
+            found.add(canonical)
+    return found
+
+def implied_skills(skills: Iterable[str]) -> Set[str]:
+    """Every skill implied by the given canonical skills, excluding the skills themselves"""
+    rows = [SKILL_ID_INDEX[s] for s in skills if s in SKILL_ID_INDEX]
+    if not rows:
+        return set()
+    implied = IMPLICATION_MATRIX[rows].any(axis=0)
+    return {SKILL_IDS[j] for j in np.flatnonzero(implied)} - set(skills)
+
+def display_name(canonical: str) -> str:
+    entry = SKILL_TAXONOMY.get(canonical)
+    return entry.get("display", canonical) if entry else canonical
+
+def skill_variants() -> Dict[str, str]:
+    """Every known surface form (lowercase) mapped to its display name"""
+    forms = {}
+    for canonical, entry in SKILL_TAXONOMY.items():
+        display = entry.get("display", canonical)
+        for form in {canonical, display.lower(), *entry.get("variants", [])}:
+            forms.setdefault(form.lower(), display)
+    return forms
+
+def cache_stats() -> Dict:
+    info = resolve_skill.cache_info()
+    lookups = info.hits + info.misses
+    return {
+        "hits": info.hits,
+        "misses": info.misses,
+        "hit_rate": round(info.hits / lookups, 4) if lookups else 0.0,
+        "size": info.currsize,
+        "max_size": info.maxsize,
+        "taxonomy_size": len(SKILL_TAXONOMY),
+    }
+
+rebuild_lookup()
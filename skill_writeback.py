@@ -0,0 +1,231 @@
+import os
+import time
+import logging
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, List, Optional
+
+from skill_taxonomy import normalize_skill, normalize_skills
+
+# ============================================
+# LOGGING SETUP
+# ============================================
+logger = logging.getLogger("skill_writeback_logger")
+
+# ============================================
+# CONFIGURATION
+# ============================================
+WRITEBACK_CONFIG = {
+    "enabled": os.getenv("SKILL_WRITEBACK_ENABLED", "1") == "1",
+    "flush_interval": float(os.getenv("SKILL_WRITEBACK_INTERVAL", "2")),   # seconds between flushes
+    "batch_size": int(os.getenv("SKILL_WRITEBACK_BATCH", "200")),          # employees per select
+    "max_attempts": 3,                                                     # flushes before an update is dropped
+    "recent_missing": 100,                                                 # unknown employee ids kept for stats()
+    # SQL function from sql/merge_employee_skills.sql; merges one batch in a single statement
+    "merge_function": os.getenv("SKILL_WRITEBACK_FUNCTION", "merge_employee_skills"),
+}
+
+# ============================================
+# MERGE
+# ============================================
+def merge_skill_lists(existing: List[str], extracted: Iterable[str]) -> List[str]:
+    """Existing skills first (never removed), then extracted ones whose normalized form is new"""
+    merged = list(existing)
+    seen = {key for skill in existing for key in normalize_skills(skill)}
+    for skill in extracted:
+        canonical = normalize_skill(skill)
+        if canonical not in seen:
+            seen.add(canonical)
+            merged.append(skill)
+    return merged
+
+def write_skills(client, updates: Dict[str, List[str]], batch_size: int, dry_run: bool = False) -> Dict:
+    """
+    Merge skills into user_details for many employees, two round trips per
+    batch: a select of (employee_id, skills) finds missing rows and the skills
+    that are new after normalization, then one merge_function call appends
+    them in SQL. Only the skills column is written, and the append happens
+    against the row as it is at write time, so concurrent profile saves and
+    edits to other columns are never overwritten.
+    """
+    from project_recommendation import parse_skills
+
+    employee_ids = list(updates)
+    stats = {"employees": len(employee_ids), "updated": 0, "unchanged": 0, "missing": 0,
+             "failed": 0, "round_trips": 0, "missing_ids": [], "failed_ids": []}
+
+    for i in range(0, len(employee_ids), batch_size):
+        batch = employee_ids[i:i + batch_size]
+        try:
+            rows = (client.table("user_details").select("employee_id, skills")
+                    .in_("employee_id", batch).execute().data or [])
+            stats["round_trips"] += 1
+        except Exception as e:
+            stats["failed"] += len(batch)
+            stats["failed_ids"].extend(batch)
+            logger.error(f"❌ Could not read user_details for {len(batch)} employees: {e}")
+            continue
+
+        found = {row["employee_id"] for row in rows}
+        missing = [employee_id for employee_id in batch if employee_id not in found]
+        if missing:
+            stats["missing"] += len(missing)
+            stats["missing_ids"].extend(missing)
+            logger.warning(f"⚠️ No user_details row for {len(missing)} employee ids, skills not saved: "
+                           f"{', '.join(missing[:10])}")
+
+        changes = []
+        for row in rows:
+            current = parse_skills(row.get("skills"))
+            new_skills = merge_skill_lists(current, updates[row["employee_id"]])[len(current):]
+            if new_skills:
+                changes.append({"employee_id": row["employee_id"], "skills": new_skills})
+            else:
+                stats["unchanged"] += 1
+
+        if not changes:
+            continue
+        if dry_run:
+            stats["updated"] += len(changes)
+            continue
+        try:
+            written = client.rpc(WRITEBACK_CONFIG["merge_function"], {"updates": changes}).execute().data or []
+            stats["round_trips"] += 1
+        except Exception as e:
+            stats["failed"] += len(changes)
+            stats["failed_ids"].extend(change["employee_id"] for change in changes)
+            logger.error(f"❌ Could not write skills for {len(changes)} employees "
+                         f"({WRITEBACK_CONFIG['merge_function']}, see sql/merge_employee_skills.sql): {e}")
+            continue
+        # Rows a concurrent save already gave these skills come back unchanged
+        stats["updated"] += len(written)
+        stats["unchanged"] += len(changes) - len(written)
+
+    return stats
+
+# ============================================
+# COALESCING WRITER
+# ============================================
+class SkillWriteBack:
+    """
+    Collects extracted skills per employee and writes them in the background
+    every flush_interval seconds (sooner once batch_size employees are waiting),
+    so concurrent extractions share database round trips.
+    """
+
+    def __init__(self, flush_interval: float, batch_size: int,
+                 on_change: Optional[Callable[[], None]] = None):
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.on_change = on_change
+        self._pending: "OrderedDict[str, List[str]]" = OrderedDict()
+        self._attempts: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._missing: "OrderedDict[str, float]" = OrderedDict()    # unknown employee id -> last seen
+        self.totals = {"submitted": 0, "flushes": 0, "updated": 0, "failed": 0, "missing": 0, "round_trips": 0}
+
+    def submit(self, employee_id: str, skills: Iterable[str]):
+        skills = [skill for skill in skills if skill]
+        if not employee_id or not skills:
+            return
+        with self._lock:
+            pending = self._pending.setdefault(employee_id, [])
+            self._pending[employee_id] = merge_skill_lists(pending, skills)
+            self.totals["submitted"] += 1
+            full = len(self._pending) >= self.batch_size
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="skill-writeback", daemon=True)
+                self._thread.start()
+        if full:
+            self._wake.set()
+
+    def _run(self):
+        while True:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"❌ Skill write-back flush failed: {e}")
+
+    def flush(self) -> Optional[Dict]:
+        """Write everything pending now; failed employees are queued again for the next flush"""
+        with self._flush_lock:
+            with self._lock:
+                if not self._pending:
+                    return None
+                updates, self._pending = self._pending, OrderedDict()
+
+            from project_recommendation import get_supabase_client
+            client = get_supabase_client()
+            if client is None:
+                self._requeue(updates)
+                logger.error("❌ Skill write-back skipped: database connection not available")
+                return None
+
+            start = time.time()
+            stats = write_skills(client, updates, self.batch_size)
+            failed = set(stats["failed_ids"])
+            with self._lock:
+                for employee_id in updates:
+                    if employee_id not in failed:
+                        self._attempts.pop(employee_id, None)
+            if failed:
+                self._requeue({employee_id: updates[employee_id] for employee_id in failed})
+
+            with self._lock:
+                self.totals["flushes"] += 1
+                for key in ("updated", "failed", "missing", "round_trips"):
+                    self.totals[key] += stats[key]
+                for employee_id in stats["missing_ids"]:
+                    self._missing.pop(employee_id, None)
+                    self._missing[employee_id] = time.time()
+                while len(self._missing) > WRITEBACK_CONFIG["recent_missing"]:
+                    self._missing.popitem(last=False)
+
+            logger.info(f"🗃️ Skill write-back: {stats['updated']}/{stats['employees']} employees updated "
+                        f"in {stats['round_trips']} round trips ({time.time() - start:.2f}s)")
+            if stats["updated"] and self.on_change:
+                self.on_change()
+            return stats
+
+    def _requeue(self, updates: Dict[str, List[str]]):
+        with self._lock:
+            for employee_id, skills in updates.items():
+                attempts = self._attempts.get(employee_id, 0) + 1
+                if attempts >= WRITEBACK_CONFIG["max_attempts"]:
+                    self._attempts.pop(employee_id, None)
+                    logger.error(f"❌ Dropping skill write-back for {employee_id} after {attempts} attempts")
+                    continue
+                self._attempts[employee_id] = attempts
+                self._pending[employee_id] = merge_skill_lists(self._pending.get(employee_id, []), skills)
+
+    def stats(self) -> Dict:
+        """Totals, pending count and the most recent employee ids without a user_details row"""
+        with self._lock:
+            return {**self.totals, "pending": len(self._pending), "recent_missing_ids": list(self._missing)}
+
+def invalidate_employee_snapshot():
+    """Recommendations rebuild their employee snapshot on the next request"""
+    from project_recommendation import employee_store
+    employee_store.invalidate()
+
+skill_writeback = SkillWriteBack(
+    WRITEBACK_CONFIG["flush_interval"], WRITEBACK_CONFIG["batch_size"], on_change=invalidate_employee_snapshot
+)
+
+def submit_extraction(employee_id: Optional[str], results: List[dict]) -> bool:
+    """
+    Queue the skills of successful extraction results for an employee; True if
+    queued. They are written on the next flush, not before this returns.
+    """
+    if not WRITEBACK_CONFIG["enabled"] or not employee_id:
+        return False
+    skills = [skill for result in results if not result.get("error") for skill in result.get("skills", [])]
+    if not skills:
+        return False
+    skill_writeback.submit(employee_id, skills)
+    return True
@@ -0,0 +1,173 @@
+import logging
+from array import array
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from pdf_text import PDFEngine
+
+# ============================================
+# LOGGING SETUP
+# ============================================
+logger = logging.getLogger("span_store_logger")
+
+# ============================================
+# CONFIGURATION
+# ============================================
+SPAN_BOLD_FLAG = 16     # PyMuPDF span flag bit 4
+
+# ============================================
+# SPAN STORE
+# ============================================
+class SpanStore:
+    """
+    Text spans of a PDF as parallel columns: page (1-based), bbox, font size,
+    flags and interned font id per span, plus all span texts in one string
+    addressed by offsets. Queries return span indices.
+    """
+
+    def __init__(self, page: np.ndarray, bbox: np.ndarray, size: np.ndarray, flags: np.ndarray,
+                 font_id: np.ndarray, fonts: List[str], text: str, offsets: np.ndarray):
+        self.page = page            # int32 (n,)
+        self.bbox = bbox            # float32 (n, 4): x0, y0, x1, y1
+        self.size = size            # float32 (n,)
+        self.flags = flags          # int32 (n,)
+        self.font_id = font_id      # int32 (n,), index into fonts
+        self.fonts = fonts
+        self.text_buffer = text
+        self.offsets = offsets      # int64 (n + 1,), span i is text[offsets[i]:offsets[i + 1]]
+        # Spans with only whitespace never take part in layout decisions
+        self.visible = np.fromiter((bool(self.text(i).strip()) for i in range(len(page))),
+                                   dtype=bool, count=len(page))
+
+    @classmethod
+    def empty(cls) -> "SpanStore":
+        return cls(np.zeros(0, np.int32), np.zeros((0, 4), np.float32), np.zeros(0, np.float32),
+                   np.zeros(0, np.int32), np.zeros(0, np.int32), [], "", np.zeros(1, np.int64))
+
+    def __len__(self) -> int:
+        return len(self.page)
+
+    @property
+    def nbytes(self) -> int:
+        columns = (self.page, self.bbox, self.size, self.flags, self.font_id, self.offsets, self.visible)
+        return sum(column.nbytes for column in columns) + len(self.text_buffer.encode("utf-8"))
+
+    # ---------- per-span access ----------
+    def text(self, i: int) -> str:
+        return self.text_buffer[self.offsets[i]:self.offsets[i + 1]]
+
+    def texts(self, indices) -> List[str]:
+        return [self.text(i) for i in indices]
+
+    def font(self, i: int) -> str:
+        return self.fonts[self.font_id[i]]
+
+    def span(self, i: int) -> Dict:
+        """One span in the old extract_text_with_coordinates dict shape"""
+        return {
+            "page": int(self.page[i]),
+            "text": self.text(i),
+            "bbox": tuple(float(v) for v in self.bbox[i]),
+            "font": self.font(i),
+            "size": float(self.size[i]),
+            "flags": int(self.flags[i]),
+        }
+
+    # ---------- vectorized queries ----------
+    def body_size(self) -> float:
+        """Median font size of visible spans, i.e. the body text size"""
+        sizes = self.size[self.visible]
+        return float(np.median(sizes)) if len(sizes) else 0.0
+
+    def select(self, page: Optional[int] = None, min_size: Optional[float] = None,
+               bold: Optional[bool] = None, font: Optional[str] = None) -> np.ndarray:
+        """Indices of visible spans matching every given condition"""
+        mask = self.visible.copy()
+        if page is not None:
+            mask &= self.page == page
+        if min_size is not None:
+            mask &= self.size >= min_size
+        if bold is not None:
+            mask &= ((self.flags & SPAN_BOLD_FLAG) != 0) == bold
+        if font is not None:
+            mask &= self.font_id == (self.fonts.index(font) if font in self.fonts else -1)
+        return np.flatnonzero(mask)
+
+    def larger_than_body(self, ratio: float = 1.15, page: Optional[int] = None) -> np.ndarray:
+        """Indices of visible spans set at least ratio x the body size, e.g. headings on page 1"""
+        return self.select(page=page, min_size=self.body_size() * ratio)
+
+# ============================================
+# BUILDER
+# ============================================
+class SpanStoreBuilder:
+    """Appends spans into compact typed arrays; no per-span Python objects are kept"""
+
+    def __init__(self):
+        self.page = array("i")
+        self.bbox = array("f")
+        self.size = array("f")
+        self.flags = array("i")
+        self.font_id = array("i")
+        self.fonts: Dict[str, int] = {}
+        self.texts: List[str] = []      # joined per page, so at most one page of span strings lives here
+        self.pages_text: List[str] = []
+        self.offsets = array("q", [0])
+
+    def add(self, page: int, text: str, bbox, font: str, size: float, flags: int):
+        self.page.append(page)
+        self.bbox.extend(bbox)
+        self.size.append(size)
+        self.flags.append(flags)
+        self.font_id.append(self.fonts.setdefault(font, len(self.fonts)))
+        self.texts.append(text)
+        self.offsets.append(self.offsets[-1] + len(text))
+
+    def end_page(self):
+        self.pages_text.append("".join(self.texts))
+        self.texts = []
+
+    def build(self) -> SpanStore:
+        if self.texts:
+            self.end_page()
+        return SpanStore(
+            page=np.frombuffer(self.page, dtype=np.int32).copy(),
+            bbox=np.frombuffer(self.bbox, dtype=np.float32).reshape(-1, 4).copy(),
+            size=np.frombuffer(self.size, dtype=np.float32).copy(),
+            flags=np.frombuffer(self.flags, dtype=np.int32).copy(),
+            font_id=np.frombuffer(self.font_id, dtype=np.int32).copy(),
+            fonts=list(self.fonts),
+            text="".join(self.pages_text),
+            offsets=np.frombuffer(self.offsets, dtype=np.int64).copy(),
+        )
+
+def spans_from_pdf(pdf_document) -> SpanStore:
+    """Every text span of an open PyMuPDF document"""
+    import fitz
+    # The default "dict" flags also embed every image's bytes in the output
+    text_flags = fitz.TEXTFLAGS_DICT & ~fitz.TEXT_PRESERVE_IMAGES
+    builder = SpanStoreBuilder()
+    for page_num in range(pdf_document.page_count):
+        blocks = pdf_document[page_num].get_text("dict", flags=text_flags)["blocks"]
+        for block in blocks:
+            for line in block.get("lines", ()):
+                for span in line["spans"]:
+                    builder.add(page_num + 1, span["text"], span["bbox"], span["font"], span["size"], span["flags"])
+        builder.end_page()
+    return builder.build()
+
+def extract_text_with_coordinates(pdf: PDFEngine) -> SpanStore:
+    """
+    Text spans with coordinates for structured analysis, read from an already
+    opened PDF; empty when the engine has no PyMuPDF document or parsing fails
+    """
+    if pdf.document is None:
+        logger.info(f"Span extraction needs PyMuPDF, skipped for the {pdf.name} engine")
+        return SpanStore.empty()
+    try:
+        return spans_from_pdf(pdf.document)
+
+    except Exception as e:
+        logger.error(f"Error extracting structured PDF data: {str(e)}")
+        return SpanStore.empty()
@@ -0,0 +1,32 @@
+-- Batched skill write-back used by skill_writeback.write_skills (apply once per database).
+--
+-- updates: [{"employee_id": "EMP1", "skills": ["React", "Docker"]}, ...]
+-- Appends every skill not already on the row (case-insensitive), keeping the
+-- existing order and never removing anything. The new value is computed from
+-- the row as the UPDATE locks it, so a profile save that lands concurrently is
+-- merged, not overwritten. Only the skills column is written.
+-- Returns the rows that changed.
+create or replace function public.merge_employee_skills(updates jsonb)
+returns table (employee_id text, skills text[])
+language sql
+as $$
+    with incoming as (
+        select item->>'employee_id' as employee_id,
+               array(select jsonb_array_elements_text(item->'skills')) as skills
+        from jsonb_array_elements(updates) as item
+    )
+    update public.user_details as u
+    set skills = coalesce(u.skills, '{}') || array(
+            select new_skill
+            from unnest(i.skills) with ordinality as t(new_skill, position)
+            where lower(new_skill) <> all (select lower(s) from unnest(coalesce(u.skills, '{}')) as s)
+            order by position
+        )
+    from incoming as i
+    where u.employee_id::text = i.employee_id
+      and exists (
+          select 1 from unnest(i.skills) as new_skill
+          where lower(new_skill) <> all (select lower(s) from unnest(coalesce(u.skills, '{}')) as s)
+      )
+    returning u.employee_id::text, u.skills;
+$$;
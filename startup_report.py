@@ -0,0 +1,66 @@
+import os
+import sys
+import time
+import logging
+import importlib
+from typing import Dict, List
+
+# Imported first by main.py, so this approximates interpreter start for the app
+PROCESS_START = time.perf_counter()
+
+# ============================================
+# LOGGING SETUP
+# ============================================
+logger = logging.getLogger("startup_logger")
+
+# ============================================
+# CONFIGURATION
+# ============================================
+# Libraries that must only load on the code path that needs them
+HEAVY_MODULES = [
+    "fitz", "pandas", "PyPDF2", "pdf2image", "pytesseract", "PIL",
+    "docx", "spacy", "supabase", "scipy",
+]
+
+STARTUP_BUDGET_MS = float(os.getenv("STARTUP_IMPORT_BUDGET_MS", "1500"))
+
+_module_times: Dict[str, float] = {}
+_ready_ms: List[float] = []     # boot time, frozen once the app finished importing
+
+# ============================================
+# IMPORT TIMING
+# ============================================
+def timed_import(name: str):
+    """Import a module and record how long it took (including its own imports)"""
+    start = time.perf_counter()
+    module = importlib.import_module(name)
+    _module_times[name] = (time.perf_counter() - start) * 1000
+    return module
+
+def heavy_modules_loaded() -> List[str]:
+    return [name for name in HEAVY_MODULES if name in sys.modules]
+
+def startup_report() -> dict:
+    total_ms = _ready_ms[0] if _ready_ms else (time.perf_counter() - PROCESS_START) * 1000
+    return {
+        "import_ms": {name: round(ms, 1) for name, ms in _module_times.items()},
+        "total_ms": round(total_ms, 1),
+        "budget_ms": STARTUP_BUDGET_MS,
+        "within_budget": total_ms <= STARTUP_BUDGET_MS,
+        "heavy_modules_loaded": heavy_modules_loaded(),
+    }
+
+def log_startup_report() -> dict:
+    """Freeze the boot time and log the per-module import table"""
+    if not _ready_ms:
+        _ready_ms.append((time.perf_counter() - PROCESS_START) * 1000)
+    report = startup_report()
+    logger.info("=" * 50)
+    logger.info("🚀 STARTUP REPORT:")
+    for name, ms in sorted(report["import_ms"].items(), key=lambda item: -item[1]):
+        logger.info(f"   {name:<28}{ms:>8.1f} ms")
+    logger.info(f"   Total app import: {report['total_ms']:.1f} ms (budget {STARTUP_BUDGET_MS:.0f} ms)")
+    if report["heavy_modules_loaded"]:
+        logger.warning(f"   ⚠️ Heavy modules loaded at boot: {', '.join(report['heavy_modules_loaded'])}")
+    logger.info("=" * 50)
+    return report
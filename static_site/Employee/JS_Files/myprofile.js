@@ -170,12 +170,16 @@ class ProfileDataService {
 
             const filePath = `${employeeId}/${fileToDelete.name}`;
             
-            // Delete from Supabase storage
-            const { error: deleteError } = await this.supabase.storage
-                .from(this.bucketName)
-                .remove([filePath]);
+            // Delete through the API so the server forgets the file's hash and a re-upload is stored again
+            const params = new URLSearchParams({ employee_id: employeeId, file_path: filePath });
+            const response = await fetch(`https://finalpls-resource-management-system.onrender.com/api/delete_cv/?${params}`, {
+                method: 'DELETE'
+            });
 
-            if (deleteError) throw deleteError;
+            if (!response.ok) {
+                const body = await response.json().catch(() => ({}));
+                throw new Error(body.detail || `Delete failed (${response.status})`);
+            }
 
             console.log('[DEBUG] File deleted successfully:', fileName);
             return { success: true };
@@ -898,44 +902,49 @@ class ProfileApp {
     
             const employeeId = await this.dataService.getEmployeeFolderId();
     
-            // Upload files - don't wait for skill extraction
-            const uploadFormData = new FormData();
-            uploadFormData.append('employee_id', employeeId);
-            files.forEach(file => uploadFormData.append('files', file));
+            // One request: the server uploads and extracts skills from the same bytes
+            const formData = new FormData();
+            formData.append('employee_id', employeeId);
+            files.forEach(file => formData.append('files', file));
     
-            const uploadPromise = fetch('https://finalpls-resource-management-system.onrender.com/api/upload_cv/', {
+            const response = await fetch('https://finalpls-resource-management-system.onrender.com/api/upload_and_extract/?stream=true', {
                 method: 'POST',
-                body: uploadFormData
+                body: formData
             });
             
-            
-            // Start skill extraction in parallel but don't wait for it
-            const skillPromise = this.extractSkillsParallel(files, employeeId);
-    
-            const uploadResponse = await uploadPromise;
-            
-            if (!uploadResponse.ok) {
-                throw new Error(`Upload failed with status: ${uploadResponse.status}`);
+            if (!response.ok) {
+                throw new Error(`Upload failed with status: ${response.status}`);
             }
     
-            // Refresh profile immediately after upload
-            this.dataService.clearCache(); // Force refresh
-            this.currentProfile = await this.dataService.getEmployeeProfile();
-            this.uiManager.renderProfile(this.currentProfile);
-            this.uiManager.updateHeaderInfo(this.currentProfile);
+            // Events arrive in completion order; hold skills until the profile is refreshed
+            let uploadDone = false;
+            let pendingSkills = [];
     
-            this.uiManager.hideLoading();
+            await this.readEventStream(response, async ({ event, data }) => {
+                if (event === 'upload') {
+                    // Refresh profile immediately after upload
+                    this.dataService.clearCache(); // Force refresh
+                    this.currentProfile = await this.dataService.getEmployeeProfile();
+                    this.uiManager.renderProfile(this.currentProfile);
+                    this.uiManager.updateHeaderInfo(this.currentProfile);
+    
+                    this.uiManager.hideLoading();
     
-            // Show success immediately, skills will be added in background
-            this.uiManager.showSuccess(`${files.length} file(s) uploaded successfully!`);
+                    // Show success immediately, skills will be added when extraction finishes
+                    this.uiManager.showSuccess(`${files.length} file(s) uploaded successfully!`);
+                    uploadDone = true;
     
-            // Process skills in background and update when ready
-            skillPromise.then(extractedSkills => {
-                if (extractedSkills && extractedSkills.length > 0) {
-                    this.addExtractedSkills(extractedSkills);
+                    if (pendingSkills.length > 0) {
+                        this.addExtractedSkills(pendingSkills);
+                    }
+                } else if (event === 'extraction') {
+                    const extractedSkills = Array.isArray(data.skills) ? data.skills : [];
+                    if (uploadDone) {
+                        this.addExtractedSkills(extractedSkills);
+                    } else {
+                        pendingSkills = extractedSkills;
+                    }
                 }
-            }).catch(error => {
-                console.warn('Skill extraction completed with warnings:', error);
             });
     
         } catch (error) {
@@ -945,29 +954,30 @@ class ProfileApp {
         }
     }
 
-    async extractSkillsParallel(files, employeeId) {
-        try {
-            const skillFormData = new FormData();
-            files.forEach(file => skillFormData.append('files', file));
-            skillFormData.append('employee_number', employeeId);
+    async readEventStream(response, onEvent) {
+        // Newline-delimited JSON, one {event, data} object per line
+        const reader = response.body.getReader();
+        const decoder = new TextDecoder();
+        let buffered = '';
     
-            const skillResponse = await fetch('https://finalpls-resource-management-system.onrender.com/api/extract_skills/', {
-                method: 'POST',
-                body: skillFormData
-            });
-            
-            
-            if (!skillResponse.ok) return [];
-            
-            const skillResult = await skillResponse.json();
-            return Array.isArray(skillResult.skills) ? skillResult.skills : [];
-        } catch (error) {
-            console.warn('Skill extraction failed:', error);
-            return [];
+        while (true) {
+            const { done, value } = await reader.read();
+            if (done) break;
+            buffered += decoder.decode(value, { stream: true });
+    
+            let newline;
+            while ((newline = buffered.indexOf('\n')) >= 0) {
+                const line = buffered.slice(0, newline).trim();
+                buffered = buffered.slice(newline + 1);
+                if (line) await onEvent(JSON.parse(line));
+            }
         }
+    
+        if (buffered.trim()) await onEvent(JSON.parse(buffered));
     }
 
     async addExtractedSkills(extractedSkills) {
+        // The server already merges extracted skills into user_details; only update the view here
         if (!extractedSkills.length) return;
         
         let skillsAdded = 0;
@@ -38,6 +38,25 @@ const debounce = (func, delay = CONFIG.DEBOUNCE_DELAY) => {
     };
 };
 
+// Conditional GET: remembers each URL's ETag and body, sends If-None-Match and
+// reuses the stored body when the API answers 304 Not Modified
+const etagCache = new Map();
+
+const fetchJSONWithETag = async (url, options = {}) => {
+    const cached = etagCache.get(url);
+    const headers = { 'Accept': 'application/json', ...(options.headers || {}) };
+    if (cached) headers['If-None-Match'] = cached.etag;
+
+    const response = await fetch(url, { ...options, method: 'GET', headers });
+    if (response.status === 304 && cached) return { ok: true, status: 304, data: cached.data };
+    if (!response.ok) return { ok: false, status: response.status, data: null };
+
+    const data = await response.json();
+    const etag = response.headers.get('ETag');
+    if (etag) etagCache.set(url, { etag, data });
+    return { ok: true, status: response.status, data };
+};
+
 const capitalize = str => str ? str.charAt(0).toUpperCase() + str.slice(1) : "";
 
 const formatDate = dateString => {
@@ -683,43 +702,17 @@ class ProjectApp {
             try {
                 console.log(`Fetching recommendations for project ${projectId}...`);
                 
-                // Use the correct endpoint from your API response
-                const response = await fetch(`${CONFIG.API_BASE_URL}/api/recommendations/${projectId}`, {
-                    method: 'POST',  // Check if this should be POST or GET
-                    headers: {
-                        'Accept': 'application/json',
-                        'Content-Type': 'application/json'
-                    },
-                    // If it's a POST request that needs data, add body:
-                    body: JSON.stringify({
-                        project_id: projectId
-                        // Add any other required parameters
-                    })
-                });
+                // GET with If-None-Match: unchanged recommendations come back as an empty 304
+                const { ok, status, data } = await fetchJSONWithETag(
+                    `${CONFIG.API_BASE_URL}/api/recommendations/${projectId}`
+                );
                 
-                console.log(`Response status: ${response.status}`);
+                console.log(`Response status: ${status}`);
                 
-                if (!response.ok) {
+                if (!ok) {
                     recommendationsFailed = true;
-                    console.warn(`Recommendations API returned status: ${response.status}`);
-                    
-                    // Try GET if POST fails
-                    if (response.status === 405) { // Method Not Allowed
-                        console.log('Trying GET method instead...');
-                        const getResponse = await fetch(`${CONFIG.API_BASE_URL}/api/recommendations/${projectId}`, {
-                            method: 'GET',
-                            headers: {
-                                'Accept': 'application/json'
-                            }
-                        });
-                        
-                        if (getResponse.ok) {
-                            const data = await getResponse.json();
-                            // Process data...
-                        }
-                    }
+                    console.warn(`Recommendations API returned status: ${status}`);
                 } else {
-                    const data = await response.json();
                     console.log('Received recommendations data:', data);
                     
                     if (data.recommendations && Array.isArray(data.recommendations)) {
@@ -1,12 +1,19 @@
 import os
 import time
-import uuid
+import hashlib
 import logging
-from typing import List
-from fastapi import APIRouter, UploadFile, File, Form, HTTPException
-from supabase import create_client, Client
+import tempfile
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import AsyncIterator, Dict, List, Optional, Union
+from urllib.parse import quote
+from fastapi import APIRouter, UploadFile, File, Form, Header, HTTPException, Request
+from pydantic import BaseModel
 import asyncio
 
+from local_storage import LocalStorageClient
+from api_responses import etag_matches, make_etag, not_modified, tagged_response
+
 # ---------- Logging Config ----------
 logger = logging.getLogger("cv_upload_logger")
 
@@ -16,6 +23,36 @@ router = APIRouter()
 BUCKET_NAME = "cvs"
 MAX_FILE_SIZE = 50 * 1024 * 1024  # 50MB
 ALLOWED_EXTENSIONS = {'.pdf', '.docx', '.doc', '.txt', '.png', '.jpg', '.jpeg'}
+UPLOAD_CHUNK_SIZE = 1024 * 1024  # 1MB per read; peak memory per upload
+MAGIC_BYTES = {
+    '.pdf': (b'%PDF',),
+    '.docx': (b'PK\x03\x04',),
+    '.doc': (b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1',),
+    '.png': (b'\x89PNG\r\n\x1a\n',),
+    '.jpg': (b'\xff\xd8\xff',),
+    '.jpeg': (b'\xff\xd8\xff',),
+}
+MAGIC_HEADER_SIZE = 8
+
+DEDUP_CONFIG = {
+    # Entries are trusted without a storage check. Deletes through this API drop them at
+    # once; the TTL bounds how long a delete on another worker can go unnoticed.
+    "index_ttl": int(os.getenv("CV_HASH_INDEX_TTL", "60")),
+    "index_size": int(os.getenv("CV_HASH_INDEX_SIZE", "10000")),
+}
+
+LIST_CONFIG = {
+    "cache_ttl": int(os.getenv("CV_LIST_CACHE_TTL", "30")),
+    "cache_size": int(os.getenv("CV_LIST_CACHE_SIZE", "1000")),   # listing pages across all employees
+    "default_limit": 100,
+    "max_limit": 1000,
+}
+
+BULK_CONFIG = {
+    "concurrency": int(os.getenv("CV_BULK_CONCURRENCY", "8")),
+    "remove_batch": 100,   # paths per storage.remove call
+    "max_items": 1000,     # employee ids or paths per request
+}
 
 # ---------- Supabase Initialization ----------
 # Initialize as None, will be set when needed
@@ -26,6 +63,11 @@ def get_supabase_client():
     global supabase
     if supabase is not None:
         return supabase
+
+    # Local stand-in for development and tests (CV_STORAGE_BACKEND=local)
+    if os.getenv("CV_STORAGE_BACKEND", "supabase").lower() == "local":
+        supabase = LocalStorageClient()
+        return supabase
     
     url = os.getenv("SUPABASE_URL")
     key = os.getenv("SUPABASE_SERVICE_KEY")
@@ -40,6 +82,7 @@ def get_supabase_client():
         return None
     
     try:
+        from supabase import create_client
         supabase = create_client(url, key)
         logger.info("✅ Supabase client initialized successfully")
         return supabase
@@ -47,13 +90,95 @@ def get_supabase_client():
         logger.error(f"❌ Failed to initialize Supabase client: {e}")
         return None
 
+# ---------- Content Hash Index ----------
+class KnownHashIndex:
+    """Bounded, expiring set of storage paths known to exist in the bucket"""
+
+    def __init__(self, ttl_seconds: int, max_entries: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, float]" = OrderedDict()
+
+    def __contains__(self, path: str) -> bool:
+        seen_at = self._entries.get(path)
+        if seen_at is None:
+            return False
+        if time.time() - seen_at > self.ttl_seconds:
+            del self._entries[path]
+            return False
+        self._entries.move_to_end(path)
+        return True
+
+    def add(self, path: str):
+        self._entries[path] = time.time()
+        self._entries.move_to_end(path)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def discard(self, path: str):
+        self._entries.pop(path, None)
+
+known_hashes = KnownHashIndex(DEDUP_CONFIG["index_ttl"], DEDUP_CONFIG["index_size"])
+
+# ---------- Listing Cache ----------
+class ListingCache:
+    """
+    Short-lived listing pages, dropped whenever that employee's files change.
+    Bounded LRU over (employee_id, limit, offset) so varying limit/cursor
+    cannot grow worker memory without limit.
+    """
+
+    def __init__(self, ttl_seconds: int, max_entries: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[tuple, tuple]" = OrderedDict()   # (employee_id, page) -> (expiry, listing)
+        self._keys: Dict[str, set] = {}                                 # employee_id -> its keys, for invalidate
+
+    def get(self, employee_id: str, page: tuple) -> Optional[dict]:
+        key = (employee_id, page)
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if time.time() > entry[0]:
+            self._remove(key)
+            return None
+        self._entries.move_to_end(key)
+        return entry[1]
+
+    def put(self, employee_id: str, page: tuple, listing: dict):
+        key = (employee_id, page)
+        now = time.time()
+        self._entries[key] = (now + self.ttl_seconds, listing)
+        self._entries.move_to_end(key)
+        self._keys.setdefault(employee_id, set()).add(key)
+        # Least recently used first: drop expired pages from the front, then enforce the bound
+        while self._entries:
+            oldest, (expiry, _) = next(iter(self._entries.items()))
+            if expiry >= now and len(self._entries) <= self.max_entries:
+                break
+            self._remove(oldest)
+
+    def invalidate(self, employee_id: str):
+        for key in self._keys.pop(employee_id, ()):
+            self._entries.pop(key, None)
+
+    def _remove(self, key: tuple):
+        self._entries.pop(key, None)
+        keys = self._keys.get(key[0])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._keys[key[0]]
+
+listing_cache = ListingCache(LIST_CONFIG["cache_ttl"], LIST_CONFIG["cache_size"])
+
 # ---------- Helper Functions ----------
-def generate_unique_filename(original_filename: str, employee_id: str) -> tuple[str, str]:
-    """Generate unique filename and path for storage"""
+def content_addressed_filename(original_filename: str, employee_id: str, sha256: str) -> tuple[str, str]:
+    """Storage filename and path derived from the file's content hash"""
     file_extension = os.path.splitext(original_filename)[1].lower()
-    unique_filename = f"{int(time.time())}_{uuid.uuid4().hex}{file_extension}"
-    unique_path = f"{employee_id}/{unique_filename}"
-    return unique_filename, unique_path
+    storage_filename = f"{sha256}{file_extension}"
+    storage_path = f"{employee_id}/{storage_filename}"
+    return storage_filename, storage_path
 
 def validate_file_extension(filename: str) -> bool:
     """Validate if file extension is allowed"""
@@ -64,6 +189,99 @@ def validate_file_size(content: bytes) -> bool:
     """Validate file size"""
     return len(content) <= MAX_FILE_SIZE
 
+def validate_file_signature(filename: str, header: bytes) -> bool:
+    """Check the first bytes match the extension (plain text must not contain NUL)"""
+    file_extension = os.path.splitext(filename)[1].lower()
+    if file_extension == '.txt':
+        return b'\x00' not in header
+    return any(header.startswith(magic) for magic in MAGIC_BYTES.get(file_extension, ()))
+
+# ---------- Streaming Uploads ----------
+@dataclass
+class SpooledUpload:
+    path: str
+    size: int
+    sha256: str
+
+@dataclass
+class BufferedUpload:
+    content: bytes
+    size: int
+    sha256: str
+
+async def iter_upload_file(file: UploadFile) -> AsyncIterator[bytes]:
+    """Yield an UploadFile in UPLOAD_CHUNK_SIZE pieces"""
+    while True:
+        chunk = await file.read(UPLOAD_CHUNK_SIZE)
+        if not chunk:
+            break
+        yield chunk
+
+class UploadValidator:
+    """
+    The /upload_cv checks applied while bytes arrive, hashing as they go:
+    extension up front, signature on the first bytes, size as soon as the
+    running total passes MAX_FILE_SIZE. Raises ValueError on rejection.
+    """
+
+    def __init__(self, filename: str):
+        if not validate_file_extension(filename):
+            raise ValueError(f"File type not allowed. Allowed types: {', '.join(ALLOWED_EXTENSIONS)}")
+        self.filename = filename
+        self.digest = hashlib.sha256()
+        self.size = 0
+        self.header = b''
+
+    def feed(self, chunk: bytes):
+        if len(self.header) < MAGIC_HEADER_SIZE:
+            self.header += chunk[:MAGIC_HEADER_SIZE - len(self.header)]
+            if len(self.header) >= MAGIC_HEADER_SIZE and not validate_file_signature(self.filename, self.header):
+                raise ValueError("File content does not match its extension")
+
+        self.size += len(chunk)
+        if self.size > MAX_FILE_SIZE:
+            raise ValueError(f"File size exceeds {MAX_FILE_SIZE // (1024*1024)}MB limit")
+
+        self.digest.update(chunk)
+
+    def finish(self) -> str:
+        """SHA-256 of everything fed, once the whole file has passed"""
+        if self.size == 0:
+            raise ValueError("File is empty")
+        if len(self.header) < MAGIC_HEADER_SIZE and not validate_file_signature(self.filename, self.header):
+            raise ValueError("File content does not match its extension")
+        return self.digest.hexdigest()
+
+async def spool_upload(chunks: AsyncIterator[bytes], filename: str) -> SpooledUpload:
+    """Stream chunks to a temp file through UploadValidator; raises ValueError on rejection"""
+    validator = UploadValidator(filename)
+    fd, temp_path = tempfile.mkstemp(suffix=os.path.splitext(filename)[1].lower())
+
+    try:
+        with os.fdopen(fd, 'wb') as spool:
+            async for chunk in chunks:
+                validator.feed(chunk)
+                spool.write(chunk)
+
+        return SpooledUpload(path=temp_path, size=validator.size, sha256=validator.finish())
+
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+
+async def buffer_upload(chunks: AsyncIterator[bytes], filename: str) -> BufferedUpload:
+    """
+    Collect chunks in memory through UploadValidator, for callers that need the
+    bytes themselves (extraction); raises ValueError on rejection
+    """
+    validator = UploadValidator(filename)
+    parts = []
+    async for chunk in chunks:
+        validator.feed(chunk)
+        parts.append(chunk)
+    sha256 = validator.finish()
+    return BufferedUpload(content=b"".join(parts), size=validator.size, sha256=sha256)
+
 def handle_supabase_response(response, operation: str) -> dict:
     """Handle Supabase response - SIMPLIFIED VERSION"""
     try:
@@ -92,8 +310,8 @@ def handle_supabase_response(response, operation: str) -> dict:
         logger.error(f"Error handling Supabase {operation} response: {e}")
         return {"success": False, "error": f"Response handling error: {str(e)}"}
 
-async def upload_to_supabase(file_path: str, content: bytes, filename: str) -> dict:
-    """Upload file to Supabase storage"""
+async def upload_to_supabase(file_path: str, content: Union[bytes, str], filename: str) -> dict:
+    """Upload file to Supabase storage (content is bytes or a local file path to stream from)"""
     try:
         logger.info(f"Uploading {filename} to {file_path}")
         
@@ -102,8 +320,10 @@ async def upload_to_supabase(file_path: str, content: bytes, filename: str) -> d
         if not supabase_client:
             return {"success": False, "error": "Supabase client not initialized. Check environment variables."}
         
-        # Upload file content directly
-        response = supabase_client.storage.from_(BUCKET_NAME).upload(file_path, content)
+        # Upload file content directly (the client is synchronous, keep it off the event loop)
+        response = await asyncio.to_thread(
+            supabase_client.storage.from_(BUCKET_NAME).upload, file_path, content
+        )
         
         # Check if upload was successful
         result = handle_supabase_response(response, "upload")
@@ -121,64 +341,120 @@ async def upload_to_supabase(file_path: str, content: bytes, filename: str) -> d
             
     except Exception as e:
         logger.error(f"❌ Upload exception for {filename}: {e}")
-        return {"success": False, "error": str(e)}
+        return {
+            "success": False,
+            "error": str(e),
+            # StorageApiError (and LocalStorageError) expose the storage API's statusCode/error
+            "error_status": str(getattr(e, "status", "") or ""),
+            "error_code": str(getattr(e, "code", "") or ""),
+        }
 
-async def process_single_file(file: UploadFile, employee_id: str) -> dict:
-    """Process and upload a single file"""
+def is_duplicate_error(result: dict) -> bool:
+    """Storage rejects uploads to an existing path with statusCode 409 / error "Duplicate" """
+    return result.get("error_status") == "409" or result.get("error_code") == "Duplicate"
+
+async def object_exists(storage_path: str) -> bool:
+    """Ask storage whether a content-addressed object is already present"""
+    supabase_client = get_supabase_client()
+    if not supabase_client:
+        return False
+    folder, name = storage_path.rsplit("/", 1)
     try:
-        # Read file content
-        content = await file.read()
-        
-        # Validate file
-        if len(content) == 0:
-            return {
-                "filename": file.filename,
-                "success": False,
-                "error": "File is empty"
-            }
+        response = await asyncio.to_thread(
+            supabase_client.storage.from_(BUCKET_NAME).list, folder, {"search": name, "limit": 1}
+        )
+    except Exception as e:
+        logger.warning(f"⚠️ Could not check {storage_path} in storage: {e}")
+        return False
+    return any(
+        (item.get("name") if isinstance(item, dict) else getattr(item, "name", None)) == name
+        for item in response or []
+    )
+
+async def store_content(filename: str, employee_id: str, content: Union[bytes, str],
+                        sha256: str, size: int) -> dict:
+    """Upload validated content under its hash unless the employee already has it"""
+    storage_filename, storage_path = content_addressed_filename(filename, employee_id, sha256)
+
+    # A recent index hit skips storage entirely; otherwise one listing decides before any
+    # bytes are sent (restarts, other workers and expired entries are the common case)
+    deduplicated = storage_path in known_hashes or await object_exists(storage_path)
+    if deduplicated:
+        logger.info(f"♻️ {filename} already stored as {storage_path}, skipping upload")
+    else:
+        upload_result = await upload_to_supabase(storage_path, content, filename)
+        if not upload_result["success"]:
+            # A concurrent upload of the same bytes may have won the race
+            if not is_duplicate_error(upload_result):
+                return {
+                    "filename": filename,
+                    "success": False,
+                    "error": upload_result.get("error", "Upload failed")
+                }
+            deduplicated = True
+        listing_cache.invalidate(employee_id)
+        logger.info(f"🎉 Successfully processed {filename}")
+
+    known_hashes.add(storage_path)
+    return {
+        "filename": filename,
+        "storage_filename": storage_filename,
+        "supabase_path": storage_path,
+        "public_url": get_supabase_client().storage.from_(BUCKET_NAME).get_public_url(storage_path),
+        "size": size,
+        "sha256": sha256,
+        "deduplicated": deduplicated,
+        "success": True
+    }
 
-        if not validate_file_size(content):
-            return {
-                "filename": file.filename,
-                "success": False,
-                "error": f"File size exceeds {MAX_FILE_SIZE // (1024*1024)}MB limit"
-            }
+async def process_single_file(file: UploadFile, employee_id: str) -> dict:
+    """Process and upload a single file without holding it in memory"""
+    # Reject on the declared size before reading anything
+    if file.size is not None and file.size > MAX_FILE_SIZE:
+        return {
+            "filename": file.filename,
+            "success": False,
+            "error": f"File size exceeds {MAX_FILE_SIZE // (1024*1024)}MB limit"
+        }
+    return await process_stream(iter_upload_file(file), file.filename, employee_id)
 
-        if not validate_file_extension(file.filename):
+async def process_stream(chunks: AsyncIterator[bytes], filename: str, employee_id: str) -> dict:
+    """Spool, validate and hash a chunk stream, then stream it to storage"""
+    spooled = None
+    try:
+        try:
+            spooled = await spool_upload(chunks, filename)
+        except ValueError as e:
+            logger.warning(f"⛔ Rejected {filename}: {e}")
             return {
-                "filename": file.filename,
+                "filename": filename,
                 "success": False,
-                "error": f"File type not allowed. Allowed types: {', '.join(ALLOWED_EXTENSIONS)}"
+                "error": str(e)
             }
 
-        # Generate unique filename
-        unique_filename, unique_path = generate_unique_filename(file.filename, employee_id)
-
-        # Upload to Supabase
-        upload_result = await upload_to_supabase(unique_path, content, file.filename)
-        
-        if not upload_result["success"]:
-            return {
-                "filename": file.filename,
-                "success": False,
-                "error": upload_result.get("error", "Upload failed")
-            }
+        return await store_validated(filename, employee_id, spooled)
 
-        result = {
-            "filename": file.filename,
-            "storage_filename": unique_filename,
-            "supabase_path": unique_path,
-            "public_url": upload_result["public_url"],
-            "success": True
+    except Exception as e:
+        logger.error(f"💥 Error processing {filename}: {e}")
+        return {
+            "filename": filename,
+            "success": False,
+            "error": str(e)
         }
-
-        logger.info(f"🎉 Successfully processed {file.filename}")
-        return result
-
+    finally:
+        if spooled and os.path.exists(spooled.path):
+            os.unlink(spooled.path)
+
+async def store_validated(filename: str, employee_id: str,
+                          upload: Union[SpooledUpload, BufferedUpload]) -> dict:
+    """Store an already validated upload (spool file read in chunks, or bytes); never raises"""
+    content = upload.path if isinstance(upload, SpooledUpload) else upload.content
+    try:
+        return await store_content(filename, employee_id, content, upload.sha256, upload.size)
     except Exception as e:
-        logger.error(f"💥 Error processing {file.filename}: {e}")
+        logger.error(f"💥 Error processing {filename}: {e}")
         return {
-            "filename": file.filename,
+            "filename": filename,
             "success": False,
             "error": str(e)
         }
@@ -201,16 +477,39 @@ async def upload_cv(
     tasks = [process_single_file(file, employee_id) for file in files]
     saved_files = await asyncio.gather(*tasks)
 
+    return summarize_uploads(employee_id, saved_files)
+
+# -----------------------------
+# Upload CV as a raw streamed body
+# -----------------------------
+@router.put("/upload_cv/stream/")
+async def upload_cv_stream(request: Request, employee_id: str, filename: str):
+    """
+    Upload one CV sent as the raw request body. The body is consumed chunk by
+    chunk as it arrives, so oversize or mistyped files are rejected early.
+    """
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > MAX_FILE_SIZE:
+        raise HTTPException(status_code=413, detail=f"File size exceeds {MAX_FILE_SIZE // (1024*1024)}MB limit")
+
+    logger.info(f"🚀 Streaming upload for employee {employee_id}: {filename}")
+    result = await process_stream(request.stream(), filename, employee_id)
+    return summarize_uploads(employee_id, [result])
+
+def summarize_uploads(employee_id: str, saved_files: List[dict]) -> dict:
+    """Build the /upload_cv response body (and log the summary)"""
     # Calculate success statistics
     successful_uploads = [f for f in saved_files if f.get("success")]
     failed_uploads = [f for f in saved_files if not f.get("success")]
+    deduplicated_uploads = [f for f in successful_uploads if f.get("deduplicated")]
 
     # Log detailed results
     logger.info("=" * 50)
     logger.info("📊 UPLOAD SUMMARY:")
-    logger.info(f"   Total files: {len(files)}")
+    logger.info(f"   Total files: {len(saved_files)}")
     logger.info(f"   ✅ Successful: {len(successful_uploads)}")
     logger.info(f"   ❌ Failed: {len(failed_uploads)}")
+    logger.info(f"   ♻️ Deduplicated: {len(deduplicated_uploads)}")
     
     for result in saved_files:
         if result["success"]:
@@ -224,9 +523,10 @@ async def upload_cv(
         "employee_id": employee_id,
         "uploaded_files": saved_files,
         "summary": {
-            "total": len(files),
+            "total": len(saved_files),
             "successful": len(successful_uploads),
-            "failed": len(failed_uploads)
+            "failed": len(failed_uploads),
+            "deduplicated": len(deduplicated_uploads)
         }
     }
 
@@ -234,50 +534,31 @@ async def upload_cv(
 # List Files from Supabase Bucket (FIXED)
 # -----------------------------
 @router.get("/list_cv/")
-async def list_cv(employee_id: str):
-    """List all CV files for an employee"""
+async def list_cv(employee_id: str, limit: int = LIST_CONFIG["default_limit"], cursor: Optional[str] = None,
+                  if_none_match: Optional[str] = Header(None)):
+    """
+    List CV files for an employee, newest first, one page per call. Pass the
+    returned next_cursor to get the following page. Responses carry an ETag
+    of the page; a matching If-None-Match returns 304 without a body.
+    """
     try:
         logger.info(f"📁 Listing files for employee: {employee_id}")
-        
-        # Get Supabase client
-        supabase_client = get_supabase_client()
-        if not supabase_client:
-            raise HTTPException(status_code=500, detail="Supabase client not initialized. Check environment variables.")
-        
-        # List files from Supabase bucket
-        response = supabase_client.storage.from_(BUCKET_NAME).list(employee_id)
-        
-        # Handle response
-        result = handle_supabase_response(response, "list")
-        if not result["success"]:
-            raise HTTPException(status_code=500, detail=f"Error listing files: {result.get('error')}")
-
-        files = []
-        for item in response:
-            if hasattr(item, 'name') or (isinstance(item, dict) and item.get('name')):
-                item_name = item.name if hasattr(item, 'name') else item['name']
-                file_path = f"{employee_id}/{item_name}"
-                public_url = supabase_client.storage.from_(BUCKET_NAME).get_public_url(file_path)
-                
-                files.append({
-                    "filename": item_name,
-                    "supabase_path": file_path,
-                    "public_url": public_url,
-                    "created_at": getattr(item, 'created_at', '') if hasattr(item, 'created_at') else item.get('created_at', ''),
-                    "updated_at": getattr(item, 'updated_at', '') if hasattr(item, 'updated_at') else item.get('updated_at', ''),
-                    "size": getattr(item, 'metadata', {}).get('size', 0) if hasattr(item, 'metadata') else item.get('metadata', {}).get('size', 0)
-                })
-
-        # Sort files by creation time (newest first)
-        files.sort(key=lambda x: x.get('created_at', ''), reverse=True)
-
-        logger.info(f"📋 Found {len(files)} files for employee {employee_id}")
-        
-        return {
+
+        limit = max(1, min(limit, LIST_CONFIG["max_limit"]))
+        offset = decode_cursor(cursor)
+        listing = await list_employee_files(employee_id, limit, offset)
+
+        logger.info(f"📋 Found {len(listing['files'])} files for employee {employee_id}")
+
+        etag = make_etag("list_cv", employee_id, limit, offset, listing)
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag)
+
+        return tagged_response({
             "success": True,
             "employee_id": employee_id,
-            "files": files
-        }
+            **listing
+        }, etag)
 
     except HTTPException:
         raise
@@ -285,6 +566,68 @@ async def list_cv(employee_id: str):
         logger.error(f"💥 Error listing CVs for {employee_id}: {e}")
         raise HTTPException(status_code=500, detail=f"Error listing files: {str(e)}")
 
+def decode_cursor(cursor: Optional[str]) -> int:
+    """Cursors are opaque to clients; internally they are the next offset"""
+    if not cursor:
+        return 0
+    if not cursor.isdigit():
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return int(cursor)
+
+def public_url_prefix(supabase_client) -> str:
+    """Public URL of the bucket root; per-file URLs are built from it locally"""
+    return supabase_client.storage.from_(BUCKET_NAME).get_public_url("_")[:-1]
+
+def file_entry(employee_id: str, item, url_prefix: str) -> Optional[dict]:
+    """Normalize one storage list item (dict or object) into the list_cv shape"""
+    get = item.get if isinstance(item, dict) else lambda key, default=None: getattr(item, key, default)
+    item_name = get('name')
+    if not item_name:
+        return None
+    file_path = f"{employee_id}/{item_name}"
+    return {
+        "filename": item_name,
+        "supabase_path": file_path,
+        "public_url": url_prefix + quote(file_path),
+        "created_at": get('created_at', '') or '',
+        "updated_at": get('updated_at', '') or '',
+        "size": (get('metadata', {}) or {}).get('size', 0)
+    }
+
+async def list_employee_files(employee_id: str, limit: int, offset: int = 0) -> dict:
+    """One storage round trip per uncached page: {"files": [...], "next_cursor": str | None}"""
+    cached = listing_cache.get(employee_id, (limit, offset))
+    if cached is not None:
+        return cached
+
+    # Get Supabase client
+    supabase_client = get_supabase_client()
+    if not supabase_client:
+        raise HTTPException(status_code=500, detail="Supabase client not initialized. Check environment variables.")
+
+    # One extra row tells us whether another page exists
+    response = await asyncio.to_thread(
+        supabase_client.storage.from_(BUCKET_NAME).list,
+        employee_id,
+        {"limit": limit + 1, "offset": offset, "sortBy": {"column": "created_at", "order": "desc"}}
+    )
+
+    # Handle response
+    result = handle_supabase_response(response, "list")
+    if not result["success"]:
+        raise HTTPException(status_code=500, detail=f"Error listing files: {result.get('error')}")
+
+    url_prefix = public_url_prefix(supabase_client)
+    entries = [file_entry(employee_id, item, url_prefix) for item in response or []]
+    files = [entry for entry in entries if entry is not None]
+
+    listing = {
+        "files": files[:limit],
+        "next_cursor": str(offset + limit) if len(entries) > limit else None
+    }
+    listing_cache.put(employee_id, (limit, offset), listing)
+    return listing
+
 # -----------------------------
 # Delete CV from Supabase Bucket (FIXED)
 # -----------------------------
@@ -311,6 +654,8 @@ async def delete_cv(employee_id: str, file_path: str):
         if not result["success"]:
             raise HTTPException(status_code=500, detail=f"Error deleting file: {result.get('error')}")
 
+        known_hashes.discard(file_path)
+        listing_cache.invalidate(employee_id)
         logger.info(f"✅ Successfully deleted {file_path}")
         
         return {
@@ -324,6 +669,125 @@ async def delete_cv(employee_id: str, file_path: str):
         logger.error(f"💥 Error deleting file {file_path}: {e}")
         raise HTTPException(status_code=500, detail=f"Error deleting file: {str(e)}")
 
+# -----------------------------
+# Bulk Delete / Bulk List
+# -----------------------------
+class BulkDeleteRequest(BaseModel):
+    file_paths: List[str]
+    employee_id: str  # every path must live under "<employee_id>/"
+
+class BulkListRequest(BaseModel):
+    employee_ids: List[str]
+    limit: int = LIST_CONFIG["default_limit"]
+
+def check_bulk_size(items: List[str]):
+    if not items:
+        raise HTTPException(status_code=400, detail="No items given")
+    if len(items) > BULK_CONFIG["max_items"]:
+        raise HTTPException(status_code=400, detail=f"At most {BULK_CONFIG['max_items']} items per request")
+
+def path_owner(file_path: str) -> Optional[str]:
+    """Employee folder a storage path lives in, or None for malformed paths"""
+    owner, _, name = file_path.partition("/")
+    if not owner or not name or ".." in file_path.split("/"):
+        return None
+    return owner
+
+@router.post("/delete_cv/bulk/")
+async def delete_cv_bulk(request: BulkDeleteRequest):
+    """Delete many CV files with batched, concurrent storage calls; one result per path"""
+    check_bulk_size(request.file_paths)
+    if not request.employee_id or "/" in request.employee_id:
+        raise HTTPException(status_code=400, detail="A valid employee_id is required")
+
+    supabase_client = get_supabase_client()
+    if not supabase_client:
+        raise HTTPException(status_code=500, detail="Supabase client not initialized. Check environment variables.")
+
+    results = {}
+    valid_paths = []
+    for file_path in dict.fromkeys(request.file_paths):
+        owner = path_owner(file_path)
+        if owner is None:
+            results[file_path] = {"success": False, "error": "Malformed file path"}
+        elif owner != request.employee_id:
+            results[file_path] = {"success": False, "error": "File path does not belong to this employee"}
+        else:
+            valid_paths.append(file_path)
+
+    logger.info(f"🗑️ Bulk delete of {len(valid_paths)} files ({len(results)} rejected)")
+
+    semaphore = asyncio.Semaphore(BULK_CONFIG["concurrency"])
+    bucket = supabase_client.storage.from_(BUCKET_NAME)
+
+    async def remove_batch(batch: List[str]):
+        async with semaphore:
+            try:
+                response = await asyncio.to_thread(bucket.remove, batch)
+            except Exception as e:
+                logger.error(f"💥 Bulk delete batch failed: {e}")
+                for file_path in batch:
+                    results[file_path] = {"success": False, "error": str(e)}
+                return
+
+        removed = {
+            item.get("name") if isinstance(item, dict) else getattr(item, "name", None)
+            for item in response or []
+        }
+        for file_path in batch:
+            if file_path in removed:
+                results[file_path] = {"success": True}
+                known_hashes.discard(file_path)
+                listing_cache.invalidate(path_owner(file_path))
+            else:
+                results[file_path] = {"success": False, "error": "File not found"}
+
+    size = BULK_CONFIG["remove_batch"]
+    await asyncio.gather(*[
+        remove_batch(valid_paths[i:i + size]) for i in range(0, len(valid_paths), size)
+    ])
+
+    items = [{"file_path": file_path, **results[file_path]} for file_path in dict.fromkeys(request.file_paths)]
+    deleted = sum(1 for item in items if item["success"])
+    logger.info(f"✅ Bulk delete finished: {deleted}/{len(items)} removed")
+
+    return {
+        "success": True,
+        "results": items,
+        "summary": {"total": len(items), "deleted": deleted, "failed": len(items) - deleted}
+    }
+
+@router.post("/list_cv/bulk/")
+async def list_cv_bulk(request: BulkListRequest):
+    """First page of CVs for many employees at once, listed concurrently"""
+    check_bulk_size(request.employee_ids)
+    limit = max(1, min(request.limit, LIST_CONFIG["max_limit"]))
+    semaphore = asyncio.Semaphore(BULK_CONFIG["concurrency"])
+
+    async def list_one(employee_id: str) -> dict:
+        async with semaphore:
+            try:
+                listing = await list_employee_files(employee_id, limit)
+                return {"employee_id": employee_id, "success": True, **listing}
+            except HTTPException as e:
+                return {"employee_id": employee_id, "success": False, "error": e.detail}
+            except Exception as e:
+                return {"employee_id": employee_id, "success": False, "error": str(e)}
+
+    employee_ids = list(dict.fromkeys(request.employee_ids))
+    logger.info(f"📁 Bulk listing for {len(employee_ids)} employees")
+    results = await asyncio.gather(*[list_one(employee_id) for employee_id in employee_ids])
+
+    return {
+        "success": True,
+        "results": results,
+        "summary": {
+            "employees": len(results),
+            "failed": sum(1 for result in results if not result["success"]),
+            "files": sum(len(result.get("files", [])) for result in results)
+        }
+    }
+
 # -----------------------------
 # Test Connection (FIXED)
 # -----------------------------
@@ -0,0 +1,277 @@
+import os
+import time
+import logging
+import threading
+from dataclasses import dataclass, asdict
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+# ============================================
+# LOGGING SETUP
+# ============================================
+logger = logging.getLogger("warmup_logger")
+
+# ============================================
+# CONFIGURATION
+# ============================================
+PENDING, WARMING, READY, FAILED, SKIPPED = "pending", "warming", "ready", "failed", "skipped"
+
+# Order matters: the recommendation step reuses the index built by employee_index
+WARMUP_STEPS = ["skills", "nlp", "ocr", "storage", "employee_index", "extraction", "recommendation"]
+
+def env_list(name: str, default: str) -> List[str]:
+    return [item.strip() for item in os.getenv(name, default).split(",") if item.strip()]
+
+# Required by default: skills, nlp, storage, employee_index, extraction, recommendation.
+# /ready returns 503 until each of these is warm. Only ocr is optional, so a worker
+# without tesseract still serves text PDFs and DOCX. Override with WARMUP_OPTIONAL.
+WARMUP_CONFIG = {
+    "enabled": os.getenv("WARMUP_ENABLED", "1") == "1",
+    "blocking": os.getenv("WARMUP_BLOCKING", "0") == "1",   # 1 = finish warmup before accepting requests
+    "components": env_list("WARMUP_COMPONENTS", ",".join(WARMUP_STEPS)),
+    # Components that may fail without keeping the worker out of rotation
+    "optional": set(env_list("WARMUP_OPTIONAL", "ocr")),
+    # Failed required components are retried in the background with exponential backoff
+    "retry_initial_delay": float(os.getenv("WARMUP_RETRY_INITIAL_DELAY", "5")),
+    "retry_max_delay": float(os.getenv("WARMUP_RETRY_MAX_DELAY", "300")),
+    "retry_attempts": int(os.getenv("WARMUP_RETRY_ATTEMPTS", "0")),    # 0 = until warm
+}
+
+SYNTHETIC_CV_LINES = [
+    "Warmup Candidate", "Email: warmup@example.com", "Phone: +1 555 010 0000",
+    "Skills", "Python, React, PostgreSQL, Docker",
+    "Work Experience", "Backend developer building FastAPI services",
+    "Education", "BSc Computer Science",
+]
+SYNTHETIC_REQUIRED_SKILLS = ["Python", "React.js", "Postgres"]
+
+# ============================================
+# COMPONENT STATE
+# ============================================
+@dataclass
+class ComponentState:
+    status: str = PENDING
+    required: bool = True
+    duration_ms: Optional[float] = None
+    error: Optional[str] = None
+    attempts: int = 0
+
+_lock = threading.Lock()
+_components: Dict[str, ComponentState] = {
+    name: ComponentState(required=name not in WARMUP_CONFIG["optional"])
+    for name in WARMUP_CONFIG["components"]
+}
+_timing: Dict[str, Optional[float]] = {
+    "started_at": None, "finished_at": None, "duration_ms": None, "next_retry_at": None,
+}
+_started = False
+
+def set_state(name: str, **changes):
+    with _lock:
+        for key, value in changes.items():
+            setattr(_components[name], key, value)
+
+# ============================================
+# WARMUP STEPS
+# ============================================
+def synthetic_cv_pdf() -> bytes:
+    import fitz
+    doc = fitz.open()
+    page = doc.new_page()
+    for i, line in enumerate(SYNTHETIC_CV_LINES):
+        page.insert_text((72, 72 + i * 18), line, fontsize=14 if i in (3, 5, 7) else 11)
+    return doc.tobytes()
+
+def warm_skills():
+    """Exact, fuzzy and free-text skill lookups (fills the resolve_skill cache)"""
+    from skill_taxonomy import find_skills_in_text, implied_skills, normalize_skill
+    skills = {normalize_skill(skill) for skill in SYNTHETIC_REQUIRED_SKILLS}
+    implied_skills(skills)
+    if not find_skills_in_text(" ".join(SYNTHETIC_CV_LINES)):
+        raise RuntimeError("skill pattern matched nothing in the synthetic CV")
+
+def warm_nlp():
+    from extract_skills import get_nlp_model
+    get_nlp_model()("Warmup Candidate lives in London.")
+
+def warm_ocr():
+    """Tesseract binary reachable, pdf2image importable, preprocessing run once"""
+    from PIL import Image, ImageDraw
+    import pdf2image  # noqa: F401
+    from extract_skills import get_tesseract
+    from ocr_preprocess import prepare_for_ocr
+
+    get_tesseract().get_tesseract_version()
+    image = Image.new("L", (400, 120), 255)
+    ImageDraw.Draw(image).text((20, 40), "Python React Docker", fill=0)
+    prepare_for_ocr(image, rescale=True)
+
+def warm_storage():
+    from upload_cv import BUCKET_NAME, get_supabase_client
+    client = get_supabase_client()
+    if client is None:
+        raise RuntimeError("storage client not available")
+    # Opens the HTTP connection pool and checks the credentials
+    client.storage.from_(BUCKET_NAME).list(None, {"limit": 1})
+
+def warm_employee_index():
+    """Map (or build) the employee snapshot and its sparse TF-IDF matrix"""
+    from project_recommendation import employee_store
+    from skill_scoring import tfidf_matrix
+    snapshot = employee_store.get()
+    tfidf_matrix(snapshot)
+    logger.info(f"🔥 Employee index {snapshot.generation} warm ({len(snapshot)} rows)")
+
+def warm_extraction():
+    from extract_skills import extract_from_bytes
+    result = extract_from_bytes("warmup.pdf", synthetic_cv_pdf())
+    if result.get("error"):
+        raise RuntimeError(result["error"])
+    if not result.get("skills"):
+        raise RuntimeError("synthetic extraction found no skills")
+
+def warm_recommendation():
+    """Run the scoring kernels of get_recommendations once over the real snapshot"""
+    import pandas  # noqa: F401  (get_recommendations builds a DataFrame per request)
+    from availability_index import project_window, remaining_capacity
+    from project_recommendation import employee_store
+    from skill_scoring import match_credit, rank_candidates, tfidf_scores
+    from skill_taxonomy import normalize_skill
+
+    snapshot = employee_store.get()
+    rows = np.arange(len(snapshot))
+    required = {normalize_skill(skill) for skill in SYNTHETIC_REQUIRED_SKILLS}
+    match_count, credit = match_credit(snapshot, rows, required)
+    free_hours = remaining_capacity(snapshot, rows, *project_window(None))
+    rank_candidates(credit, [match_count, free_hours])
+    rank_candidates(tfidf_scores(snapshot, required), [match_count, free_hours])
+
+STEP_FUNCTIONS: Dict[str, Callable[[], None]] = {
+    "skills": warm_skills,
+    "nlp": warm_nlp,
+    "ocr": warm_ocr,
+    "storage": warm_storage,
+    "employee_index": warm_employee_index,
+    "extraction": warm_extraction,
+    "recommendation": warm_recommendation,
+}
+
+# ============================================
+# RUNNER
+# ============================================
+def run_step(name: str):
+    """Run one warmup step and record its state; failures are logged, never raised"""
+    step = STEP_FUNCTIONS.get(name)
+    if step is None:
+        set_state(name, status=FAILED, error="unknown warmup component")
+        return
+    with _lock:
+        _components[name].attempts += 1
+    set_state(name, status=WARMING)
+    step_start = time.perf_counter()
+    try:
+        step()
+        set_state(name, status=READY, error=None)
+    except Exception as e:
+        set_state(name, status=FAILED, error=str(e))
+        log = logger.warning if name in WARMUP_CONFIG["optional"] else logger.error
+        log(f"❌ Warmup step {name} failed: {e}")
+    finally:
+        set_state(name, duration_ms=round((time.perf_counter() - step_start) * 1000, 1))
+
+def failed_required() -> List[str]:
+    with _lock:
+        return [name for name, state in _components.items()
+                if state.required and state.status == FAILED and name in STEP_FUNCTIONS]
+
+def run_warmup():
+    """Run every configured step in order; a failing step never stops the others"""
+    _timing["started_at"] = time.time()
+    start = time.perf_counter()
+    logger.info(f"🔥 Warmup started: {', '.join(_components)}")
+
+    for name in list(_components):
+        run_step(name)
+
+    _timing["duration_ms"] = round((time.perf_counter() - start) * 1000, 1)
+    _timing["finished_at"] = time.time()
+    summary = readiness()
+    logger.info(f"🔥 Warmup finished in {_timing['duration_ms']:.0f} ms - status: {summary['status']}")
+    return summary
+
+def retry_failed():
+    """
+    Re-run failed required steps with exponential backoff until all are warm, so
+    a dependency that was down at boot (storage, database) does not keep /ready
+    at 503 for the life of the worker.
+    """
+    delay = WARMUP_CONFIG["retry_initial_delay"]
+    attempt = 0
+    while failed_required():
+        attempt += 1
+        if WARMUP_CONFIG["retry_attempts"] and attempt > WARMUP_CONFIG["retry_attempts"]:
+            logger.error(f"❌ Warmup gave up after {attempt - 1} retries: {', '.join(failed_required())}")
+            break
+        _timing["next_retry_at"] = time.time() + delay
+        logger.info(f"🔁 Retrying warmup in {delay:.0f} s: {', '.join(failed_required())}")
+        time.sleep(delay)
+        # Steps run in WARMUP_STEPS order, so employee_index is rebuilt before recommendation
+        for name in failed_required():
+            run_step(name)
+        delay = min(delay * 2, WARMUP_CONFIG["retry_max_delay"])
+
+    _timing["next_retry_at"] = None
+    if not failed_required():
+        _timing["finished_at"] = time.time()
+        if attempt:
+            logger.info(f"🔥 Warmup recovered after {attempt} retries - status: {readiness()['status']}")
+
+def warm_and_retry():
+    run_warmup()
+    retry_failed()
+
+def start_warmup() -> Optional[threading.Thread]:
+    """
+    Start warmup once per process; in the background unless WARMUP_BLOCKING=1.
+    Retries of failed required steps always run in the background.
+    """
+    global _started
+    with _lock:
+        if _started or not WARMUP_CONFIG["enabled"]:
+            return None
+        _started = True
+    if WARMUP_CONFIG["blocking"]:
+        run_warmup()
+        if not failed_required():
+            return None
+        target = retry_failed
+    else:
+        target = warm_and_retry
+    thread = threading.Thread(target=target, name="warmup", daemon=True)
+    thread.start()
+    return thread
+
+def readiness() -> dict:
+    """Per-component warm state; ready once every required component is warm"""
+    with _lock:
+        components = {name: asdict(state) for name, state in _components.items()}
+
+    if not WARMUP_CONFIG["enabled"]:
+        status = SKIPPED
+    elif any(c["status"] in (PENDING, WARMING) for c in components.values()):
+        status = WARMING
+    elif any(c["required"] and c["status"] == FAILED for c in components.values()):
+        status = FAILED
+    else:
+        status = READY
+
+    return {
+        "ready": status in (READY, SKIPPED),
+        "status": status,
+        "components": components,
+        "warmup_duration_ms": _timing["duration_ms"],
+        "warmup_started_at": _timing["started_at"],
+        "warmup_finished_at": _timing["finished_at"],
+        "next_retry_at": _timing["next_retry_at"],
+    }